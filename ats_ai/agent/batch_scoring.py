@@ -0,0 +1,176 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ats_ai.agent.llm_agent import DefaultWeightageConfig, has_valid_project_entries
+
+"""
+    Vectorized counterpart of prompts.calculate_weighted_score_and_status.
+    Scores a whole pool of already-evaluated candidates for one weightage in a single NumPy pass
+    (weighted score, project-weight redistribution, experience gap and qualification status).
+    Results are identical to the scalar function row by row.
+"""
+
+# Same thresholds as calculate_weighted_score_and_status
+QUALIFIED_MIN_SCORE = 7.0
+QUALIFIED_MIN_MATCH_PERCENTAGE = 70.0
+WEAK_COMPONENT_SCORE = 6.0
+
+
+def _match_percentage_value(llm_match_percentage) -> str:
+    return llm_match_percentage if llm_match_percentage else "0.0%"
+
+
+def _match_percentage_numeric(match_percentage) -> float:
+    try:
+        return float(match_percentage.replace("%", ""))
+    except Exception:
+        return 0.0
+
+
+def _round_half_even_1dp(values: np.ndarray) -> np.ndarray:
+    """round(x, 1) for every element, matching Python's correctly-rounded float round()"""
+    rounded = np.round(values, 1)
+    # np.round scales by 10 and can land on the wrong side of a tie that Python's round() resolves
+    # exactly; fix up the (rare) elements where the two disagree.
+    mismatch = np.flatnonzero(np.abs(values * 10 - np.round(values * 10)) > 0.4999)
+    for idx in mismatch:
+        rounded[idx] = round(float(values[idx]), 1)
+    return rounded
+
+
+def calculate_weighted_scores_batch(
+    experience_scores: Sequence[float],
+    skills_scores: Sequence[float],
+    education_scores: Sequence[float],
+    projects_scores: Sequence[float],
+    candidate_total_experience_years: Sequence[float],
+    jd_required_experience_years: Sequence[float],
+    has_valid_projects: Optional[Sequence[bool]] = None,
+    experience_weight=0.3,
+    skills_weight=0.4,
+    education_weight=0.1,
+    projects_weight=0.2,
+    llm_match_percentages: Optional[Sequence[Optional[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Columnar version of calculate_weighted_score_and_status for one weightage and N candidates
+    - returns Dict[str, Any]: same keys as the scalar function, each holding an array/list of length N
+    """
+    experience = np.asarray(experience_scores, dtype=np.float64)
+    skills = np.asarray(skills_scores, dtype=np.float64)
+    education = np.asarray(education_scores, dtype=np.float64)
+    projects = np.asarray(projects_scores, dtype=np.float64)
+    candidate_years = np.asarray(candidate_total_experience_years, dtype=np.float64)
+    required_years = np.asarray(jd_required_experience_years, dtype=np.float64)
+    count = experience.shape[0]
+    valid_projects = np.ones(count, dtype=bool) if has_valid_projects is None else np.asarray(has_valid_projects, dtype=bool)
+
+    # Projects weight is redistributed proportionally when projects are missing or scored 0
+    total_other_weights = experience_weight + skills_weight + education_weight
+    if total_other_weights > 0:
+        exp_adjusted = experience_weight + (projects_weight * (experience_weight / total_other_weights))
+        skills_adjusted = skills_weight + (projects_weight * (skills_weight / total_other_weights))
+        edu_adjusted = education_weight + (projects_weight * (education_weight / total_other_weights))
+    else:
+        exp_adjusted = experience_weight
+        skills_adjusted = skills_weight
+        edu_adjusted = education_weight
+
+    redistribute = ~valid_projects | (projects == 0.0)
+    redistributed_score = (experience * exp_adjusted) + (skills * skills_adjusted) + (education * edu_adjusted)
+    full_score = (experience * experience_weight) + (skills * skills_weight) + (projects * projects_weight) + (education * education_weight)
+    overall_weighted_score = _round_half_even_1dp(np.where(redistribute, redistributed_score, full_score))
+
+    match_percentages = [_match_percentage_value(value) for value in (llm_match_percentages if llm_match_percentages is not None else [None] * count)]
+    match_numeric = np.fromiter((_match_percentage_numeric(value) for value in match_percentages), dtype=np.float64, count=count)
+
+    experience_gap = (required_years > 0) & (candidate_years < required_years)
+    qualified = ~experience_gap & (overall_weighted_score >= QUALIFIED_MIN_SCORE) & (match_numeric >= QUALIFIED_MIN_MATCH_PERCENTAGE)
+
+    # Weakest-area reason: components ordered by weight (stable, projects last on ties), first one scoring < 6
+    components = [
+        (experience_weight, experience < WEAK_COMPONENT_SCORE, "Insufficient Experience"),
+        (skills_weight, skills < WEAK_COMPONENT_SCORE, "Skill Gaps"),
+        (education_weight, education < WEAK_COMPONENT_SCORE, "Education Requirements"),
+        (projects_weight, valid_projects & (projects < WEAK_COMPONENT_SCORE), "Lack of Project Application"),
+    ]
+    components.sort(key=lambda x: x[0], reverse=True)
+    conditions = [is_weak for weight, is_weak, _ in components if weight > 0]
+    reasons = [f"Not Qualified - {reason}" for weight, _, reason in components if weight > 0]
+    reason_index = np.select(conditions, list(range(len(reasons))), default=len(reasons)) if conditions else np.full(count, 0)
+    reason_labels = np.array(reasons + ["Not Qualified - Below Standard"], dtype=object)
+    qualification_status = np.where(qualified, "Qualified", reason_labels[reason_index]).astype(object)
+
+    # Experience-gap message embeds the caller's values verbatim, as the scalar function does
+    for idx in np.flatnonzero(experience_gap):
+        qualification_status[idx] = f"Not Qualified - Experience Gap (Required: {jd_required_experience_years[idx]}+ years, Has: {candidate_total_experience_years[idx]} years)"
+
+    return {
+        "overall_weighted_score": overall_weighted_score,
+        "match_percentage": match_percentages,
+        "qualification_status": qualification_status.tolist(),
+        "experience_gap": experience_gap,
+        "required_experience": list(jd_required_experience_years),
+        "candidate_experience": list(candidate_total_experience_years),
+    }
+
+
+def batch_results_to_records(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Row-wise view of calculate_weighted_scores_batch output, shaped like the scalar function's dicts"""
+    return [
+        {
+            "overall_weighted_score": float(score),
+            "match_percentage": match_percentage,
+            "qualification_status": status,
+            "experience_gap": bool(gap),
+            "required_experience": required,
+            "candidate_experience": candidate,
+        }
+        for score, match_percentage, status, gap, required, candidate in zip(
+            results["overall_weighted_score"],
+            results["match_percentage"],
+            results["qualification_status"],
+            results["experience_gap"],
+            results["required_experience"],
+            results["candidate_experience"],
+        )
+    ]
+
+
+def rescore_evaluations_batch(evaluations: List[Dict[str, Any]], weightage_config=None) -> List[Dict[str, Any]]:
+    """
+    Re-score many stored /parse_and_evaluate responses for one weightage in a single pass
+    - returns List[Dict[str, Any]]: per-candidate score summary, in input order
+    """
+    if weightage_config is None:
+        weightage_config = DefaultWeightageConfig()
+
+    # Client-supplied payloads may carry null sections
+    evaluation_sections = [evaluation.get("Evaluation") or {} for evaluation in evaluations]
+    parsed_resumes = [evaluation.get("Parsed_Resume") or {} for evaluation in evaluations]
+    results = calculate_weighted_scores_batch(
+        experience_scores=[section.get("Experience_Score", 0.0) for section in evaluation_sections],
+        skills_scores=[section.get("Skills_Score", 0.0) for section in evaluation_sections],
+        education_scores=[section.get("Education_Score", 0.0) for section in evaluation_sections],
+        projects_scores=[section.get("Projects_Score", 0.0) for section in evaluation_sections],
+        candidate_total_experience_years=[section.get("Total_Experience_Years", 0.0) for section in evaluation_sections],
+        jd_required_experience_years=[section.get("JD_Required_Experience_Years", 0.0) for section in evaluation_sections],
+        has_valid_projects=[has_valid_project_entries(parsed_resume.get("Projects") or []) for parsed_resume in parsed_resumes],
+        experience_weight=weightage_config.experience_weight,
+        skills_weight=weightage_config.skills_weight,
+        education_weight=weightage_config.education_weight,
+        projects_weight=weightage_config.projects_weight,
+        llm_match_percentages=[section.get("Match_Percentage") for section in evaluation_sections],
+    )
+
+    return [
+        {
+            "index": index,
+            "Name": parsed_resume.get("Name", "NA"),
+            "Overall_Weighted_Score": record["overall_weighted_score"],
+            "Match_Percentage": record["match_percentage"],
+            "Qualification Status": record["qualification_status"],
+        }
+        for index, (parsed_resume, record) in enumerate(zip(parsed_resumes, batch_results_to_records(results)))
+    ]
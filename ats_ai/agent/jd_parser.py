@@ -1,19 +1,32 @@
+import asyncio
 import json
 import logging
 import os
+import time
 from pathlib import Path
-
-import mammoth
-from langchain_community.document_loaders import PyMuPDFLoader
-from openai import OpenAI
+from typing import List, Optional
 
 from ats_ai.agent.llm_agent import extract_json_block
-from ats_ai.agent.prompts import JD_EXTRACTION_PROMPT
+from ats_ai.agent.llm_client import (
+    OPENAI_MODEL,
+    OPENAI_PARSE_TIMEOUT,
+    build_timeout,
+    create_chat_completion_with_backoff,
+)
+from ats_ai.agent.prompts import JD_EXTRACTION_PROMPT, JD_EXTRACTION_PROMPT_VERSION
+from ats_ai.extraction import (
+    SUPPORTED_DOCUMENT_EXTENSIONS,
+    extract_document_text,
+    load_pdf_text,
+)
+from ats_ai.text_cache import file_sha256
 
 logger = logging.getLogger(__name__)
 
-
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+JD_MANIFEST_PATH = os.getenv("JD_MANIFEST_PATH", "data/jd_manifest.json")
+JD_CONVERSION_CONCURRENCY = int(os.getenv("JD_CONVERSION_CONCURRENCY", "5"))
+# Scraped JD records (CalfusJobScraper.save_job_record); preferred over a document with the same name
+JD_RECORD_EXTENSION = ".json"
 
 
 def create_empty_jd_structure() -> dict:
@@ -31,19 +44,17 @@ def create_empty_jd_structure() -> dict:
     }
 
 
-def load_pdf_text(file_path: str) -> str:
-    loader = PyMuPDFLoader(file_path)
-    pages = loader.load()
-    return " ".join(page.page_content for page in pages)
-
-
-def extract_jd_info(jd_text: str) -> dict:
+async def extract_jd_info(jd_text: str, raise_on_error: bool = False) -> dict:
+    """
+    Structured JD fields from raw JD text
+    - raise_on_error: raise instead of returning placeholder fields when the LLM call or JSON parsing fails
+    """
 
     try:
         # Create the prompt
         prompt = JD_EXTRACTION_PROMPT.format(jd_text=jd_text.strip())
 
-        response = openai_client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": prompt}], temperature=0.0)
+        response = await create_chat_completion_with_backoff(model=OPENAI_MODEL, messages=[{"role": "user", "content": prompt}], temperature=0.0, timeout=build_timeout(OPENAI_PARSE_TIMEOUT))
         raw_response = response.choices[0].message.content.strip()  # ✅ Correct
 
         logger.info(f"Raw JD Extraction Output:\n{raw_response}")
@@ -63,6 +74,8 @@ def extract_jd_info(jd_text: str) -> dict:
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse JD JSON: {e}")
         logger.error(f"Raw response: {raw_response}")
+        if raise_on_error:
+            raise
         # Return default structure instead of empty
         return {
             "Job_Title": "Extracted from Text",
@@ -77,6 +90,8 @@ def extract_jd_info(jd_text: str) -> dict:
         }
     except Exception as e:
         logger.error(f"Error in extract_jd_info: {e}")
+        if raise_on_error:
+            raise
         # Return default structure instead of empty
         return {
             "Job_Title": "Extracted from Text",
@@ -91,28 +106,6 @@ def extract_jd_info(jd_text: str) -> dict:
         }
 
 
-def load_docx_text(file_path: str) -> str:
-    """Load text from DOCX file"""
-    try:
-        with open(file_path, "rb") as docx_file:
-            result = mammoth.extract_raw_text(docx_file)
-            return result.value
-    except Exception as e:
-        logger.error(f"Error reading DOCX file {file_path}: {e}")
-        return ""
-
-
-def load_document_text(file_path: str) -> str:
-    """Universal document loader for PDF, DOC, DOCX"""
-    file_extension = Path(file_path).suffix.lower()
-
-    if file_extension == ".docx":
-        return load_docx_text(file_path)
-
-    else:
-        raise ValueError(f"Unsupported file format: {file_extension}")
-
-
 def save_json(data: dict, output_path: str):
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     with open(output_path, "w") as f:
@@ -120,56 +113,151 @@ def save_json(data: dict, output_path: str):
     print(f"Structured JD saved to: {output_path}")
 
 
-def process_jd_folder_to_json():
+def load_jd_record_text(file_path: str) -> str:
+    """JD text of a scraped record: title, location and the cleaned description, no document parsing needed"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        record = json.load(f)
+    return f"{record.get('title', '')}\n\nLocation: {record.get('location', '')}\n\nJob Description\n\n{record.get('content', '')}"
+
+
+def jd_source_files(jd_folder: Path) -> List[Path]:
+    """Scraped JSON records and PDF/DOC/DOCX files in jd_folder, skipping a document when a record of the same name exists"""
+    files = [file_path for file_path in sorted(jd_folder.iterdir()) if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_DOCUMENT_EXTENSIONS + [JD_RECORD_EXTENSION]]
+    record_stems = {file_path.stem for file_path in files if file_path.suffix.lower() == JD_RECORD_EXTENSION}
+    return [file_path for file_path in files if file_path.suffix.lower() == JD_RECORD_EXTENSION or file_path.stem not in record_stems]
+
+
+def load_jd_manifest() -> dict:
+    """Source file name -> {source_sha256, prompt_version, output_file, converted_at} for every converted JD"""
+    if not os.path.exists(JD_MANIFEST_PATH):
+        return {}
+    try:
+        with open(JD_MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable JD manifest {JD_MANIFEST_PATH}: {e}")
+        return {}
+
+
+def save_jd_manifest(manifest: dict):
+    os.makedirs(os.path.dirname(JD_MANIFEST_PATH) or ".", exist_ok=True)
+    tmp_path = JD_MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, JD_MANIFEST_PATH)
+
+
+def jd_needs_conversion(manifest_entry, source_sha256: str, json_path: Path) -> bool:
+    """New, edited, converted by an older prompt, or its JSON output went missing"""
+    return manifest_entry is None or manifest_entry.get("source_sha256") != source_sha256 or manifest_entry.get("prompt_version") != JD_EXTRACTION_PROMPT_VERSION or not json_path.exists()
+
+
+async def convert_jd_file(file_path: Path, json_path: Path, source_sha256: str, semaphore: asyncio.Semaphore) -> dict:
+    """Extract one JD file and write its JSON; returns its report entry (manifest updates are left to the caller)"""
+    async with semaphore:
+        started = time.perf_counter()
+        report = {"file": file_path.name, "output_file": json_path.name}
+        try:
+            logger.info(f"Processing: {file_path.name}")
+
+            if file_path.suffix.lower() == JD_RECORD_EXTENSION:
+                jd_text = await asyncio.to_thread(load_jd_record_text, str(file_path))
+            else:
+                # Load document text (process pool, off the event loop)
+                jd_text = await extract_document_text(str(file_path), source_sha256)
+            if not jd_text.strip():
+                raise ValueError("No text extracted")
+
+            # Extract JD info using LLM (without validation)
+            jd_structured = await extract_jd_info(jd_text, raise_on_error=True)
+
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(jd_structured, f, indent=2, ensure_ascii=False)
+
+            logger.info(f"✅ Saved: {json_path.name}")
+            report["status"] = "converted"
+        except Exception as e:
+            logger.error(f"Error processing {file_path.name}: {e}")
+            report.update(status="failed", error=str(e))
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        return report
+
+
+def archive_closed_jds(scrape_report: dict, jd_json_folder: Path) -> List[str]:
+    """Move the JSON of postings the scraper reported as closed to jd_json/closed/, out of /list_jds"""
+    archived = []
+    for posting in scrape_report.get("closed", []):
+        json_path = jd_json_folder / (Path(posting["file"]).stem + ".json")
+        if json_path.exists():
+            (jd_json_folder / "closed").mkdir(exist_ok=True)
+            os.replace(json_path, jd_json_folder / "closed" / json_path.name)
+            archived.append(json_path.name)
+            logger.info(f"Archived closed JD: {json_path.name}")
+    return archived
+
+
+async def process_jd_folder_to_json(force: bool = False, concurrency: int = JD_CONVERSION_CONCURRENCY, scrape_report: Optional[dict] = None):
     """
-    Process all DOC/DOCX files in jd_folder and convert to JSON
+    Convert new or changed scraped JD records and PDF/DOC/DOCX files in jd_folder to JSON in jd_json
+    A manifest (JD_MANIFEST_PATH) records each source file's SHA-256 and the prompt version of its JSON,
+    so unchanged JDs are skipped without an LLM call. force=True re-converts everything.
+    Up to `concurrency` files are converted at once; rate-limited LLM calls back off and retry.
+    scrape_report: CalfusJobScraper.run() result; JSON of postings it closed is archived first.
+    - returns dict: processed_count, skipped_count, failed_count, archived (closed JD JSON files), seconds and a
+      per-file "files" report ({file, output_file, status: converted|skipped|failed, seconds, error})
     """
     jd_folder = Path("jd_folder")
     jd_json_folder = Path("jd_json")
+    started = time.perf_counter()
+    summary = {"processed_count": 0, "skipped_count": 0, "failed_count": 0, "archived": [], "seconds": 0.0, "files": []}
 
     # Create jd_json folder if it doesn't exist
     jd_json_folder.mkdir(exist_ok=True)
 
+    if scrape_report:
+        summary["archived"] = archive_closed_jds(scrape_report, jd_json_folder)
+
     if not jd_folder.exists():
         logger.warning("jd_folder does not exist")
-        return 0
-
-    # Process all DOC/DOCX files
-    supported_extensions = [".doc", ".docx", ".pdf"]
-    processed_count = 0
-
-    for file_path in jd_folder.iterdir():
-        if file_path.suffix.lower() in supported_extensions:
-            try:
-                logger.info(f"Processing: {file_path.name}")
-
-                # Load document text
-                jd_text = load_document_text(str(file_path))
-
-                if not jd_text.strip():
-                    logger.warning(f"No text extracted from {file_path.name}")
-                    continue
-
-                # Extract JD info using LLM (without validation)
-                jd_structured = extract_jd_info(jd_text)
-
-                # Always save the result (no validation check)
-                json_filename = file_path.stem + ".json"
-                json_path = jd_json_folder / json_filename
-
-                # Save JSON
-                with open(json_path, "w", encoding="utf-8") as f:
-                    json.dump(jd_structured, f, indent=2, ensure_ascii=False)
+        return summary
+
+    manifest = load_jd_manifest()
+    source_files = jd_source_files(jd_folder)
+    source_hashes = await asyncio.gather(*(asyncio.to_thread(file_sha256, str(file_path)) for file_path in source_files))
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def convert_and_record(file_path: Path, json_path: Path, source_sha256: str) -> dict:
+        report = await convert_jd_file(file_path, json_path, source_sha256, semaphore)
+        if report["status"] == "converted":
+            # Saved as each file finishes, so an interrupted rebuild keeps the work already done
+            manifest[file_path.name] = {"source_sha256": source_sha256, "prompt_version": JD_EXTRACTION_PROMPT_VERSION, "output_file": json_path.name, "converted_at": time.time()}
+            save_jd_manifest(manifest)
+        return report
+
+    reports = []
+    conversions = []
+    for file_path, source_sha256 in zip(source_files, source_hashes):
+        json_path = jd_json_folder / (file_path.stem + ".json")
+        if force or jd_needs_conversion(manifest.get(file_path.name), source_sha256, json_path):
+            conversions.append(convert_and_record(file_path, json_path, source_sha256))
+        else:
+            reports.append({"file": file_path.name, "output_file": json_path.name, "status": "skipped", "seconds": 0.0})
+    reports.extend(await asyncio.gather(*conversions))
 
-                logger.info(f"✅ Saved: {json_filename}")
-                processed_count += 1
+    # Forget sources that were removed from jd_folder (their JSON is left in place)
+    source_names = {file_path.name for file_path in source_files}
+    for source_name in set(manifest) - source_names:
+        manifest.pop(source_name)
+    save_jd_manifest(manifest)
 
-            except Exception as e:
-                logger.error(f"Error processing {file_path.name}: {e}")
-                continue
+    summary["files"] = sorted(reports, key=lambda report: report["file"])
+    for report in reports:
+        summary[{"converted": "processed_count", "skipped": "skipped_count", "failed": "failed_count"}[report["status"]]] += 1
+    summary["seconds"] = round(time.perf_counter() - started, 3)
 
-    logger.info(f"Processed {processed_count} JD files successfully")
-    return processed_count
+    logger.info(f"Processed {summary['processed_count']} JD files successfully, {summary['skipped_count']} unchanged, {summary['failed_count']} failed in {summary['seconds']}s")
+    return summary
 
 
 if __name__ == "__main__":
@@ -182,7 +270,7 @@ if __name__ == "__main__":
         jd_text = load_pdf_text(jd_pdf_path)
 
         print("Extracting structured JD info...")
-        jd_structured = extract_jd_info(jd_text)
+        jd_structured = asyncio.run(extract_jd_info(jd_text))
 
         if jd_structured:
             save_json(jd_structured, output_json_path)
@@ -1,17 +1,32 @@
+import asyncio
+import copy
 import json
+import logging
 import os
 import re
+from datetime import datetime
+from typing import AsyncIterator, Dict, Tuple
 
-from dotenv import load_dotenv
-from langchain_community.document_loaders import PyMuPDFLoader
-from openai import OpenAI
 from pydantic import BaseModel
 
+from ats_ai.agent.llm_client import (
+    OPENAI_MODEL,
+    OPENAI_PARSE_TIMEOUT,
+    build_timeout,
+    create_chat_completion_with_backoff,
+    get_openai_client,
+)
 from ats_ai.agent.prompts import (
+    DYNAMIC_EVALUATION_PROMPT_VERSION,
+    PARSED_RESUME_EVALUATION_PROMPT_VERSION,
     RESUME_PARSE_PROMPT,
+    RESUME_PARSE_PROMPT_VERSION,
     calculate_weighted_score_and_status,
     get_dynamic_evaluation_prompt,
+    get_parsed_resume_evaluation_prompt,
 )
+from ats_ai.agent.response_cache import get_response_cache
+from ats_ai.agent.streaming import IncrementalJSONParser
 
 """
     Using LLM chaining workflow to parse, evaluate, and validate resume and given job description
@@ -19,10 +34,14 @@ from ats_ai.agent.prompts import (
     1. extract_resume_info : extract_resume_info()
     2. evaluate_resume_against_jd : evaluate_resume_against_jd()
     3. Combined Evaluation Agent: combined_parse_evaluate()
+    4. Parse once, evaluate against many JDs: evaluate_resume_against_jds()
+    5. Streaming Combined Evaluation: stream_combined_parse_evaluate()
 """
 
-load_dotenv()
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
+
+# Max concurrent evaluation-only calls when one resume is matched against many JDs
+MATCH_OPENINGS_CONCURRENCY = int(os.getenv("MATCH_OPENINGS_CONCURRENCY", "10"))
 
 
 # Define structured schema for parsed resume info
@@ -47,10 +66,11 @@ class ResumeEvaluation(BaseModel):
     Key_Considerations: dict
 
 
-def load_pdf_text(file_path: str) -> str:
-    loader = PyMuPDFLoader(file_path)
-    pages = loader.load()
-    return " ".join(page.page_content for page in pages)
+class DefaultWeightageConfig(BaseModel):
+    experience_weight: float = 0.3
+    skills_weight: float = 0.4
+    education_weight: float = 0.1
+    projects_weight: float = 0.2
 
 
 def extract_json_block(text: str) -> dict:
@@ -63,49 +83,74 @@ def extract_json_block(text: str) -> dict:
     return json.loads(raw_json)
 
 
-async def extract_resume_info(raw_resume_text: str):
-    """Parse information from resume into JSON"""
-    prompt = RESUME_PARSE_PROMPT.format(raw_resume_text=raw_resume_text)
-
-    response = openai_client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": prompt}], temperature=0.0)
-
-    return extract_json_block(response.choices[0].message.content)
+def llm_cache_key(response_cache, namespace: str, prompt_version: str, key_parts: list) -> str:
+    return response_cache.make_key(namespace, OPENAI_MODEL, prompt_version, *key_parts, datetime.now().strftime("%Y-%m"))
 
 
-async def combined_parse_evaluate(resume_data: str, job_description: dict, weightage_config=None):
+async def cached_llm_json(namespace: str, prompt_version: str, key_parts: list, build_prompt, bulk: bool = False, **completion_kwargs) -> dict:
     """
-    Parse and Evaluate Candidate resume with Job Description with custom weightage
-    Enhanced with experience years calculation and qualification logic
-    - returns Dict[str, Any]: JSON object containing evaluation and parsed result
+    Run one temperature-0 chat completion and return its JSON block, served from the response cache when possible
+    The key covers model, prompt version and inputs; prompts embed the current month for "Present" durations,
+    so the month is part of the key too. build_prompt is only called on a cache miss.
+    bulk=True goes through create_chat_completion_with_backoff, sharing its 429 pause with the other bulk callers.
     """
-    # Use default weightage if not provided
-    if weightage_config is None:
-        from pydantic import BaseModel
+    response_cache = get_response_cache()
+    cache_key = None
+    if response_cache is not None:
+        cache_key = llm_cache_key(response_cache, namespace, prompt_version, key_parts)
+        cached_response = await asyncio.to_thread(response_cache.get, cache_key)
+        if cached_response is not None:
+            logger.info(f"LLM cache hit ({namespace})")
+            return cached_response
+
+    create_completion = create_chat_completion_with_backoff if bulk else get_openai_client().chat.completions.create
+    response = await create_completion(model=OPENAI_MODEL, messages=[{"role": "user", "content": build_prompt()}], temperature=0.0, **completion_kwargs)
+    parsed_response = extract_json_block(response.choices[0].message.content)
 
-        class DefaultWeightageConfig(BaseModel):
-            experience_weight: float = 0.3
-            skills_weight: float = 0.4
-            education_weight: float = 0.1
-            projects_weight: float = 0.2
+    if response_cache is not None:
+        await asyncio.to_thread(response_cache.set, cache_key, namespace, parsed_response)
+    return parsed_response
 
-        weightage_config = DefaultWeightageConfig()
 
-    # Generate enhanced prompt with experience calculation
-    prompt = get_dynamic_evaluation_prompt(resume_data, job_description, weightage_config)
+async def extract_resume_info(raw_resume_text: str):
+    """Parse information from resume into JSON (cached per resume text)"""
+    return await cached_llm_json(
+        "extract_resume_info",
+        RESUME_PARSE_PROMPT_VERSION,
+        [raw_resume_text],
+        lambda: RESUME_PARSE_PROMPT.format(raw_resume_text=raw_resume_text),
+        timeout=build_timeout(OPENAI_PARSE_TIMEOUT),
+    )
 
-    response = openai_client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": prompt}], temperature=0.0, top_p=0.9)
 
-    print("=== RAW RESPONSE ===")
-    print(response.choices[0].message.content)
-    print("=== END RAW RESPONSE ===")
+def has_valid_project_entries(projects) -> bool:
+    """Projects count towards scoring only if the first entry has a real title and description"""
+    if not projects or len(projects) == 0:
+        return False
+    if isinstance(projects[0], dict):
+        # Dictionary format: {"Title": "...", "Description": "..."}
+        first_project = projects[0]
+        title = first_project.get("Title", first_project.get("Project_Name", ""))
+        description = first_project.get("Description", first_project.get("Project_Description", ""))
+        return title not in ["NA", "N/A", "", None] and description not in ["NA", "N/A", "", None] and len(str(description)) > 10
+    if isinstance(projects[0], str):
+        # String format: direct project names
+        return projects[0] not in ["NA", "N/A", "", None] and len(projects[0]) > 10
+    return False
 
-    # Parse the initial response to get individual scores and experience data
-    parsed_response = extract_json_block(response.choices[0].message.content)
 
-    print("=== PARSED RESPONSE ===")
-    print(json.dumps(parsed_response, indent=2))
-    print("=== END PARSED RESPONSE ===")
-    # After line where you get parsed_response, add this:
+def apply_weighted_scoring(parsed_response: dict, weightage_config=None) -> dict:
+    """
+    Apply weightage to the LLM's component scores (no LLM call)
+    Computes Overall_Weighted_Score, Match_Percentage and Qualification Status and returns the standardized
+    {"Evaluation": ..., "Parsed_Resume": ...} response. Safe to re-run on its own output.
+    """
+    # Use default weightage if not provided
+    if weightage_config is None:
+        weightage_config = DefaultWeightageConfig()
+
+    calculated_total_exp = 0.0
+    jd_required_experience = 0.0
     if "Parsed_Resume" in parsed_response:
         professional_exp = parsed_response["Parsed_Resume"].get("Professional_Experience", [])
         calculated_total_exp = 0.0
@@ -123,7 +168,7 @@ async def combined_parse_evaluate(resume_data: str, job_description: dict, weigh
                     except (ValueError, IndexError):
                         continue
         calculated_total_exp = round(calculated_total_exp, 1)
-        print(f"Calculated total experience: {calculated_total_exp}")
+        logger.debug(f"Calculated total experience: {calculated_total_exp}")
 
     # Extract experience information from LLM response and validate with our functions
     try:
@@ -150,7 +195,7 @@ async def combined_parse_evaluate(resume_data: str, job_description: dict, weigh
 
         else:
             # Fallback to our own calculations if LLM didn't provide experience data
-            print("LLM didn't provide experience data, calculating ourselves...")
+            logger.debug("LLM didn't provide experience data, calculating ourselves...")
             llm_match_percentage = None  # ADD THIS LINE
             candidate_total_experience = 0.0
             # jd_required_experience = extract_jd_required_experience(job_description)
@@ -165,8 +210,7 @@ async def combined_parse_evaluate(resume_data: str, job_description: dict, weigh
                 # candidate_total_experience = calculate_total_experience_years(resume_experience)
 
     except KeyError as e:
-        print(f"KeyError accessing scores: {e}")
-        print(f"Available keys in parsed_response: {list(parsed_response.keys())}")
+        logger.warning(f"KeyError accessing scores: {e}; available keys in parsed_response: {list(parsed_response.keys())}")
 
         # Fallback values with our own calculations
         llm_match_percentage = None  # ADD THIS LINE
@@ -186,17 +230,7 @@ async def combined_parse_evaluate(resume_data: str, job_description: dict, weigh
         projects = []
 
     # Check if projects are valid
-    has_valid_projects = False
-    if projects and len(projects) > 0:
-        if isinstance(projects[0], dict):
-            # Dictionary format: {"Title": "...", "Description": "..."}
-            first_project = projects[0]
-            title = first_project.get("Title", first_project.get("Project_Name", ""))
-            description = first_project.get("Description", first_project.get("Project_Description", ""))
-            has_valid_projects = title not in ["NA", "N/A", "", None] and description not in ["NA", "N/A", "", None] and len(str(description)) > 10
-        elif isinstance(projects[0], str):
-            # String format: direct project names
-            has_valid_projects = projects[0] not in ["NA", "N/A", "", None] and len(projects[0]) > 10
+    has_valid_projects = has_valid_project_entries(projects)
 
     # Use enhanced calculation that includes experience years comparison
     calculation_result = calculate_weighted_score_and_status(
@@ -247,3 +281,118 @@ async def combined_parse_evaluate(resume_data: str, job_description: dict, weigh
         parsed_response["Evaluation"]["Qualification Status"] = calculation_result["qualification_status"]
 
         return parsed_response
+
+
+async def combined_parse_evaluate(resume_data: str, job_description: dict, weightage_config=None, bulk: bool = False):
+    """
+    Parse and Evaluate Candidate resume with Job Description with custom weightage
+    Enhanced with experience years calculation and qualification logic
+    bulk=True for background jobs: rate-limited calls back off together (see cached_llm_json)
+    - returns Dict[str, Any]: JSON object containing evaluation and parsed result
+    """
+    # The prompt is weight-independent, so one cached response serves every weightage.
+    parsed_response = await cached_llm_json(
+        "combined_parse_evaluate",
+        DYNAMIC_EVALUATION_PROMPT_VERSION,
+        [resume_data, job_description],
+        lambda: get_dynamic_evaluation_prompt(resume_data, job_description),
+        top_p=0.9,
+        timeout=build_timeout(),
+        bulk=bulk,
+    )
+
+    return apply_weighted_scoring(parsed_response, weightage_config)
+
+
+async def stream_combined_parse_evaluate(resume_data: str, job_description: dict, weightage_config=None) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Streaming variant of combined_parse_evaluate (same prompt and cache entry)
+    - yields (event, data) tuples: "progress" messages, one "field" per completed {section, key, value}
+      as the model generates it, and finally "result" with the scored response
+    """
+    response_cache = get_response_cache()
+    cache_key = None
+    if response_cache is not None:
+        cache_key = llm_cache_key(response_cache, "combined_parse_evaluate", DYNAMIC_EVALUATION_PROMPT_VERSION, [resume_data, job_description])
+        cached_response = await asyncio.to_thread(response_cache.get, cache_key)
+        if cached_response is not None:
+            yield "progress", {"stage": "cached", "message": "Loaded a previous evaluation of this resume and JD"}
+            yield "result", apply_weighted_scoring(cached_response, weightage_config)
+            return
+
+    yield "progress", {"stage": "requesting", "message": "Sending resume and JD to the model"}
+    prompt = get_dynamic_evaluation_prompt(resume_data, job_description)
+    stream = await get_openai_client().chat.completions.create(model=OPENAI_MODEL, messages=[{"role": "user", "content": prompt}], temperature=0.0, top_p=0.9, timeout=build_timeout(), stream=True)
+
+    parser = IncrementalJSONParser()
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if not content:
+            continue
+        if not parser.buffer:
+            yield "progress", {"stage": "generating", "message": "Model is generating the evaluation"}
+        for section, key, value in parser.feed(content):
+            yield "field", {"section": section, "key": key, "value": value}
+
+    parsed_response = extract_json_block(parser.buffer)
+    if response_cache is not None:
+        await asyncio.to_thread(response_cache.set, cache_key, "combined_parse_evaluate", parsed_response)
+    yield "result", apply_weighted_scoring(parsed_response, weightage_config)
+
+
+async def evaluate_resume_against_jd(parsed_resume: dict, job_description: dict, weightage_config=None):
+    """
+    Evaluate an already parsed resume (extract_resume_info output) against one Job Description
+    Sends the compact parsed JSON and asks only for the Evaluation section, so it is much cheaper than
+    combined_parse_evaluate when the same resume is checked against many JDs.
+    - returns Dict[str, Any]: {"Evaluation": ..., "Parsed_Resume": ...} like combined_parse_evaluate
+    """
+    llm_response = await cached_llm_json(
+        "evaluate_resume_against_jd",
+        PARSED_RESUME_EVALUATION_PROMPT_VERSION,
+        [parsed_resume, job_description],
+        lambda: get_parsed_resume_evaluation_prompt(parsed_resume, job_description),
+        timeout=build_timeout(),
+    )
+
+    evaluation = llm_response.get("Evaluation", llm_response)
+    return apply_weighted_scoring({"Evaluation": evaluation, "Parsed_Resume": parsed_resume}, weightage_config)
+
+
+async def evaluate_resume_against_jds(raw_resume_text: str, job_descriptions: Dict[str, dict], weightage_config=None, max_concurrency: int = MATCH_OPENINGS_CONCURRENCY):
+    """
+    Parse the resume once, then evaluate it against every JD concurrently
+    - returns Dict[str, Any]: {"Parsed_Resume": ..., "matches": [...]} with matches sorted by Overall_Weighted_Score
+    """
+    parsed_resume = await extract_resume_info(raw_resume_text)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def evaluate_one(jd_name: str, job_description: dict):
+        async with semaphore:
+            try:
+                result = await evaluate_resume_against_jd(parsed_resume, job_description, weightage_config)
+            except Exception as e:
+                return {"jd_name": jd_name, "status": "failed", "error": str(e)}
+        evaluation = result["Evaluation"]
+        return {
+            "jd_name": jd_name,
+            "status": "completed",
+            "Overall_Weighted_Score": evaluation.get("Overall_Weighted_Score", 0.0),
+            "Match_Percentage": evaluation.get("Match_Percentage"),
+            "Qualification Status": evaluation.get("Qualification Status"),
+            "Evaluation": evaluation,
+        }
+
+    matches = await asyncio.gather(*(evaluate_one(jd_name, job_description) for jd_name, job_description in job_descriptions.items()))
+    matches = sorted(matches, key=lambda match: match.get("Overall_Weighted_Score", -1.0), reverse=True)
+    return {"Parsed_Resume": parsed_resume, "matches": matches}
+
+
+def rescore_evaluation(evaluation_response: dict, weightage_config=None) -> dict:
+    """
+    Re-score a stored /parse_and_evaluate result for a new weightage without calling the LLM
+    - returns Dict[str, Any]: the same structure with updated Overall_Weighted_Score and Qualification Status
+    """
+    return apply_weighted_scoring(copy.deepcopy(evaluation_response), weightage_config)
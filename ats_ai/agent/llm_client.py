@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Optional
+
+import httpx
+import openai
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+"""
+    Shared async OpenAI client used by the agent layer.
+    A single AsyncOpenAI instance (backed by one pooled httpx.AsyncClient) is created at app startup
+    and reused by llm_agent, jd_parser and every endpoint, so many LLM calls can be in flight at once
+    without opening a new connection per request.
+"""
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+
+# ---- Connection pool / timeout tuning (overridable from .env) ----
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))
+OPENAI_READ_TIMEOUT = float(os.getenv("OPENAI_READ_TIMEOUT", "120"))
+OPENAI_PARSE_TIMEOUT = float(os.getenv("OPENAI_PARSE_TIMEOUT", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))  # SDK retries, except for calls through create_chat_completion_with_backoff
+
+# ---- Rate-limit backoff for bulk callers (create_chat_completion_with_backoff) ----
+OPENAI_RATE_LIMIT_RETRIES = int(os.getenv("OPENAI_RATE_LIMIT_RETRIES", "4"))
+OPENAI_BACKOFF_BASE_SECONDS = float(os.getenv("OPENAI_BACKOFF_BASE_SECONDS", "2"))
+OPENAI_BACKOFF_MAX_SECONDS = float(os.getenv("OPENAI_BACKOFF_MAX_SECONDS", "60"))
+
+_openai_client: Optional[AsyncOpenAI] = None
+_rate_limited_until = 0.0  # monotonic time before which bulk callers hold off after a 429
+
+
+def build_timeout(read_timeout: float = OPENAI_READ_TIMEOUT) -> httpx.Timeout:
+    """Per-call timeout: short connect/pool waits, long read for slow completions"""
+    return httpx.Timeout(read_timeout, connect=OPENAI_CONNECT_TIMEOUT, pool=OPENAI_CONNECT_TIMEOUT)
+
+
+def create_openai_client() -> AsyncOpenAI:
+    """Create an AsyncOpenAI client on top of a tuned, keep-alive httpx connection pool"""
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=build_timeout(),
+    )
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client, max_retries=OPENAI_MAX_RETRIES)
+
+
+async def init_openai_client() -> AsyncOpenAI:
+    """Create the shared client once (called from the FastAPI startup hook)"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = create_openai_client()
+        logger.info(f"Shared OpenAI client ready (max_connections={OPENAI_MAX_CONNECTIONS}, keepalive={OPENAI_MAX_KEEPALIVE_CONNECTIONS})")
+    return _openai_client
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the shared client, creating it lazily for scripts that don't run the app startup hook"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = create_openai_client()
+    return _openai_client
+
+
+async def close_openai_client():
+    """Close the pooled connections (called from the FastAPI shutdown hook)"""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+        logger.info("Shared OpenAI client closed")
+
+
+def retry_after_seconds(error: openai.APIStatusError) -> Optional[float]:
+    """Delay requested by the API in the retry-after-ms / retry-after headers, if any"""
+    headers = error.response.headers if error.response is not None else {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # HTTP-date form, fall back to exponential backoff
+    return None
+
+
+async def create_chat_completion_with_backoff(max_rate_limit_retries: int = OPENAI_RATE_LIMIT_RETRIES, **completion_kwargs):
+    """
+    chat.completions.create for bulk jobs that fire many calls at once
+    On a 429 it waits for the server's retry-after (or exponential backoff with jitter) and retries, and makes every
+    other caller going through this function pause until then too, instead of each one hammering the rate limit.
+    The SDK's own retries are turned off for these calls, so a 429 is retried here only and attempts don't multiply.
+    - raises openai.RateLimitError once max_rate_limit_retries is exhausted
+    """
+    global _rate_limited_until
+    for attempt in range(max_rate_limit_retries + 1):
+        pause = _rate_limited_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        try:
+            return await get_openai_client().with_options(max_retries=0).chat.completions.create(**completion_kwargs)
+        except openai.RateLimitError as e:
+            if attempt == max_rate_limit_retries:
+                raise
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = min(OPENAI_BACKOFF_MAX_SECONDS, OPENAI_BACKOFF_BASE_SECONDS * 2**attempt) * random.uniform(0.5, 1.0)
+            _rate_limited_until = max(_rate_limited_until, time.monotonic() + delay)
+            logger.warning(f"OpenAI rate limit hit, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_rate_limit_retries})")
@@ -0,0 +1,221 @@
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ats_ai.agent.llm_agent import combined_parse_evaluate
+
+"""
+    Deterministic pre-screen in front of combined_parse_evaluate.
+    Compares the raw resume text with the JD JSON locally (normalized Required_Skills overlap and a
+    regex estimate of experience years) and returns a provisional "Not Qualified" verdict with reasons
+    when a configured threshold is clearly missed. Anything borderline or unknown is escalated to the LLM,
+    so the pre-screen only ever saves calls, it never qualifies a candidate on its own.
+"""
+
+PRESCREEN_MIN_SKILL_OVERLAP = float(os.getenv("PRESCREEN_MIN_SKILL_OVERLAP", "0.1"))
+PRESCREEN_MIN_EXPERIENCE_RATIO = float(os.getenv("PRESCREEN_MIN_EXPERIENCE_RATIO", "0.5"))
+PRESCREEN_MIN_REQUIRED_SKILLS = int(os.getenv("PRESCREEN_MIN_REQUIRED_SKILLS", "3"))
+
+# Words that say nothing about *which* skill is required ("Strong working knowledge of ...")
+GENERIC_SKILL_WORDS = {
+    "a", "ability", "an", "and", "any", "as", "at", "background", "basic", "capabilities", "concepts", "deep", "e.g", "eg", "etc",
+    "excellent", "experience", "expertise", "familiarity", "following", "for", "good", "hands-on", "in", "including", "is", "knowledge",
+    "language", "languages", "least", "like", "of", "on", "one", "or", "other", "practices", "preferably", "proficiency", "proven",
+    "skill", "skills", "solid", "strong", "such", "the", "their", "to", "tools", "understanding", "using", "with", "working", "years",
+}  # fmt: skip
+PLACEHOLDER_SKILLS = {"to be determined", "na", "n/a"}
+
+MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6, "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
+DATE_PATTERN = r"(?:(?P<{p}month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*[,']?\s*|(?P<{p}month_num>\d{{1,2}})\s*[/.-]\s*)?(?P<{p}year>(?:19|20)\d{{2}})"
+DATE_RANGE_REGEX = re.compile(
+    DATE_PATTERN.format(p="start_") + r"\s*(?:-|–|—|to|till|until)\s*(?:" + DATE_PATTERN.format(p="end_") + r"|(?P<present>present|current|now|till date|today|ongoing))",
+    re.IGNORECASE,
+)
+STATED_EXPERIENCE_REGEX = re.compile(r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years|yrs)\.?\s*(?:of\s+)?(?:\w+\s+){0,3}?(?:experience|exp\b)", re.IGNORECASE)
+REQUIRED_EXPERIENCE_REGEX = re.compile(r"(\d{1,2}(?:\.\d)?)\s*(?:\+|(?:to|-|–)\s*\d{1,2}(?:\.\d)?)?\s*\+?\s*(?:years|yrs)", re.IGNORECASE)
+
+
+class PrescreenConfig(BaseModel):
+    min_skill_overlap: float = PRESCREEN_MIN_SKILL_OVERLAP  # Fraction of Required_Skills entries found in the resume
+    min_experience_ratio: float = PRESCREEN_MIN_EXPERIENCE_RATIO  # Estimated years / JD minimum years
+    min_required_skills: int = PRESCREEN_MIN_REQUIRED_SKILLS  # Skip the skills check for JDs with fewer Required_Skills entries
+
+
+class PrescreenResult(BaseModel):
+    escalate: bool  # True -> send to the LLM, False -> provisional "Not Qualified"
+    reasons: List[str] = []
+    skill_overlap: Optional[float] = None
+    matched_skills: List[str] = []
+    missing_skills: List[str] = []
+    estimated_experience_years: Optional[float] = None
+    required_experience_years: Optional[float] = None
+
+
+def _normalize_word(word: str) -> str:
+    word = word.strip(".")
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words in order, repeats kept; keeps tech spellings like c++, c#, .net, node.js (also as nodejs)"""
+    tokens = []
+    for word in re.sub(r"[^a-z0-9+#.\-]", " ", text.lower()).split():
+        for part in [word, *word.split("-")] if "-" in word else [word]:
+            part = _normalize_word(part)
+            if part:
+                tokens.append(part)
+                if "." in part:
+                    tokens.append(part.replace(".", ""))
+    return tokens
+
+
+def normalize_tokens(text: str) -> set:
+    """Lower-cased word set (see tokenize)"""
+    return set(tokenize(text))
+
+
+def skill_terms(required_skill: str) -> List[List[str]]:
+    """
+    Split one Required_Skills entry into alternative terms, each a list of significant words
+    e.g. "Oracle ERP (EBS/Fusion)" -> [["oracle", "erp"], ["ebs"], ["fusion"]]
+    """
+    terms = []
+    for piece in re.split(r"[/,;:()\[\]]|\band\b|\bor\b|\be\.g\.", required_skill.lower()):
+        # Generic words are checked before and after the plural is stripped ("years" -> "year", "tools" -> "tool")
+        words = [_normalize_word(word) for word in re.sub(r"[^a-z0-9+#.\-]", " ", piece).split() if word not in GENERIC_SKILL_WORDS]
+        words = [word for word in words if word and word not in GENERIC_SKILL_WORDS and not word.rstrip("+").isdigit()]
+        if words:
+            terms.append(words)
+    return terms
+
+
+def match_required_skills(resume_text: str, required_skills: List[str]):
+    """Return (matched, missing) Required_Skills entries; an entry matches when all words of any of its terms appear in the resume"""
+    resume_tokens = normalize_tokens(resume_text)
+    matched, missing = [], []
+    for required_skill in required_skills:
+        terms = skill_terms(required_skill)
+        if not terms:
+            continue
+        if any(all(word in resume_tokens or word.replace(".", "") in resume_tokens for word in term) for term in terms):
+            matched.append(required_skill)
+        else:
+            missing.append(required_skill)
+    return matched, missing
+
+
+def parse_required_experience(minimum_experience: Any) -> Optional[float]:
+    """Lower bound of the JD's Minimum_Experience ("5+ years", "4–7 years", "0 to 3 years"), None if not stated in years"""
+    if isinstance(minimum_experience, (int, float)):
+        return float(minimum_experience)
+    if not isinstance(minimum_experience, str):
+        return None
+    match = REQUIRED_EXPERIENCE_REGEX.search(minimum_experience)
+    return float(match.group(1)) if match else None
+
+
+def _month_index(match: re.Match, prefix: str, default_month: int) -> int:
+    year = int(match.group(f"{prefix}year"))
+    month_name = match.group(f"{prefix}month")
+    month_num = match.group(f"{prefix}month_num")
+    if month_name:
+        month = MONTHS[month_name.lower()[:3]]
+    elif month_num and 1 <= int(month_num) <= 12:
+        month = int(month_num)
+    else:
+        month = default_month
+    return year * 12 + month - 1
+
+
+def estimate_experience_years(resume_text: str) -> Optional[float]:
+    """
+    Cheap experience estimate: union of all date ranges in the resume, or an explicit "N years of experience",
+    whichever is larger. Education ranges are counted too, which only makes the estimate more lenient.
+    - returns None when the resume has no usable dates
+    """
+    now = datetime.now()
+    current_month = now.year * 12 + now.month - 1
+    intervals = []
+    for match in DATE_RANGE_REGEX.finditer(resume_text):
+        start = _month_index(match, "start_", 1)
+        end = current_month if match.group("present") else _month_index(match, "end_", 12)
+        end = min(end, current_month)
+        if start <= end:
+            intervals.append((start, end + 1))
+
+    # Merge overlapping ranges so parallel roles are not double counted
+    months, last_end = 0, None
+    for start, end in sorted(intervals):
+        if last_end is not None and start < last_end:
+            start = last_end
+        if end > start:
+            months += end - start
+            last_end = end
+    estimates = [months / 12] if intervals else []
+    estimates += [float(value) for value in STATED_EXPERIENCE_REGEX.findall(resume_text)]
+    return round(max(estimates), 1) if estimates else None
+
+
+def prescreen_resume(resume_text: str, job_description: Dict[str, Any], config: Optional[PrescreenConfig] = None) -> PrescreenResult:
+    """Decide locally whether a resume is an obvious mismatch for the JD"""
+    if config is None:
+        config = PrescreenConfig()
+    result = PrescreenResult(escalate=True)
+
+    required_skills = [skill for skill in job_description.get("Required_Skills", []) if isinstance(skill, str) and skill.strip().lower() not in PLACEHOLDER_SKILLS]
+    if required_skills:
+        matched, missing = match_required_skills(resume_text, required_skills)
+        if matched or missing:
+            result.matched_skills, result.missing_skills = matched, missing
+            result.skill_overlap = round(len(matched) / (len(matched) + len(missing)), 2)
+            if len(required_skills) >= config.min_required_skills and result.skill_overlap < config.min_skill_overlap:
+                result.reasons.append(f"Required skills overlap {result.skill_overlap:.0%} is below {config.min_skill_overlap:.0%} ({len(matched)}/{len(matched) + len(missing)} matched)")
+
+    result.required_experience_years = parse_required_experience(job_description.get("Minimum_Experience"))
+    result.estimated_experience_years = estimate_experience_years(resume_text)
+    if result.required_experience_years and result.estimated_experience_years is not None:
+        if result.estimated_experience_years < result.required_experience_years * config.min_experience_ratio:
+            result.reasons.append(f"Estimated experience {result.estimated_experience_years} years is far below the required {result.required_experience_years}+ years")
+
+    result.escalate = not result.reasons
+    return result
+
+
+def provisional_evaluation(prescreen_result: PrescreenResult) -> Dict[str, Any]:
+    """combined_parse_evaluate-shaped response for a resume rejected by the pre-screen (no LLM call made)"""
+    return {
+        "Evaluation": {
+            "Total_Experience_Years": prescreen_result.estimated_experience_years or 0.0,
+            "JD_Required_Experience_Years": prescreen_result.required_experience_years or 0.0,
+            "Experience_Score": 0.0,
+            "Skills_Score": 0.0,
+            "Education_Score": 0.0,
+            "Projects_Score": 0.0,
+            "Overall_Weighted_Score": 0.0,
+            "Match_Percentage": f"{(prescreen_result.skill_overlap or 0.0) * 100:.1f}%",
+            "Qualification Status": "Not Qualified - Pre-screen",
+            "Pros": [],
+            "Cons": prescreen_result.reasons,
+            "Skills Match": prescreen_result.matched_skills,
+            "Required_Skills_Missing_from_Resume": prescreen_result.missing_skills,
+            "Extra skills": [],
+            "Summary": "Provisional verdict from the local pre-screen; the resume was not sent for LLM evaluation. " + " ".join(prescreen_result.reasons),
+        },
+        "Parsed_Resume": {},
+        "Prescreen": prescreen_result.model_dump(),
+    }
+
+
+async def prescreen_and_evaluate(resume_data: str, job_description: Dict[str, Any], weightage_config=None, prescreen_config: Optional[PrescreenConfig] = None, bulk: bool = False) -> Dict[str, Any]:
+    """Run the pre-screen and only escalate borderline/likely candidates to combined_parse_evaluate"""
+    prescreen_result = prescreen_resume(resume_data, job_description, prescreen_config)
+    if not prescreen_result.escalate:
+        return provisional_evaluation(prescreen_result)
+
+    evaluation = await combined_parse_evaluate(resume_data, job_description, weightage_config, bulk=bulk)
+    return {**evaluation, "Prescreen": prescreen_result.model_dump()}
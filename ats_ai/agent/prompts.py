@@ -31,6 +31,9 @@ RETURN FORMAT (strictly follow this):
 Return only the structured JSON output.
 """.strip()
 
+# Bump whenever JD_EXTRACTION_PROMPT changes; process_jd_folder_to_json re-converts JDs produced by an older version
+JD_EXTRACTION_PROMPT_VERSION = "1"
+
 EVALUATION_PROMPT = """
     You are a **highly experienced Senior HR Professional and Technical Recruiter** with 15+ years of experience in technical hiring.
     Your primary objective is to **accurately and reliably evaluate a candidate's resume against a given Job Description (JD)**. Provide a comprehensive, nuanced assessment that directly aids in critical hiring decisions.
@@ -212,14 +215,13 @@ RESUME_PARSE_PROMPT = """
             }}
             // Add more professional experience entries as separate objects if present.
           ],
-        "Projects": [
-          {
-            "Title": "project name or NA if no projects",
-            "Description": "summary of the project or NA if no projects",
-            "Technologies": ["list ALL underlying technologies, platforms, databases, and infrastructure tools found ANYWHERE in resume
-             including dedicated skills sections (e.g., AWS, Azure, Docker, Kubernetes, SQL, MongoDB, Git, Jenkins, Terraform, Ansible)"]
-
-        ],
+          "Projects": [
+            {{
+              "Title": "project name or NA if no projects",
+              "Description": "summary of the project or NA if no projects",
+              "Technologies": ["list ALL underlying technologies, platforms, databases, and infrastructure tools found ANYWHERE in resume
+               including dedicated skills sections (e.g., AWS, Azure, Docker, Kubernetes, SQL, MongoDB, Git, Jenkins, Terraform, Ansible)"]
+            }}
             // Add more project entries as separate objects if present.
           ],
           "Certifications": [
@@ -366,14 +368,17 @@ def calculate_weighted_score_and_status(
     }
 
 
-def get_dynamic_evaluation_prompt(resume_data, job_description, weightage_config):
-    """Generate enhanced evaluation prompt with robust skill extraction and grouping fix"""
-    import json
+# Bump whenever get_dynamic_evaluation_prompt changes so cached LLM responses are not reused across prompt edits
+DYNAMIC_EVALUATION_PROMPT_VERSION = "2"
+
 
-    exp_pct = weightage_config.experience_weight * 100
-    skills_pct = weightage_config.skills_weight * 100
-    edu_pct = weightage_config.education_weight * 100
-    projects_pct = weightage_config.projects_weight * 100
+def get_dynamic_evaluation_prompt(resume_data, job_description):
+    """
+    Generate enhanced evaluation prompt with robust skill extraction and grouping fix
+    The prompt is weight-independent: weightage is applied afterwards by calculate_weighted_score_and_status,
+    so one LLM response can be re-scored for any weightage.
+    """
+    import json
 
     current_date = datetime.now()
     current_month_year = current_date.strftime("%B %Y")  # e.g., "December 2025"
@@ -383,8 +388,6 @@ def get_dynamic_evaluation_prompt(resume_data, job_description, weightage_config
     return f"""
 You are an expert resume evaluator. Analyze the resume against the job description with detailed explanations.
 
-    WEIGHTS: Experience {exp_pct}%, Skills {skills_pct}%, Education {edu_pct}%, Projects {projects_pct}%
-
     **STEP-BACK ANALYSIS (Internal – Do Not Output):**
     1. Parse the ENTIRE resume (Skills section, Professional Experience, Education, Certifications, and Projects).
     2. Extract ALL technical skills, tools, frameworks, and technologies mentioned ANYWHERE in the resume.
@@ -504,9 +507,7 @@ You are an expert resume evaluator. Analyze the resume against the job descripti
         "Skills_Score": <float>,       # 0–10
         "Education_Score": <float>,    # 0–10
         "Projects_Score": <float>,     # 0–10
-        "Overall_Weighted_Score": <float>,
        "Match_Percentage": "<your_direct_assessment>%",
-        "Qualification Status": "<string>",
         "Pros": [ 
         " Only list strengths that are relevant to the JD requirements or domain."
         " Do NOT mention technical/backend/cloud/DevOps skills as strengths if the JD is for non-technical roles (e.g., Communication, Marketing, HR)."
@@ -589,3 +590,64 @@ You are an expert resume evaluator. Analyze the resume against the job descripti
     RESUME: {resume_data}
     JOB DESCRIPTION: {json.dumps(job_description)}
     """
+
+
+# Bump whenever RESUME_PARSE_PROMPT or get_parsed_resume_evaluation_prompt changes (cache keys depend on them)
+RESUME_PARSE_PROMPT_VERSION = "1"
+PARSED_RESUME_EVALUATION_PROMPT_VERSION = "1"
+
+
+def get_parsed_resume_evaluation_prompt(parsed_resume, job_description):
+    """
+    Evaluation-only prompt for the parse-once pipeline
+    Takes an already parsed resume (RESUME_PARSE_PROMPT output) instead of raw text and asks only for the
+    "Evaluation" section, so each extra JD costs a fraction of the tokens of get_dynamic_evaluation_prompt.
+    Weight-independent like get_dynamic_evaluation_prompt; weightage is applied afterwards.
+    """
+    import json
+
+    current_month_year = datetime.now().strftime("%B %Y")
+
+    return f"""
+You are an expert resume evaluator. Evaluate the already-parsed resume JSON against the job description.
+
+    RULES:
+    1. The candidate skill set is the union of Programming_Language, Frameworks, Technologies, project Technologies and any tools named in
+       Professional_Experience descriptions or Certifications. Do not drop a skill because of its duration.
+    2. Match skills semantically, ignoring case: treat aliases as equal ("Go" = "Golang", "Kafka" = "Apache Kafka") and mark a JD category
+       (e.g. "CI/CD tools like Jenkins, GitLab", "DevOps", "Cloud") satisfied when the resume has a tool that belongs to it.
+    3. Total_Experience_Years = sum of each Professional_Experience duration in decimal years
+       ((End Year - Start Year) + (End Month - Start Month) / 12, rounded to 1 decimal). Use {current_month_year} for "Present"/"Current".
+       If no dates are given for an entry, count it as 0. JD_Required_Experience_Years is the minimum years the JD asks for (0 if none).
+    4. Scores are floats 0-10:
+       - Experience_Score: relevance and quality of experience to the JD; 0.0 if there is no professional experience.
+       - Skills_Score: coverage and demonstrated use of JD-required skills.
+       - Education_Score: degree level and field relevance to the JD.
+       - Projects_Score: relevance and complexity of projects; 0.0 if there are no real projects.
+    5. Match_Percentage: your direct assessment of how much of the JD (skills, experience, qualifications, responsibilities) the resume satisfies.
+    6. Only list strengths relevant to the JD's domain. If Total_Experience_Years < JD_Required_Experience_Years, the first Cons entry MUST be:
+       "Candidate having less experience requires <JD_Required_Experience_Years>+ years".
+    7. Do not invent information that is not in the resume or JD.
+
+    RETURN ONLY THIS EXACT JSON STRUCTURE:
+    {{
+      "Evaluation": {{
+        "Total_Experience_Years": <float>,
+        "JD_Required_Experience_Years": <float>,
+        "Experience_Score": <float>,
+        "Skills_Score": <float>,
+        "Education_Score": <float>,
+        "Projects_Score": <float>,
+        "Match_Percentage": "<your_direct_assessment>%",
+        "Pros": ["JD-relevant strengths"],
+        "Cons": ["specific weaknesses, experience gap first if any"],
+        "Skills Match": ["Resume_Skill → JD_Category (Implementation: how it was used) - strong alignment / exceeds requirement / partial match / some alignment"],
+        "Required_Skills_Missing_from_Resume": ["JD-required skills not in the candidate skill set"],
+        "Extra skills": ["tools/technologies beyond the JD, excluding certifications"],
+        "Summary": "<string>"
+      }}
+    }}
+
+    PARSED RESUME: {json.dumps(parsed_resume, ensure_ascii=False)}
+    JOB DESCRIPTION: {json.dumps(job_description, ensure_ascii=False)}
+    """
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+"""
+    Persistent, content-addressed cache for LLM responses.
+    Entries are keyed by a SHA-256 over (namespace, model, prompt version, input parts) and stored in a local
+    SQLite file, so re-evaluating the same resume against the same JD returns in milliseconds instead of
+    paying for another GPT-4o call. Expired entries (TTL) and least-recently-used entries beyond
+    max_entries are evicted on write.
+"""
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/cache/llm_responses.sqlite3")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+
+def canonical_json(data: Any) -> str:
+    """Stable JSON text for hashing: sorted keys, no insignificant whitespace"""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+class LLMResponseCache:
+    def __init__(self, db_path: str = LLM_CACHE_PATH, ttl_seconds: int = LLM_CACHE_TTL_SECONDS, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @staticmethod
+    def make_key(namespace: str, model: str, prompt_version: str, *parts: Any) -> str:
+        """Content address of an LLM call: any change in model, prompt version or inputs yields a new key"""
+        digest = hashlib.sha256()
+        for part in (namespace, model, prompt_version, *parts):
+            text = part if isinstance(part, str) else canonical_json(part)
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\x1f")  # unit separator so ("ab", "c") != ("a", "bc")
+        return digest.hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    response_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_accessed ON llm_responses(last_accessed)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on miss/expiry"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT response_json, created_at FROM llm_responses WHERE cache_key = ?", (key,)).fetchone()
+            if row is None or (self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds):
+                self.misses += 1
+                return None
+            conn.execute("UPDATE llm_responses SET last_accessed = ? WHERE cache_key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, namespace: str, response: Dict[str, Any]):
+        """Store a response and evict expired / least-recently-used entries"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (cache_key, namespace, response_json, created_at, last_accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, json.dumps(response, ensure_ascii=False), now, now),
+            )
+            evicted = 0
+            if self.ttl_seconds > 0:
+                evicted += conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+            if self.max_entries > 0:
+                evicted += conn.execute(
+                    "DELETE FROM llm_responses WHERE cache_key IN (SELECT cache_key FROM llm_responses ORDER BY last_accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+            conn.commit()
+            self.evictions += evicted
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM llm_responses")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._connection().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "enabled": LLM_CACHE_ENABLED,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Shared cache instance, or None when caching is disabled via LLM_CACHE_ENABLED"""
+    global _response_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        _response_cache = LLMResponseCache()
+    return _response_cache
@@ -0,0 +1,89 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+"""
+    Incremental parser for a streamed LLM JSON response.
+    The evaluation responses are {"<Section>": {"<Field>": <value>, ...}, ...}. IncrementalJSONParser is fed the
+    raw text chunks as they arrive and reports every (section, field, value) as soon as that field's value is
+    complete, so callers can show scores or resume details long before the whole response has been generated.
+    Text before the first "{" (e.g. a ```json fence) is ignored; the final, authoritative parse is still done
+    on the full text with extract_json_block.
+"""
+
+
+class IncrementalJSONParser:
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []  # open containers, "{" or "["
+        self._keys: List[Optional[str]] = []  # current key for each open object (None for arrays)
+        self._expect_key = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._value_start: Optional[int] = None  # start of the field value being read inside a section
+
+    def _complete(self, end: int, events: List[Tuple[str, str, Any]]):
+        start, self._value_start = self._value_start, None
+        raw_value = self.buffer[start:end]
+        try:
+            value = json.loads(raw_value)
+        except ValueError:
+            return  # Not valid JSON (e.g. a stray comment); left to the final parse
+        events.append((self._keys[0], self._keys[1], value))
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        """Consume a chunk and return the (section, field, value) triples completed by it"""
+        self.buffer += chunk
+        events = []
+        while self._pos < len(self.buffer):
+            index = self._pos
+            char = self.buffer[index]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._expect_key:
+                        key_start, key_end = self._string_start, index + 1
+                        self._keys[-1] = json.loads(self.buffer[key_start:key_end])
+                        self._expect_key = False
+                    elif len(self._stack) == 2 and self._value_start == self._string_start:
+                        self._complete(index + 1, events)
+                continue
+
+            if not self._stack and char != "{":
+                continue
+            in_section = len(self._stack) == 2
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+                if in_section and not self._expect_key and self._value_start is None:
+                    self._value_start = index
+            elif char in "{[":
+                if in_section and self._value_start is None:
+                    self._value_start = index
+                self._stack.append(char)
+                self._keys.append(None)
+                self._expect_key = char == "{"
+            elif char in "}]":
+                if in_section and self._value_start is not None:
+                    self._complete(index, events)  # Scalar that was the last field of the section
+                self._stack.pop()
+                self._keys.pop()
+                self._expect_key = False
+                if len(self._stack) == 2 and self._value_start is not None:
+                    self._complete(index + 1, events)
+            elif char == ",":
+                if in_section and self._value_start is not None:
+                    self._complete(index, events)
+                self._expect_key = self._stack[-1] == "{"
+            elif char != ":" and not char.isspace():
+                if in_section and not self._expect_key and self._value_start is None:
+                    self._value_start = index  # number / true / false / null
+        return events
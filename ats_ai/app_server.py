@@ -1,37 +1,67 @@
 import asyncio
+import hashlib
 import json
 import logging
 import os
 import re
-import shutil
 import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-import mammoth
 from apscheduler.schedulers.background import BackgroundScheduler
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import FastAPI, File, HTTPException, Query, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, PlainTextResponse
-from langchain_community.document_loaders import PyMuPDFLoader
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from starlette import status
 from starlette.responses import RedirectResponse
 
+from ats_ai.agent.batch_scoring import rescore_evaluations_batch
 from ats_ai.agent.jd_parser import extract_jd_info
 
 # ---- Import your agent functions ----
-from ats_ai.agent.llm_agent import (  # evaluate_resume_against_jd,
+from ats_ai.agent.llm_agent import (
     combined_parse_evaluate,
+    evaluate_resume_against_jds,
     extract_resume_info,
+    rescore_evaluation,
+    stream_combined_parse_evaluate,
 )
+from ats_ai.agent.llm_client import close_openai_client, init_openai_client
+from ats_ai.agent.prescreen import (
+    PrescreenConfig,
+    prescreen_and_evaluate,
+    prescreen_resume,
+    provisional_evaluation,
+)
+from ats_ai.agent.response_cache import canonical_json, get_response_cache
+from ats_ai.evaluation_store import (
+    CandidateEvaluationSummary,
+    close_evaluation_store,
+    get_evaluation_store,
+)
+from ats_ai.extraction import (
+    SUPPORTED_DOCUMENT_EXTENSIONS,
+    extract_document_text,
+    shutdown_document_extractor,
+)
+from ats_ai.jd_registry import get_jd_registry
+from ats_ai.job_queue import JobResume, get_job_queue
+from ats_ai.models.server_models_schema import Cand_Decision
+from ats_ai.near_duplicates import NearDuplicate, get_near_duplicate_index
 from ats_ai.pdf_generator import generate_pdf_report
+from ats_ai.resume_store import UploadTooLargeError, get_resume_store
+from ats_ai.retrieval import get_jd_retrieval_index, jd_query_terms
 from ats_ai.scraper import CalfusJobScraper
+from ats_ai.text_cache import get_text_cache
 
 # ---- Constants ----
 RESUME_UPLOAD_FOLDER = "data/"
-JD_UPLOAD_FOLDER = "jd_json/"
 RESUME_FILE_UPLOAD = File(...)
+PAGE_LIMIT_QUERY = Query(50, ge=1, le=500)
+PAGE_OFFSET_QUERY = Query(0, ge=0)
+SKILLS_QUERY = Query(None)
+TOP_K_QUERY = Query(20, ge=1, le=500)
 
 # ---- FastAPI app ----
 app = FastAPI(title="Resume Parsing & Evaluation")
@@ -46,6 +76,25 @@ app.add_middleware(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Event loop the app (and the shared OpenAI client) runs on; background threads submit LLM work to it
+app_loop = None
+
+
+@app.on_event("startup")
+async def startup_llm_client():
+    global app_loop
+    app_loop = asyncio.get_running_loop()
+    await init_openai_client()
+    await get_job_queue().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_llm_client():
+    await get_job_queue().stop()
+    await close_openai_client()
+    shutdown_document_extractor()
+    close_evaluation_store()
+
 
 # ---- Models ----
 class ResumeEvaluationRequest(BaseModel):
@@ -59,31 +108,146 @@ class JDTextRequest(BaseModel):
 
 
 # ---- Helpers ----
-def load_pdf_text(file_path: str) -> str:
-    loader = PyMuPDFLoader(file_path)
-    pages = loader.load()
-    return " ".join(page.page_content for page in pages)
+@app.post("/store_candidate_evaluation", status_code=status.HTTP_200_OK)
+async def store_candidate_evaluation(cand_decision: Cand_Decision):
+    """Persist a candidate's evaluation and decision (one row per JD and candidate; written in batches)"""
+    if not cand_decision.name.strip() or not cand_decision.decision.strip():
+        return PlainTextResponse(content="Missing name or decision", status_code=422)
+    try:
+        stored = await asyncio.to_thread(get_evaluation_store().add, cand_decision)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to store evaluation: {e}")
+    # Parsed contact details link this resume to the candidate's other files (see /upload_resume_file)
+    if cand_decision.resume_id:
+        contact = cand_decision.contact
+        if contact is None and isinstance(cand_decision.evaluation_results, dict):
+            contact = (cand_decision.evaluation_results.get("Parsed_Resume") or {}).get("Contact_Details")
+        try:
+            await asyncio.to_thread(get_near_duplicate_index().add_contact, cand_decision.resume_id, contact)
+        except Exception as e:
+            logger.warning(f"Failed to index contact details of resume {cand_decision.resume_id}: {e}")
+    return {"message": "Evaluation saved successfully", **stored}
+
+
+@app.get("/evaluations", status_code=status.HTTP_200_OK)
+async def list_evaluations(
+    jd_name: Optional[str] = None,
+    decision: Optional[str] = None,
+    qualification_status: Optional[str] = None,
+    min_score: Optional[float] = None,
+    candidate: Optional[str] = None,
+    since: Optional[float] = None,
+    sort: str = "score",
+    limit: int = PAGE_LIMIT_QUERY,
+    offset: int = PAGE_OFFSET_QUERY,
+    include_evaluation: bool = False,
+):
+    """
+    Stored evaluations, filtered and paginated
+    - jd_name: candidates evaluated for one JD; candidate: an email or name, across JDs
+    - qualification_status matches a prefix ("Not Qualified" includes every reason); since is a Unix timestamp
+    - sort: score (default), updated_at or name; include_evaluation adds the full evaluation JSON
+    """
+    try:
+        total, evaluations = await asyncio.to_thread(get_evaluation_store().list, jd_name, decision, qualification_status, min_score, candidate, since, sort, limit, offset, include_evaluation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"total": total, "limit": limit, "offset": offset, "evaluations": evaluations}
+
+
+@app.get("/jds/{jd_name}/candidates", status_code=status.HTTP_200_OK)
+async def list_jd_candidates(
+    jd_name: str,
+    decision: Optional[str] = None,
+    qualification_status: Optional[str] = None,
+    min_score: Optional[float] = None,
+    sort: str = "score",
+    limit: int = PAGE_LIMIT_QUERY,
+    offset: int = PAGE_OFFSET_QUERY,
+):
+    """Candidates stored for one JD, best score first; same filters as /evaluations"""
+    return await list_evaluations(jd_name=jd_name, decision=decision, qualification_status=qualification_status, min_score=min_score, sort=sort, limit=limit, offset=offset)
+
+
+@app.get("/search_candidates", status_code=status.HTTP_200_OK)
+async def search_candidates(
+    q: Optional[str] = None,
+    skills: Optional[List[str]] = SKILLS_QUERY,
+    min_experience: Optional[float] = None,
+    jd_name: Optional[str] = None,
+    limit: int = PAGE_LIMIT_QUERY,
+    offset: int = PAGE_OFFSET_QUERY,
+):
+    """
+    Search every stored candidate's parsed resume, e.g. ?skills=kafka&min_experience=5
+    - q: full-text words (name, skills, experience, projects...), ranked by relevance
+    - skills: repeat the parameter or separate with commas; all must be present
+    - min_experience: years; jd_name: only candidates evaluated for that JD
+    Each candidate lists their stored evaluations (JD, score, status, decision)
+    """
+    skill_list = [skill.strip() for value in skills or [] for skill in value.split(",") if skill.strip()]
+    try:
+        total, candidates = await asyncio.to_thread(get_evaluation_store().search_candidates, q, skill_list, min_experience, jd_name, limit, offset)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search candidates: {e}")
+    return {"total": total, "limit": limit, "offset": offset, "candidates": candidates}
 
 
-@app.post("/store_candidate_evaluation", status_code=status.HTTP_200_OK)
-async def store_candidate_evaluation(eval_json: Dict[str, Any]):
-    # Stub for DB saving logic
-    return {"message": "Evaluation saved successfully"}
+@app.get("/evaluations/{evaluation_id}", status_code=status.HTTP_200_OK)
+async def get_evaluation(evaluation_id: int):
+    """One stored evaluation with its full evaluation JSON"""
+    evaluation = await asyncio.to_thread(get_evaluation_store().get, evaluation_id)
+    if evaluation is None:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+    return evaluation
 
 
-@app.get("/list_jds", status_code=status.HTTP_200_OK)
-async def list_jds():
+@app.get("/llm_cache_stats", status_code=status.HTTP_200_OK)
+async def llm_cache_stats():
+    """Hit/miss counters and size of the persistent LLM response cache"""
+    response_cache = get_response_cache()
+    if response_cache is None:
+        return {"enabled": False}
+    return await asyncio.to_thread(response_cache.stats)
 
-    try:
-        os.makedirs(JD_UPLOAD_FOLDER, exist_ok=True)  # Ensure folder exists
 
-        jd_files = [f[:-5] for f in os.listdir(JD_UPLOAD_FOLDER) if f.endswith(".json")]  # Remove `.json` extension
+@app.get("/text_cache_stats", status_code=status.HTTP_200_OK)
+async def text_cache_stats():
+    """Hit/miss counters of the extracted-text cache (memory LRU + disk)"""
+    text_cache = get_text_cache()
+    if text_cache is None:
+        return {"enabled": False}
+    return await asyncio.to_thread(text_cache.stats)
 
-        return {"jds": jd_files}
+
+@app.get("/list_jds", status_code=status.HTTP_200_OK)
+async def list_jds(request: Request, response: Response):
+    """Names of the stored JDs, from the in-memory JD registry; honours If-None-Match"""
+    try:
+        jd_registry = get_jd_registry()
+        etag = jd_registry.list_etag()
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        return {"jds": jd_registry.names()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list JDs: {str(e)}")
 
 
+@app.get("/jds/{jd_name}", status_code=status.HTTP_200_OK)
+async def get_jd(jd_name: str, request: Request, response: Response):
+    """Structured JD JSON by name (as returned by /list_jds); honours If-None-Match"""
+    registered_jd = get_jd_registry().get(jd_name)
+    if registered_jd is None:
+        raise HTTPException(status_code=404, detail=f"JD not found: {jd_name}")
+    if request.headers.get("if-none-match") == registered_jd.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": registered_jd.etag})
+
+    response.headers["ETag"] = registered_jd.etag
+    return registered_jd.data
+
+
 @app.post("/save_jd_raw_text/")
 async def save_jd_raw_text(request: JDTextRequest):
     """Save JD text without validation - always process and save"""
@@ -95,7 +259,7 @@ async def save_jd_raw_text(request: JDTextRequest):
 
     try:
         # Extract JD info without validation
-        jd_structured = extract_jd_info(jd_text)
+        jd_structured = await extract_jd_info(jd_text)
 
         # Always save the JD (no validation check)
         os.makedirs("jd_json", exist_ok=True)
@@ -107,6 +271,7 @@ async def save_jd_raw_text(request: JDTextRequest):
 
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(jd_structured, f, indent=2, ensure_ascii=False)
+        get_jd_registry().refresh(force=True)
 
         return {"status": "success", "message": f"JD saved as {safe_filename}.json", "file": f"{safe_filename}.json", "is_valid_jd": True, "parsed_data": jd_structured}  # Always return True since we're not validating
 
@@ -116,14 +281,15 @@ async def save_jd_raw_text(request: JDTextRequest):
 
 
 @app.post("/process_jd_folder", status_code=status.HTTP_200_OK)
-async def process_jd_folder():
-    """Process all DOC/DOCX files in jd_folder and convert to JSON"""
+async def process_jd_folder(force: bool = False):
+    """Convert new or changed scraped JD records and DOC/DOCX/PDF files in jd_folder to JSON (force=true re-converts all)"""
     try:
         from ats_ai.agent.jd_parser import process_jd_folder_to_json
 
-        processed_count = process_jd_folder_to_json()
+        summary = await process_jd_folder_to_json(force=force)
+        get_jd_registry().refresh(force=True)
 
-        return {"status": "success", "message": f"Processed {processed_count} JD files successfully", "processed_count": processed_count}
+        return {"status": "success", "message": f"Processed {summary['processed_count']} JD files successfully, {summary['skipped_count']} unchanged", **summary}
 
     except Exception as e:
         logger.error(f"Error in process_jd_folder: {str(e)}")
@@ -147,7 +313,7 @@ async def parse_jd_temp(request: JDTempRequest):
             raise HTTPException(status_code=400, detail="JD text is required")
 
         # Parse JD text without any validation or saving
-        jd_structured = extract_jd_info(jd_text)
+        jd_structured = await extract_jd_info(jd_text)
 
         # Return parsed data directly - no saving, no validation
         return {"status": "success", "message": "JD parsed temporarily (not saved)", "parsed_data": jd_structured}
@@ -182,17 +348,22 @@ def run_scraper_and_convert_job():
         scraper = CalfusJobScraper()
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(scraper.run())
+        scrape_report = loop.run_until_complete(scraper.run())
         loop.close()
 
-        logger.info("Scraper completed - now converting JDs to JSON...")
+        logger.info(f"Scraper completed ({len(scrape_report['new'])} new, {len(scrape_report['changed'])} changed, {len(scrape_report['closed'])} closed postings) - now converting JDs to JSON...")
 
-        # Step 2: Automatically convert DOCX files to JSON
+        # Step 2: Automatically convert the scraped JD records to JSON
         from ats_ai.agent.jd_parser import process_jd_folder_to_json
 
-        processed_count = process_jd_folder_to_json()
+        if app_loop is not None and app_loop.is_running():
+            # Reuse the app's pooled OpenAI client instead of opening a second one on this thread's loop
+            summary = asyncio.run_coroutine_threadsafe(process_jd_folder_to_json(scrape_report=scrape_report), app_loop).result()
+        else:
+            summary = asyncio.run(process_jd_folder_to_json(scrape_report=scrape_report))
+        get_jd_registry().refresh(force=True)
 
-        logger.info(f"Complete job finished: Scraped JDs and converted {processed_count} files to JSON")
+        logger.info(f"Complete job finished: Scraped JDs and converted {summary['processed_count']} files to JSON ({summary['skipped_count']} unchanged, {len(summary['archived'])} closed JDs archived)")
 
     except Exception as e:
         logger.error(f"Scraper and conversion job failed: {e}")
@@ -274,27 +445,6 @@ async def download_report(filename: str):
 
 
 # Add this helper function in app_server.py
-def extract_text_from_document(file_path: str) -> str:
-    file_extension = Path(file_path).suffix.lower()
-
-    if file_extension == ".pdf":
-        loader = PyMuPDFLoader(file_path)
-        pages = loader.load()
-        return " ".join(page.page_content for page in pages)
-
-    elif file_extension in [".doc", ".docx"]:
-        try:
-            with open(file_path, "rb") as doc_file:
-                result = mammoth.extract_raw_text(doc_file)
-                return result.value
-        except Exception as e:
-            logger.error(f"Error reading {file_extension} file {file_path}: {e}")
-            raise HTTPException(status_code=500, detail=f"Error reading {file_extension} file: {str(e)}")
-
-    else:
-        raise HTTPException(status_code=400, detail=f"Unsupported file format: {file_extension}")
-
-
 # 2. Modify the upload_resume_file endpoint in app_server.py
 @app.post("/upload_resume_file", status_code=status.HTTP_200_OK)
 async def upload_resume_file(resume_file: UploadFile = RESUME_FILE_UPLOAD):
@@ -302,31 +452,101 @@ async def upload_resume_file(resume_file: UploadFile = RESUME_FILE_UPLOAD):
         raise HTTPException(status_code=400, detail="No file found")
 
     # Updated to accept PDF, DOC, and DOCX files
-    allowed_extensions = [".pdf", ".doc", ".docx"]
     file_extension = Path(resume_file.filename).suffix.lower()
 
-    if file_extension not in allowed_extensions:
+    if file_extension not in SUPPORTED_DOCUMENT_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Only PDF, DOC, and DOCX formats are supported")
 
-    os.makedirs(RESUME_UPLOAD_FOLDER, exist_ok=True)
-    file_path = os.path.join(RESUME_UPLOAD_FOLDER, resume_file.filename)
+    # Streamed to a content-addressed path; identical files are stored once and share one resume_id
+    resume_store = get_resume_store()
+    try:
+        stored_resume, deduplicated = await resume_store.save_upload(resume_file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # Extract once on upload so unreadable files are rejected here and the client can reuse the text
+    try:
+        resume_text = await extract_document_text(stored_resume.file_path, stored_resume.resume_id)
+    except (ValueError, TimeoutError) as e:
+        if not deduplicated:
+            resume_store.delete(stored_resume.resume_id)
+        if isinstance(e, TimeoutError):
+            raise HTTPException(status_code=504, detail=str(e))
+        raise HTTPException(status_code=400, detail=f"Failed to extract text from file: {e}")
+
+    # Same candidate in a different file (another agency's PDF): flag it before anyone pays for an evaluation
+    try:
+        found = await asyncio.to_thread(get_near_duplicate_index().check_and_add, stored_resume.resume_id, resume_text)
+        near_duplicates = await asyncio.to_thread(near_duplicate_report, found)
+    except Exception as e:
+        logger.warning(f"Near-duplicate check failed for resume {stored_resume.resume_id}: {e}")
+        near_duplicates = []
+
+    return {
+        "message": "Resume uploaded successfully",
+        "resume_id": stored_resume.resume_id,
+        "file_path": stored_resume.file_path,
+        "deduplicated": deduplicated,
+        "resume_text": resume_text,
+        "near_duplicates": near_duplicates,
+    }
+
+
+def near_duplicate_report(near_duplicates: List[NearDuplicate]) -> List[Dict[str, Any]]:
+    """Near-duplicates with the stored evaluations of each, so the client can reuse one instead of re-evaluating (queries SQLite, call it off the event loop)"""
+    evaluations = {}
+    for stored in get_evaluation_store().evaluations_for_resumes([near_duplicate.resume_id for near_duplicate in near_duplicates]):
+        evaluations.setdefault(stored.resume_id, []).append(CandidateEvaluationSummary(**stored.model_dump()))
+    return [{**near_duplicate.model_dump(), "evaluations": evaluations.get(near_duplicate.resume_id, [])} for near_duplicate in near_duplicates]
+
+
+async def load_stored_resume_text(resume_id: str) -> str:
+    """Text of a stored resume by ID (served from the extracted-text cache after the first upload)"""
+    stored_resume = get_resume_store().get(resume_id)
+    if stored_resume is None:
+        raise HTTPException(status_code=404, detail=f"Resume not found: {resume_id}")
+    try:
+        return await extract_document_text(stored_resume.file_path, stored_resume.resume_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Failed to extract text from file: {e}")
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
 
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(resume_file.file, f)
 
-    return {"message": "Resume uploaded successfully", "file_path": file_path}
+@app.get("/resumes/{resume_id}", status_code=status.HTTP_200_OK)
+async def get_resume_metadata(resume_id: str):
+    stored_resume = get_resume_store().get(resume_id)
+    if stored_resume is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return stored_resume
+
+
+@app.get("/resumes/{resume_id}/near_duplicates", status_code=status.HTTP_200_OK)
+async def get_near_duplicates(resume_id: str):
+    if get_resume_store().get(resume_id) is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    found = await asyncio.to_thread(get_near_duplicate_index().find, resume_id)
+    return {"near_duplicates": await asyncio.to_thread(near_duplicate_report, found)}
 
 
 # 3. Modify the resume_parser endpoint in app_server.py
 @app.get("/resume_parser")
-async def resume_parser(resume_path: str):
-    file_path = os.path.join(RESUME_UPLOAD_FOLDER, resume_path)
-
-    # Use the new universal text extraction function
-    try:
-        raw_resume_text = extract_text_from_document(file_path)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to extract text from file: {e}")
+async def resume_parser(resume_id: Optional[str] = None, resume_path: Optional[str] = None):
+    """Parse a stored resume by resume_id (or, for files uploaded before resume IDs, by path under data/)"""
+    if resume_id:
+        raw_resume_text = await load_stored_resume_text(resume_id)
+    elif resume_path:
+        file_path = os.path.join(RESUME_UPLOAD_FOLDER, resume_path)
+
+        # Extraction runs in the shared process pool, off the event loop
+        try:
+            raw_resume_text = await extract_document_text(file_path)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Failed to extract text from file: {e}")
+        except TimeoutError as e:
+            raise HTTPException(status_code=504, detail=str(e))
+    else:
+        raise HTTPException(status_code=422, detail="Provide resume_id or resume_path")
 
     try:
         response = await extract_resume_info(raw_resume_text)
@@ -344,26 +564,115 @@ class WeightageConfig(BaseModel):
 
 
 class ParseAndEvaluateRequest(BaseModel):
-    resume_data: str
+    resume_data: str = ""
+    resume_id: Optional[str] = None  # From /upload_resume_file, used when resume_data is empty
     jd_json: Dict[str, Any]
     weightage_config: WeightageConfig = WeightageConfig()
+    prescreen: bool = False  # Skip the LLM for obvious mismatches (provisional "Not Qualified")
+    prescreen_config: PrescreenConfig = PrescreenConfig()
+    jd_name: Optional[str] = None  # Name of jd_json as in /list_jds, needed for reuse_duplicates
+    reuse_duplicates: bool = False  # Return the stored evaluation of this resume or a near-duplicate for the same JD instead of calling the LLM
+
+
+class RescoreRequest(BaseModel):
+    evaluation: Dict[str, Any]  # A previous /parse_and_evaluate response
+    weightage_config: WeightageConfig = WeightageConfig()
+
+
+class RescoreBatchRequest(BaseModel):
+    evaluations: List[Dict[str, Any]]  # Previous /parse_and_evaluate responses for one JD
+    weightage_config: WeightageConfig = WeightageConfig()
+
+
+class EvaluationJobRequest(BaseModel):
+    resumes: List[JobResume]
+    jd_json: Dict[str, Any]
+    weightage_config: WeightageConfig = WeightageConfig()
+    prescreen: bool = False
+    prescreen_config: PrescreenConfig = PrescreenConfig()
+
+
+class MatchOpeningsRequest(BaseModel):
+    resume_data: str = ""
+    resume_id: Optional[str] = None
+    jd_names: Optional[List[str]] = None  # Names as returned by /list_jds; all stored JDs when omitted
+    weightage_config: WeightageConfig = WeightageConfig()
+    top_k: Optional[int] = None  # Only evaluate the top_k of those JDs by local retrieval score (see /rank_jds)
+
+
+class RankJDsRequest(BaseModel):
+    resume_data: str = ""
+    resume_id: Optional[str] = None
+    jd_names: Optional[List[str]] = None
+    top_k: int = 10
+
+
+def validate_weightage(weightage_config: WeightageConfig):
+    """Return an error message if the weights don't sum to 1.0, else None"""
+    total_weight = weightage_config.experience_weight + weightage_config.skills_weight + weightage_config.education_weight + weightage_config.projects_weight
+
+    if abs(total_weight - 1.0) > 0.01:  # Allow small floating point differences
+        return f"Weightage must sum to 100% (1.0). Current sum: {total_weight:.2f}"
+    return None
+
+
+def jd_content_hash(jd_json: Dict[str, Any]) -> str:
+    """Hash of the JD an evaluation was made against, returned as "JD_Hash" so a stored evaluation can be matched to the same JD content"""
+    return hashlib.sha256(canonical_json(jd_json).encode("utf-8")).hexdigest()
+
+
+def reusable_evaluation(request: ParseAndEvaluateRequest) -> Optional[Dict[str, Any]]:
+    """
+    The newest stored evaluation of this resume (or else of a confirmed near-duplicate of it) against the same JD content,
+    rescored for the request's weightage, with a "Reused_Evaluation" block saying where it came from; None if there is none
+    A possible duplicate (only an email or phone found in both texts, e.g. an agency footer) is never reused
+    Runs MinHash and SQLite lookups, call it off the event loop
+    """
+    if not request.reuse_duplicates or not request.resume_id or not request.jd_name:
+        return None
+    near_duplicates = {near_duplicate.resume_id: near_duplicate for near_duplicate in get_near_duplicate_index().find(request.resume_id) if near_duplicate.confirmed}
+    stored_evaluations = get_evaluation_store().evaluations_for_resumes([request.resume_id, *near_duplicates], request.jd_name, include_evaluation=True)
+    jd_hash = jd_content_hash(request.jd_json)
+    for stored in sorted(stored_evaluations, key=lambda stored: stored.resume_id != request.resume_id):
+        if "Evaluation" not in (stored.evaluation_results or {}):
+            continue  # Only the scored section was stored, not a full /parse_and_evaluate response
+        if stored.evaluation_results.get("JD_Hash") != jd_hash:
+            continue  # Evaluated against an earlier version of the JD (or stored before JD_Hash existed)
+        near_duplicate = near_duplicates.get(stored.resume_id)
+        resp = rescore_evaluation(stored.evaluation_results, request.weightage_config)
+        resp["Reused_Evaluation"] = {
+            "evaluation_id": stored.evaluation_id,
+            "resume_id": stored.resume_id,
+            "similarity": near_duplicate.similarity if near_duplicate else 1.0,
+            "reasons": near_duplicate.reasons if near_duplicate else ["same_resume"],
+            "evaluated_at": stored.updated_at,
+        }
+        return resp
+    return None
 
 
 # ---- Replace the existing parse_and_evaluate endpoint ----
 @app.post("/parse_and_evaluate", status_code=status.HTTP_200_OK)
 async def parse_and_evaluate(request: ParseAndEvaluateRequest):
+    if request.resume_id and not request.resume_data:
+        request.resume_data = await load_stored_resume_text(request.resume_id)
     if not request.resume_data or not request.jd_json:
         return PlainTextResponse(content="Missing resume_data or jd_json", status_code=422)
 
     # Validate weights sum to 1.0
-    total_weight = request.weightage_config.experience_weight + request.weightage_config.skills_weight + request.weightage_config.education_weight + request.weightage_config.projects_weight
-
-    if abs(total_weight - 1.0) > 0.01:  # Allow small floating point differences
-        return PlainTextResponse(content=f"Weightage must sum to 100% (1.0). Current sum: {total_weight:.2f}", status_code=400)
+    weightage_error = validate_weightage(request.weightage_config)
+    if weightage_error:
+        return PlainTextResponse(content=weightage_error, status_code=400)
     #
     try:
-        resp = await combined_parse_evaluate(request.resume_data, request.jd_json, request.weightage_config)
-        return resp
+        reused = await asyncio.to_thread(reusable_evaluation, request)
+        if reused is not None:
+            return reused
+        if request.prescreen:
+            resp = await prescreen_and_evaluate(request.resume_data, request.jd_json, request.weightage_config, request.prescreen_config)
+        else:
+            resp = await combined_parse_evaluate(request.resume_data, request.jd_json, request.weightage_config)
+        return {**resp, "JD_Hash": jd_content_hash(request.jd_json)}
     except Exception as e:
         error_str = str(e)
         if "The model is overloaded" in error_str:
@@ -371,3 +680,174 @@ async def parse_and_evaluate(request: ParseAndEvaluateRequest):
         else:
             msg = error_str
         return PlainTextResponse(content=msg, status_code=500)
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/parse_and_evaluate_stream", status_code=status.HTTP_200_OK)
+async def parse_and_evaluate_stream(request: ParseAndEvaluateRequest):
+    """
+    Server-sent-events variant of /parse_and_evaluate
+    Events: "progress" {stage, message}, "field" {section, key, value} as each field is generated,
+    "result" (same body as /parse_and_evaluate) or "error" {message}
+    With prescreen, an obvious mismatch gets its provisional "result" without opening a model stream
+    """
+    if request.resume_id and not request.resume_data:
+        request.resume_data = await load_stored_resume_text(request.resume_id)
+    if not request.resume_data or not request.jd_json:
+        return PlainTextResponse(content="Missing resume_data or jd_json", status_code=422)
+
+    weightage_error = validate_weightage(request.weightage_config)
+    if weightage_error:
+        return PlainTextResponse(content=weightage_error, status_code=400)
+
+    prescreen_result = prescreen_resume(request.resume_data, request.jd_json, request.prescreen_config) if request.prescreen else None
+    jd_hash = jd_content_hash(request.jd_json)
+
+    async def event_stream():
+        try:
+            reused = await asyncio.to_thread(reusable_evaluation, request)
+            if reused is not None:
+                yield sse_event("progress", {"stage": "reused", "message": "Reusing the stored evaluation of a near-duplicate resume"})
+                yield sse_event("result", reused)
+                return
+            if prescreen_result is not None and not prescreen_result.escalate:
+                yield sse_event("progress", {"stage": "prescreen", "message": "Pre-screen found an obvious mismatch, skipping the model"})
+                yield sse_event("result", {**provisional_evaluation(prescreen_result), "JD_Hash": jd_hash})
+                return
+            async for event, data in stream_combined_parse_evaluate(request.resume_data, request.jd_json, request.weightage_config):
+                if event == "result":
+                    data = {**data, "JD_Hash": jd_hash}
+                    if prescreen_result is not None:
+                        data["Prescreen"] = prescreen_result.model_dump()
+                yield sse_event(event, data)
+        except Exception as e:
+            error_str = str(e)
+            msg = "The model is overloaded. Please try after sometime." if "The model is overloaded" in error_str else error_str
+            yield sse_event("error", {"message": msg})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/rescore", status_code=status.HTTP_200_OK)
+async def rescore(request: RescoreRequest):
+    """Recompute Overall_Weighted_Score and Qualification Status for new weightage without calling the LLM"""
+    if "Evaluation" not in request.evaluation:
+        return PlainTextResponse(content="evaluation must be a /parse_and_evaluate response with an 'Evaluation' section", status_code=422)
+
+    weightage_error = validate_weightage(request.weightage_config)
+    if weightage_error:
+        return PlainTextResponse(content=weightage_error, status_code=400)
+
+    try:
+        return rescore_evaluation(request.evaluation, request.weightage_config)
+    except Exception as e:
+        return PlainTextResponse(content=f"Failed to rescore evaluation: {e}", status_code=500)
+
+
+@app.post("/rescore_batch", status_code=status.HTTP_200_OK)
+async def rescore_batch(request: RescoreBatchRequest):
+    """Re-rank a pool of stored evaluations for new weightage in one vectorized pass (no LLM calls)"""
+    weightage_error = validate_weightage(request.weightage_config)
+    if weightage_error:
+        return PlainTextResponse(content=weightage_error, status_code=400)
+
+    try:
+        results = rescore_evaluations_batch(request.evaluations, request.weightage_config)
+    except Exception as e:
+        return PlainTextResponse(content=f"Failed to rescore evaluations: {e}", status_code=500)
+
+    ranking = sorted(range(len(results)), key=lambda index: results[index]["Overall_Weighted_Score"], reverse=True)
+    return {"results": results, "ranking": ranking}
+
+
+@app.post("/match_openings", status_code=status.HTTP_200_OK)
+async def match_openings(request: MatchOpeningsRequest):
+    """Which of our openings fits this person: parse the resume once, then evaluate it against every stored JD"""
+    if request.resume_id and not request.resume_data:
+        request.resume_data = await load_stored_resume_text(request.resume_id)
+    if not request.resume_data:
+        return PlainTextResponse(content="Missing resume_data", status_code=422)
+
+    weightage_error = validate_weightage(request.weightage_config)
+    if weightage_error:
+        return PlainTextResponse(content=weightage_error, status_code=400)
+
+    if request.top_k is not None and request.top_k < 1:
+        return PlainTextResponse(content="top_k must be at least 1", status_code=422)
+
+    jd_registry = get_jd_registry()
+    jd_names = request.jd_names if request.jd_names is not None else jd_registry.names()
+    for jd_name in jd_names:
+        if jd_registry.get(jd_name) is None:
+            raise HTTPException(status_code=404, detail=f"JD not found: {jd_name}")
+
+    # Shortlist locally so only the most similar JDs go to the LLM
+    shortlist = None
+    if request.top_k is not None:
+        shortlist = get_jd_retrieval_index().rank_jds(request.resume_data, request.top_k, jd_names)
+        jd_names = [jd_match.jd_name for jd_match in shortlist]
+    job_descriptions = {jd_name: jd_registry.get(jd_name).data for jd_name in jd_names}
+
+    try:
+        result = await evaluate_resume_against_jds(request.resume_data, job_descriptions, request.weightage_config)
+    except Exception as e:
+        return PlainTextResponse(content=f"Failed to match openings: {e}", status_code=500)
+    if shortlist is not None:
+        result["shortlist"] = shortlist
+    return result
+
+
+@app.post("/rank_jds", status_code=status.HTTP_200_OK)
+async def rank_jds(request: RankJDsRequest):
+    """Stored JDs ranked by BM25 similarity to a resume, offline (no LLM call); pass the top ones to /match_openings"""
+    if request.resume_id and not request.resume_data:
+        request.resume_data = await load_stored_resume_text(request.resume_id)
+    if not request.resume_data:
+        return PlainTextResponse(content="Missing resume_data", status_code=422)
+    if request.top_k < 1:
+        return PlainTextResponse(content="top_k must be at least 1", status_code=422)
+
+    return {"matches": get_jd_retrieval_index().rank_jds(request.resume_data, request.top_k, request.jd_names)}
+
+
+@app.get("/jds/{jd_name}/similar_candidates", status_code=status.HTTP_200_OK)
+async def similar_candidates(jd_name: str, top_k: int = TOP_K_QUERY, min_experience: Optional[float] = None):
+    """Stored candidates ranked by similarity of their parsed resumes to a JD, offline; the top ones are worth an LLM evaluation"""
+    registered_jd = get_jd_registry().get(jd_name)
+    if registered_jd is None:
+        raise HTTPException(status_code=404, detail=f"JD not found: {jd_name}")
+    query_terms = jd_query_terms(registered_jd.data)
+    candidates = await asyncio.to_thread(get_evaluation_store().similar_candidates, query_terms, top_k, min_experience)
+    return {"query_terms": query_terms, "candidates": candidates}
+
+
+@app.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_evaluation_job(request: EvaluationJobRequest):
+    """Queue N resumes x one JD for background evaluation; poll GET /jobs/{job_id} for progress"""
+    if not request.resumes or not request.jd_json:
+        return PlainTextResponse(content="Missing resumes or jd_json", status_code=422)
+
+    weightage_error = validate_weightage(request.weightage_config)
+    if weightage_error:
+        return PlainTextResponse(content=weightage_error, status_code=400)
+
+    prescreen_config = request.prescreen_config.model_dump() if request.prescreen else None
+    job = get_job_queue().submit(request.resumes, request.jd_json, request.weightage_config.model_dump(), prescreen_config)
+    return {"job_id": job.job_id, "status": job.status, "total": job.total}
+
+
+@app.get("/jobs/{job_id}", status_code=status.HTTP_200_OK)
+async def get_evaluation_job(job_id: str, include_results: bool = True):
+    """Status, progress counters and (optionally) the results completed so far"""
+    job_queue = get_job_queue()
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    response = {**job.model_dump(), "pending": job.pending}
+    if include_results:
+        response["results"] = await asyncio.to_thread(job_queue.load_results, job_id)
+    return response
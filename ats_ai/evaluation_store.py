@@ -0,0 +1,537 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from ats_ai.agent.prescreen import (
+    PLACEHOLDER_SKILLS,
+    estimate_experience_years,
+    skill_terms,
+)
+from ats_ai.models.server_models_schema import Cand_Decision
+
+"""
+    Persistent store of candidate evaluations and hiring decisions.
+    Every /store_candidate_evaluation call keeps the full evaluation JSON and the Cand_Decision in a local SQLite
+    database (WAL), one row per (JD, candidate): evaluating or deciding on the same candidate for the same JD
+    again updates that row. JD, candidate, score, qualification status, decision and timestamps are columns with
+    indexes, so listing and filtering a JD's candidates never parses the stored JSON.
+
+    Writes are batched: rows are queued in memory and committed together in one transaction once
+    EVALUATION_STORE_BATCH_SIZE rows are waiting or EVALUATION_STORE_FLUSH_SECONDS after the first one.
+    Reads flush the queue first, and close() flushes on shutdown.
+
+    The same transaction keeps a search index over the candidates' Parsed_Resume (their latest one across JDs):
+    a candidates table with experience years, an inverted skill index (normalized words of Programming_Language,
+    Frameworks and Technologies -> candidate) and an FTS5 table over name, skills and resume text, so
+    search_candidates() answers "Kafka and 5+ years" from indexes without re-running any evaluation.
+"""
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_STORE_PATH = os.getenv("EVALUATION_STORE_PATH", "data/evaluations.sqlite3")
+EVALUATION_STORE_BATCH_SIZE = int(os.getenv("EVALUATION_STORE_BATCH_SIZE", "50"))
+EVALUATION_STORE_FLUSH_SECONDS = float(os.getenv("EVALUATION_STORE_FLUSH_SECONDS", "1"))
+
+# Parsed_Resume lists that feed the skill index; every other section except links and contact details is full-text indexed
+RESUME_SKILL_FIELDS = ["Programming_Language", "Frameworks", "Technologies"]
+UNSEARCHED_RESUME_FIELDS = {"Contact_Details", "Github_Repo", "LinkedIn"}
+
+EVALUATION_SORT_COLUMNS = {"score": "score DESC, updated_at DESC", "updated_at": "updated_at DESC", "name": "candidate_name COLLATE NOCASE"}
+
+UPSERT_EVALUATION_SQL = """
+    INSERT INTO evaluations (jd_name, candidate_key, candidate_name, email, resume_id, decision, score, qualification_status, contact, evaluation, created_at, updated_at)
+    VALUES (:jd_name, :candidate_key, :candidate_name, :email, :resume_id, :decision, :score, :qualification_status, :contact, :evaluation, :updated_at, :updated_at)
+    ON CONFLICT (jd_name, candidate_key) DO UPDATE SET
+        candidate_name = excluded.candidate_name,
+        email = COALESCE(excluded.email, evaluations.email),
+        resume_id = COALESCE(excluded.resume_id, evaluations.resume_id),
+        decision = excluded.decision,
+        score = COALESCE(excluded.score, evaluations.score),
+        qualification_status = COALESCE(excluded.qualification_status, evaluations.qualification_status),
+        contact = COALESCE(excluded.contact, evaluations.contact),
+        evaluation = COALESCE(excluded.evaluation, evaluations.evaluation),
+        updated_at = excluded.updated_at
+"""
+
+
+class StoredEvaluation(BaseModel):
+    evaluation_id: int
+    jd_name: str
+    candidate_key: str
+    candidate_name: str
+    email: Optional[str] = None
+    resume_id: Optional[str] = None
+    decision: str
+    score: Optional[float] = None
+    qualification_status: Optional[str] = None
+    contact: Optional[Dict[str, Any]] = None
+    evaluation_results: Optional[Dict[str, Any]] = None  # Only when requested (include_evaluation=True)
+    created_at: float
+    updated_at: float
+
+
+class CandidateEvaluationSummary(BaseModel):
+    evaluation_id: int
+    jd_name: str
+    score: Optional[float] = None
+    qualification_status: Optional[str] = None
+    decision: str
+
+
+class CandidateMatch(BaseModel):
+    candidate_key: str
+    candidate_name: str
+    email: Optional[str] = None
+    resume_id: Optional[str] = None
+    experience_years: Optional[float] = None
+    skills: List[str]
+    updated_at: float
+    score: Optional[float] = None  # Full-text relevance (bm25, higher is better) when results are ranked by text
+    evaluations: List[CandidateEvaluationSummary]  # Every stored evaluation of this candidate, best score first
+
+
+def contact_email(contact: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Normalized email from Contact_Details ({"Email": ...}), or None"""
+    for key, value in (contact or {}).items():
+        if "email" in str(key).lower() and isinstance(value, str) and "@" in value:
+            return value.strip().lower()
+    return None
+
+
+def candidate_key(name: str, contact: Optional[Dict[str, Any]] = None) -> str:
+    """Identifies a candidate across evaluations: their email if known, else their normalized name"""
+    email = contact_email(contact)
+    if email:
+        return f"email:{email}"
+    return "name:" + re.sub(r"\s+", " ", name).strip().lower()
+
+
+def evaluation_section(evaluation_results: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The scored "Evaluation" part of a /parse_and_evaluate response, or the dict itself if that is what was sent"""
+    if not isinstance(evaluation_results, dict):
+        return {}
+    section = evaluation_results.get("Evaluation")
+    return section if isinstance(section, dict) else evaluation_results
+
+
+def evaluation_row(cand_decision: Cand_Decision, now: Optional[float] = None) -> Dict[str, Any]:
+    evaluation = evaluation_section(cand_decision.evaluation_results)
+    score = evaluation.get("Overall_Weighted_Score")
+    qualification_status = evaluation.get("Qualification Status")
+    contact = cand_decision.contact
+    if contact is None and isinstance(cand_decision.evaluation_results, dict):
+        contact = (cand_decision.evaluation_results.get("Parsed_Resume") or {}).get("Contact_Details")
+    return {
+        "jd_name": cand_decision.jd_name,
+        "candidate_key": candidate_key(cand_decision.name, contact),
+        "candidate_name": cand_decision.name.strip(),
+        "email": contact_email(contact),
+        "resume_id": cand_decision.resume_id,
+        "decision": cand_decision.decision,
+        "score": float(score) if isinstance(score, (int, float)) else None,
+        "qualification_status": qualification_status if isinstance(qualification_status, str) else None,
+        "contact": json.dumps(contact) if contact is not None else None,
+        "evaluation": json.dumps(cand_decision.evaluation_results) if cand_decision.evaluation_results is not None else None,
+        "updated_at": now or time.time(),
+    }
+
+
+def resume_text_parts(value: Any) -> Iterator[str]:
+    """Every non-empty string in a Parsed_Resume section, depth first"""
+    if isinstance(value, str):
+        if value.strip() and value.strip().lower() not in PLACEHOLDER_SKILLS:
+            yield value.strip()
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from resume_text_parts(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from resume_text_parts(item)
+
+
+def resume_skills(parsed_resume: Dict[str, Any]) -> List[str]:
+    skills = []
+    for field in RESUME_SKILL_FIELDS:
+        for skill in resume_text_parts(parsed_resume.get(field)):
+            if skill not in skills:
+                skills.append(skill)
+    return skills
+
+
+def skill_index_words(skill: str) -> Set[str]:
+    """Words a skill is indexed and searched by: prescreen.skill_terms normalization without dots ("Node.js" -> "nodejs")"""
+    return {word.replace(".", "") for term in skill_terms(skill) for word in term if word.replace(".", "")}
+
+
+def candidate_profile(row: Dict[str, Any], evaluation_results: Any) -> Optional[Dict[str, Any]]:
+    """Search index entry for an evaluation row, or None if the evaluation has no Parsed_Resume"""
+    parsed_resume = evaluation_results.get("Parsed_Resume") if isinstance(evaluation_results, dict) else None
+    if not isinstance(parsed_resume, dict):
+        return None
+    experience_years = evaluation_section(evaluation_results).get("Total_Experience_Years")
+    if not isinstance(experience_years, (int, float)):
+        experience_years = estimate_experience_years("\n".join(resume_text_parts(parsed_resume.get("Professional_Experience"))))
+    skills = resume_skills(parsed_resume)
+    return {
+        "candidate_key": row["candidate_key"],
+        "candidate_name": row["candidate_name"],
+        "email": row["email"],
+        "resume_id": row["resume_id"],
+        "experience_years": float(experience_years) if experience_years is not None else None,
+        "skills": skills,
+        "skill_words": set().union(*(skill_index_words(skill) for skill in skills)),
+        "resume_text": "\n".join(part for field, value in parsed_resume.items() if field not in UNSEARCHED_RESUME_FIELDS and field not in RESUME_SKILL_FIELDS for part in resume_text_parts(value)),
+        "updated_at": row["updated_at"],
+    }
+
+
+def fts_query(text: str) -> str:
+    """Search box text -> FTS5 query: every word must match (a trailing * matches a prefix); FTS syntax is quoted away"""
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class EvaluationStore:
+    def __init__(self, db_path: str = EVALUATION_STORE_PATH, batch_size: int = EVALUATION_STORE_BATCH_SIZE, flush_seconds: float = EVALUATION_STORE_FLUSH_SECONDS):
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._pending: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = []  # (evaluation row, candidate profile)
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS evaluations (
+                    evaluation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    jd_name TEXT NOT NULL,
+                    candidate_key TEXT NOT NULL,
+                    candidate_name TEXT NOT NULL,
+                    email TEXT,
+                    resume_id TEXT,
+                    decision TEXT NOT NULL,
+                    score REAL,
+                    qualification_status TEXT,
+                    contact TEXT,
+                    evaluation TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    UNIQUE (jd_name, candidate_key)
+                )
+                """
+            )
+            # UNIQUE (jd_name, candidate_key) already indexes lookups of one candidate for one JD
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_evaluations_jd_score ON evaluations(jd_name, score DESC)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_evaluations_jd_status ON evaluations(jd_name, qualification_status)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_evaluations_jd_decision ON evaluations(jd_name, decision)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_evaluations_jd_updated ON evaluations(jd_name, updated_at DESC)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_evaluations_candidate ON evaluations(candidate_key)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_evaluations_resume ON evaluations(resume_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_evaluations_updated ON evaluations(updated_at DESC)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS candidates (
+                    candidate_id INTEGER PRIMARY KEY,
+                    candidate_key TEXT NOT NULL UNIQUE,
+                    candidate_name TEXT NOT NULL,
+                    email TEXT,
+                    resume_id TEXT,
+                    experience_years REAL,
+                    skills TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_candidates_experience ON candidates(experience_years)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS candidate_skills (skill TEXT NOT NULL, candidate_id INTEGER NOT NULL, PRIMARY KEY (skill, candidate_id)) WITHOUT ROWID")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_candidate_skills_candidate ON candidate_skills(candidate_id)")
+            # rowid = candidates.candidate_id; "+" and "#" are part of words so C++ and C# are searchable
+            self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS candidate_text USING fts5(name, skills, resume, tokenize=\"porter unicode61 tokenchars '+#'\")")
+            self._conn.commit()
+            if self._conn.execute("SELECT NOT EXISTS (SELECT 1 FROM candidates) AND EXISTS (SELECT 1 FROM evaluations WHERE evaluation IS NOT NULL)").fetchone()[0]:
+                self._rebuild_candidate_index(self._conn)
+        return self._conn
+
+    def _index_candidate(self, conn: sqlite3.Connection, profile: Dict[str, Any]):
+        conn.execute(
+            """
+            INSERT INTO candidates (candidate_key, candidate_name, email, resume_id, experience_years, skills, updated_at)
+            VALUES (:candidate_key, :candidate_name, :email, :resume_id, :experience_years, :skills_json, :updated_at)
+            ON CONFLICT (candidate_key) DO UPDATE SET
+                candidate_name = excluded.candidate_name,
+                email = COALESCE(excluded.email, candidates.email),
+                resume_id = COALESCE(excluded.resume_id, candidates.resume_id),
+                experience_years = excluded.experience_years,
+                skills = excluded.skills,
+                updated_at = excluded.updated_at
+            """,
+            {**profile, "skills_json": json.dumps(profile["skills"])},
+        )
+        candidate_id = conn.execute("SELECT candidate_id FROM candidates WHERE candidate_key = ?", (profile["candidate_key"],)).fetchone()[0]
+        conn.execute("DELETE FROM candidate_skills WHERE candidate_id = ?", (candidate_id,))
+        conn.executemany("INSERT INTO candidate_skills (skill, candidate_id) VALUES (?, ?)", [(word, candidate_id) for word in sorted(profile["skill_words"])])
+        conn.execute("DELETE FROM candidate_text WHERE rowid = ?", (candidate_id,))
+        conn.execute("INSERT INTO candidate_text (rowid, name, skills, resume) VALUES (?, ?, ?, ?)", (candidate_id, profile["candidate_name"], ", ".join(profile["skills"]), profile["resume_text"]))
+
+    def _rebuild_candidate_index(self, conn: sqlite3.Connection):
+        """Index the candidates of evaluations stored before the search index existed"""
+        cursor = conn.execute("SELECT * FROM evaluations WHERE evaluation IS NOT NULL ORDER BY updated_at")
+        cursor.row_factory = sqlite3.Row
+        indexed = 0
+        with conn:
+            for row in cursor:
+                profile = candidate_profile(dict(row), json.loads(row["evaluation"]))
+                if profile is not None:
+                    self._index_candidate(conn, profile)
+                    indexed += 1
+        logger.info(f"Indexed {indexed} stored evaluations for candidate search")
+
+    def add(self, cand_decision: Cand_Decision) -> Dict[str, str]:
+        """Queue a decision/evaluation for the next batched write; returns its jd_name and candidate_key"""
+        row = evaluation_row(cand_decision)
+        profile = candidate_profile(row, cand_decision.evaluation_results)
+        with self._lock:
+            self._pending.append((row, profile))
+            batch_full = len(self._pending) >= self.batch_size
+            if not batch_full and self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch_full:
+            self.flush()
+        return {"jd_name": row["jd_name"], "candidate_key": row["candidate_key"]}
+
+    def flush(self) -> int:
+        """Write all queued rows in one transaction; returns how many were written"""
+        with self._lock:
+            timer, self._timer = self._timer, None
+            if timer is not None:
+                timer.cancel()
+            rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            conn = self._connection()
+            try:
+                with conn:
+                    conn.executemany(UPSERT_EVALUATION_SQL, [row for row, _ in rows])
+                    for _, profile in rows:
+                        if profile is not None:
+                            self._index_candidate(conn, profile)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {len(rows)} evaluations: {e}")
+                self._pending = rows + self._pending
+                raise
+        return len(rows)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _row_to_evaluation(self, row: sqlite3.Row, include_evaluation: bool) -> StoredEvaluation:
+        data = dict(row)
+        evaluation = data.pop("evaluation", None)
+        contact = data.pop("contact", None)
+        return StoredEvaluation(
+            **data,
+            contact=json.loads(contact) if contact else None,
+            evaluation_results=json.loads(evaluation) if include_evaluation and evaluation else None,
+        )
+
+    def _query(self, sql: str, params: Tuple) -> List[sqlite3.Row]:
+        self.flush()
+        with self._lock:
+            cursor = self._connection().execute(sql, params)
+            cursor.row_factory = sqlite3.Row
+            return cursor.fetchall()
+
+    def get(self, evaluation_id: int) -> Optional[StoredEvaluation]:
+        rows = self._query("SELECT * FROM evaluations WHERE evaluation_id = ?", (evaluation_id,))
+        return self._row_to_evaluation(rows[0], include_evaluation=True) if rows else None
+
+    def find(self, jd_name: str, name: str, contact: Optional[Dict[str, Any]] = None) -> Optional[StoredEvaluation]:
+        """The stored evaluation of this candidate for this JD, if any"""
+        rows = self._query("SELECT * FROM evaluations WHERE jd_name = ? AND candidate_key = ?", (jd_name, candidate_key(name, contact)))
+        return self._row_to_evaluation(rows[0], include_evaluation=True) if rows else None
+
+    def evaluations_for_resumes(self, resume_ids: List[str], jd_name: Optional[str] = None, include_evaluation: bool = False) -> List[StoredEvaluation]:
+        """Stored evaluations of any of these resumes (optionally for one JD), newest first"""
+        if not resume_ids:
+            return []
+        placeholders = ", ".join("?" for _ in resume_ids)
+        params = list(resume_ids)
+        jd_condition = ""
+        if jd_name is not None:
+            jd_condition = " AND jd_name = ?"
+            params.append(jd_name)
+        rows = self._query(f"SELECT * FROM evaluations WHERE resume_id IN ({placeholders}){jd_condition} ORDER BY updated_at DESC", tuple(params))
+        return [self._row_to_evaluation(row, include_evaluation) for row in rows]
+
+    def list(
+        self,
+        jd_name: Optional[str] = None,
+        decision: Optional[str] = None,
+        qualification_status: Optional[str] = None,
+        min_score: Optional[float] = None,
+        candidate: Optional[str] = None,
+        since: Optional[float] = None,
+        sort: str = "score",
+        limit: int = 50,
+        offset: int = 0,
+        include_evaluation: bool = False,
+    ) -> Tuple[int, List[StoredEvaluation]]:
+        """
+        Filter stored evaluations; returns (total matching, one page of them)
+        - qualification_status matches a prefix, so "Not Qualified" includes every "Not Qualified - <reason>"
+        - candidate is an email or a name (matched like candidate_key)
+        - sort: "score" (highest first), "updated_at" (newest first) or "name"
+        """
+        if sort not in EVALUATION_SORT_COLUMNS:
+            raise ValueError(f"sort must be one of {', '.join(EVALUATION_SORT_COLUMNS)}")
+        conditions, params = [], []
+        if jd_name is not None:
+            conditions.append("jd_name = ?")
+            params.append(jd_name)
+        if decision is not None:
+            conditions.append("decision = ?")
+            params.append(decision)
+        if qualification_status is not None:
+            # Range instead of LIKE so the (jd_name, qualification_status) index is used
+            conditions.append("qualification_status >= ? AND qualification_status < ?")
+            params.extend([qualification_status, qualification_status + "\U0010ffff"])
+        if min_score is not None:
+            conditions.append("score >= ?")
+            params.append(min_score)
+        if candidate is not None:
+            conditions.append("candidate_key = ?")
+            params.append(candidate_key(candidate, {"email": candidate}))
+        if since is not None:
+            conditions.append("updated_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        total = self._query(f"SELECT COUNT(*) AS total FROM evaluations {where}", tuple(params))[0]["total"]
+        rows = self._query(f"SELECT * FROM evaluations {where} ORDER BY {EVALUATION_SORT_COLUMNS[sort]} LIMIT ? OFFSET ?", tuple(params + [limit, offset]))
+        return total, [self._row_to_evaluation(row, include_evaluation) for row in rows]
+
+    def search_candidates(
+        self,
+        text: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        min_experience: Optional[float] = None,
+        jd_name: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[int, List[CandidateMatch]]:
+        """
+        Candidates whose latest parsed resume matches every given condition; returns (total matching, one page)
+        - text: words searched in name, skills and resume text (FTS5, stemmed, "kaf*" for a prefix), ranked by bm25
+        - skills: every word of every skill must be in the candidate's Programming_Language/Frameworks/Technologies
+        - min_experience: years; jd_name: only candidates evaluated for that JD
+        Without text, the most experienced candidates come first.
+        """
+        joins, conditions, params = "", [], []
+        match_query = fts_query(text or "")
+        if match_query:
+            joins = "JOIN candidate_text ON candidate_text.rowid = c.candidate_id"
+            conditions.append("candidate_text MATCH ?")
+            params.append(match_query)
+        skill_words = sorted(set().union(*(skill_index_words(skill) for skill in skills or [])))
+        if skill_words:
+            conditions.append("c.candidate_id IN (" + " INTERSECT ".join("SELECT candidate_id FROM candidate_skills WHERE skill = ?" for _ in skill_words) + ")")
+            params.extend(skill_words)
+        if min_experience is not None:
+            conditions.append("c.experience_years >= ?")
+            params.append(min_experience)
+        if jd_name is not None:
+            # Correlated EXISTS probes UNIQUE (jd_name, candidate_key); "candidate_key IN (...)" next to the skill filter made SQLite join two lists
+            conditions.append("EXISTS (SELECT 1 FROM evaluations e WHERE e.jd_name = ? AND e.candidate_key = c.candidate_key)")
+            params.append(jd_name)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # Matches in skills weigh most, then the name, then the rest of the resume
+        relevance = "-bm25(candidate_text, 2.0, 3.0, 1.0)" if match_query else "NULL"
+        order = "relevance DESC" if match_query else "c.experience_years IS NULL, c.experience_years DESC, c.candidate_name COLLATE NOCASE"
+
+        total = self._query(f"SELECT COUNT(*) AS total FROM candidates c {joins} {where}", tuple(params))[0]["total"]
+        rows = self._query(f"SELECT c.*, {relevance} AS relevance FROM candidates c {joins} {where} ORDER BY {order} LIMIT ? OFFSET ?", tuple(params + [limit, offset]))
+        return total, self._candidate_matches(rows)
+
+    def similar_candidates(self, terms: List[str], top_k: int = 20, min_experience: Optional[float] = None) -> List[CandidateMatch]:
+        """
+        Stored candidates whose resumes share the most (and rarest) of these terms, e.g. a JD's, best first
+        Ranked by bm25 over the full-text index, with skills weighing three times the rest of the resume
+        """
+        match_query = " OR ".join(term_query for term_query in (fts_query(term.replace("*", "")) for term in terms) if term_query)
+        if not match_query:
+            return []
+        conditions, params = ["candidate_text MATCH ?"], [match_query]
+        if min_experience is not None:
+            conditions.append("c.experience_years >= ?")
+            params.append(min_experience)
+        rows = self._query(
+            f"SELECT c.*, -bm25(candidate_text, 0.0, 3.0, 1.0) AS relevance FROM candidate_text JOIN candidates c ON c.candidate_id = candidate_text.rowid WHERE {' AND '.join(conditions)} ORDER BY relevance DESC LIMIT ?",
+            tuple(params + [top_k]),
+        )
+        return self._candidate_matches(rows)
+
+    def _candidate_matches(self, rows: List[sqlite3.Row]) -> List[CandidateMatch]:
+        """CandidateMatch per candidates row (plus a relevance column), with each candidate's stored evaluations"""
+        if not rows:
+            return []
+        evaluations: Dict[str, List[CandidateEvaluationSummary]] = {row["candidate_key"]: [] for row in rows}
+        placeholders = ", ".join("?" for _ in evaluations)
+        for evaluation in self._query(f"SELECT evaluation_id, candidate_key, jd_name, score, qualification_status, decision FROM evaluations WHERE candidate_key IN ({placeholders}) ORDER BY score DESC", tuple(evaluations)):
+            evaluations[evaluation["candidate_key"]].append(CandidateEvaluationSummary(**{key: evaluation[key] for key in CandidateEvaluationSummary.model_fields}))
+        return [
+            CandidateMatch(
+                candidate_key=row["candidate_key"],
+                candidate_name=row["candidate_name"],
+                email=row["email"],
+                resume_id=row["resume_id"],
+                experience_years=row["experience_years"],
+                skills=json.loads(row["skills"]),
+                updated_at=row["updated_at"],
+                score=round(row["relevance"], 4) if row["relevance"] is not None else None,
+                evaluations=evaluations[row["candidate_key"]],
+            )
+            for row in rows
+        ]
+
+
+_evaluation_store: Optional[EvaluationStore] = None
+
+
+def get_evaluation_store() -> EvaluationStore:
+    global _evaluation_store
+    if _evaluation_store is None:
+        _evaluation_store = EvaluationStore()
+    return _evaluation_store
+
+
+def close_evaluation_store():
+    global _evaluation_store
+    if _evaluation_store is not None:
+        _evaluation_store.close()
+        _evaluation_store = None
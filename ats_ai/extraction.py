@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Iterator, List, Optional, Set
+
+import mammoth
+import pymupdf
+
+from ats_ai.text_cache import file_sha256, get_text_cache
+
+"""
+    Document text extraction service.
+    PDF/DOC/DOCX parsing is CPU-bound, so it runs in a dedicated process pool instead of inside async
+    endpoints: extract_document_text() is awaitable, enforces a file size limit and a per-file timeout,
+    and lets extraction scale across cores without stalling the event loop. At most max_workers files are
+    submitted at once, so the timeout measures extraction, not time spent queued. A file that exceeds it
+    retires its pool: new files go to a fresh pool, and the old pool's workers (the stuck one included) are
+    terminated once its other in-flight files have finished. Results are cached by file content hash
+    (text_cache), so a byte-identical file is never parsed twice.
+"""
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DOCUMENT_EXTENSIONS = [".pdf", ".doc", ".docx"]
+EXTRACTION_MAX_WORKERS = int(os.getenv("EXTRACTION_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACTION_MAX_FILE_MB = float(os.getenv("EXTRACTION_MAX_FILE_MB", "20"))
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "30"))
+EXTRACTION_MAX_PDF_PAGES = int(os.getenv("EXTRACTION_MAX_PDF_PAGES", "0"))  # 0 = no cap
+# Bump when extracted text changes for the same file, so cached text is not reused
+EXTRACTOR_VERSION = f"1-p{EXTRACTION_MAX_PDF_PAGES}"
+
+
+def iter_pdf_pages(file_path: str, max_pages: int = EXTRACTION_MAX_PDF_PAGES) -> Iterator[str]:
+    """Yield the stripped plain text of each PDF page in order, one page loaded at a time"""
+    with pymupdf.open(file_path) as pdf:
+        for page_number, page in enumerate(pdf):
+            if max_pages and page_number >= max_pages:
+                break
+            yield page.get_text().strip()
+
+
+def load_pdf_text(file_path: str, max_pages: int = EXTRACTION_MAX_PDF_PAGES) -> str:
+    """PDF text straight from PyMuPDF, pages joined by a space (same text PyMuPDFLoader produced)"""
+    return " ".join(iter_pdf_pages(file_path, max_pages))
+
+
+def load_docx_text(file_path: str) -> str:
+    with open(file_path, "rb") as doc_file:
+        result = mammoth.extract_raw_text(doc_file)
+        return result.value
+
+
+def extract_text_sync(file_path: str) -> str:
+    """Extract plain text from a PDF/DOC/DOCX file (runs inside a pool worker)"""
+    file_extension = Path(file_path).suffix.lower()
+
+    if file_extension == ".pdf":
+        return load_pdf_text(file_path)
+
+    elif file_extension in [".doc", ".docx"]:
+        return load_docx_text(file_path)
+
+    else:
+        raise ValueError(f"Unsupported file format: {file_extension}")
+
+
+def _report_worker_pid(pid_queue):
+    """Pool worker initializer: tell the parent which process to terminate if this pool is retired"""
+    pid_queue.put(os.getpid())
+
+
+class ExtractionPool:
+    """A process pool plus what retiring it needs: its worker PIDs and the extractions still running on it"""
+
+    def __init__(self, max_workers: int):
+        # spawn: the server process runs threads (scheduler, uvicorn), which fork() does not copy safely
+        context = multiprocessing.get_context("spawn")
+        self._pid_queue = context.SimpleQueue()
+        self._worker_pids: Set[int] = set()
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_report_worker_pid, initargs=(self._pid_queue,))
+        self.in_flight = 0
+        self.retired = False
+
+    def terminate(self):
+        """Kill every worker of this pool, including one stuck on a pathological file"""
+        while not self._pid_queue.empty():
+            self._worker_pids.add(self._pid_queue.get())
+        for process in multiprocessing.active_children():
+            if process.pid in self._worker_pids:
+                process.terminate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class DocumentExtractor:
+    def __init__(self, max_workers: int = EXTRACTION_MAX_WORKERS, max_file_mb: float = EXTRACTION_MAX_FILE_MB, timeout_seconds: float = EXTRACTION_TIMEOUT_SECONDS):
+        self.max_workers = max_workers
+        self.max_file_bytes = int(max_file_mb * 1024 * 1024)
+        self.timeout_seconds = timeout_seconds
+        self._pool: Optional[ExtractionPool] = None
+        self._retired_pools: List[ExtractionPool] = []  # Waiting for their other in-flight extractions to finish
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_pool(self) -> ExtractionPool:
+        if self._pool is None:
+            self._pool = ExtractionPool(self.max_workers)
+        return self._pool
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """One slot per worker, so a file is only submitted when a worker is free to start on it"""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            # A new loop only when the app loop is not running (scheduler fallback), so slots are never shared across loops
+            self._slots, self._slots_loop = asyncio.Semaphore(self.max_workers), loop
+        return self._slots
+
+    def _retire_pool(self, pool: ExtractionPool):
+        """Send new files to a fresh pool; this one is terminated when its last in-flight extraction ends"""
+        if self._pool is pool:
+            self._pool = None
+        if not pool.retired:
+            pool.retired = True
+            self._retired_pools.append(pool)
+
+    def _release_pool(self, pool: ExtractionPool):
+        pool.in_flight -= 1
+        if pool.retired and pool.in_flight == 0 and pool in self._retired_pools:
+            self._retired_pools.remove(pool)
+            pool.terminate()
+
+    def shutdown(self):
+        for pool in self._retired_pools:
+            pool.terminate()
+        self._retired_pools = []
+        if self._pool is not None:
+            self._pool.executor.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def validate(self, file_path: str):
+        """Raise ValueError for missing, unsupported or oversized files"""
+        file_extension = Path(file_path).suffix.lower()
+        if file_extension not in SUPPORTED_DOCUMENT_EXTENSIONS:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+        if not os.path.isfile(file_path):
+            raise ValueError(f"File not found: {os.path.basename(file_path)}")
+        file_size = os.path.getsize(file_path)
+        if file_size > self.max_file_bytes:
+            raise ValueError(f"File is too large ({file_size / (1024 * 1024):.1f} MB, limit {self.max_file_bytes / (1024 * 1024):.0f} MB)")
+
+    async def extract(self, file_path: str, content_hash: Optional[str] = None) -> str:
+        """
+        Extract text, from the content-hash cache or in a pool worker
+        - content_hash: SHA-256 of the file if the caller already has it (e.g. a resume ID)
+        - raises ValueError for invalid input or unreadable documents, TimeoutError when the timeout is exceeded
+        """
+        self.validate(file_path)
+
+        text_cache = get_text_cache()
+        cache_key = None
+        if text_cache is not None:
+            if content_hash is None:
+                content_hash = await asyncio.to_thread(file_sha256, file_path)
+            cache_key = text_cache.make_key(content_hash, EXTRACTOR_VERSION)
+            cached_text = await asyncio.to_thread(text_cache.get, cache_key)
+            if cached_text is not None:
+                return cached_text
+
+        text = await self._extract_in_pool(file_path)
+        if text_cache is not None:
+            await asyncio.to_thread(text_cache.set, cache_key, text)
+        return text
+
+    async def _extract_in_pool(self, file_path: str) -> str:
+        loop = asyncio.get_running_loop()
+
+        async with self._get_slots():
+            for attempt in range(2):
+                pool = self._get_pool()
+                pool.in_flight += 1
+                try:
+                    return await asyncio.wait_for(loop.run_in_executor(pool.executor, extract_text_sync, file_path), timeout=self.timeout_seconds)
+                except asyncio.TimeoutError:
+                    logger.error(f"Text extraction timed out after {self.timeout_seconds}s: {file_path}")
+                    self._retire_pool(pool)
+                    raise TimeoutError(f"Text extraction timed out after {self.timeout_seconds:g}s")
+                except BrokenProcessPool:
+                    # A worker died (e.g. crashed on a malformed file), which fails everything running on its pool
+                    self._retire_pool(pool)
+                    if attempt == 1:
+                        raise
+                except ValueError:
+                    raise
+                except Exception as e:
+                    raise ValueError(f"Could not read {Path(file_path).suffix.lower()} file: {e}") from e
+                finally:
+                    self._release_pool(pool)
+
+
+_document_extractor: Optional[DocumentExtractor] = None
+
+
+def get_document_extractor() -> DocumentExtractor:
+    global _document_extractor
+    if _document_extractor is None:
+        _document_extractor = DocumentExtractor()
+    return _document_extractor
+
+
+async def extract_document_text(file_path: str, content_hash: Optional[str] = None) -> str:
+    """Awaitable PDF/DOC/DOCX text extraction on the shared process pool"""
+    return await get_document_extractor().extract(file_path, content_hash)
+
+
+def shutdown_document_extractor():
+    global _document_extractor
+    if _document_extractor is not None:
+        _document_extractor.shutdown()
+        _document_extractor = None
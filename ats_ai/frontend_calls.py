@@ -12,7 +12,7 @@ BACKEND_URL = os.getenv("BACKEND_URL", default="http://localhost:8000")
 
 def upload_resume_file_to_backend(file, status_placeholder) -> Optional[str]:
     """
-    Uploads the resume PDF to the backend and returns the filename if successful.
+    Uploads the resume PDF to the backend and returns its resume_id if successful.
     The backend saves the file and does NOT return parsed data here.
     """
     try:
@@ -24,7 +24,7 @@ def upload_resume_file_to_backend(file, status_placeholder) -> Optional[str]:
             response_data = upload_response.json()
             if response_data.get("message") == "Resume uploaded successfully":
                 status_placeholder.success(f"Resume uploaded: `{file.name}`")
-                return file.name
+                return response_data["resume_id"]
             else:
                 status_placeholder.error(f"Upload failed: {response_data.get('message', 'Unknown error')}")
                 return None
@@ -39,18 +39,18 @@ def upload_resume_file_to_backend(file, status_placeholder) -> Optional[str]:
         return None
 
 
-def parse_resume_from_backend(resume_filename: str, status_placeholder) -> Optional[Dict[str, Any]]:
+def parse_resume_from_backend(resume_id: str, status_placeholder) -> Optional[Dict[str, Any]]:
     """
     Sends a request to the backend's /resume_parser endpoint to get the parsed resume JSON.
     """
     try:
-        status_placeholder.info(f"Requesting parsing for `{resume_filename}` from backend...")
-        # Note: The backend's /resume_parser expects the filename as a query parameter
-        parse_response = requests.get(f"{BACKEND_URL}/resume_parser", params={"resume_path": resume_filename})
+        status_placeholder.info(f"Requesting parsing for resume `{resume_id}` from backend...")
+        # Uploads are stored under content-addressed paths, so the backend looks the file up by resume_id
+        parse_response = requests.get(f"{BACKEND_URL}/resume_parser", params={"resume_id": resume_id})
 
         if parse_response.status_code == 200:
             parsed_data = parse_response.json()
-            status_placeholder.success(f"Resume parsed successfully for `{resume_filename}`.")
+            status_placeholder.success(f"Resume parsed successfully for resume `{resume_id}`.")
             return parsed_data
         else:
             status_placeholder.error(f"Backend parsing error: Status {parse_response.status_code} - {parse_response.text}")
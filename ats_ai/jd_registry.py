@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+"""
+    In-memory registry of the structured JDs in jd_json/.
+    Every JD file is read, validated and parsed once and a content ETag is kept, so /list_jds, /jds/{name} and
+    /match_openings are served from memory instead of listing and re-reading the folder per request. The folder
+    is re-scanned (os.scandir, mtime/size only) at most every JD_REGISTRY_POLL_SECONDS, and only files whose
+    mtime or size changed are re-read. Code that writes JDs calls refresh() so its own changes are visible
+    immediately.
+"""
+
+logger = logging.getLogger(__name__)
+
+JD_JSON_FOLDER = os.getenv("JD_JSON_FOLDER", "jd_json")
+JD_REGISTRY_POLL_SECONDS = float(os.getenv("JD_REGISTRY_POLL_SECONDS", "2"))
+
+
+class RegisteredJD(BaseModel):
+    name: str  # File name without .json, as shown in /list_jds
+    data: Dict[str, Any]
+    etag: str
+    mtime_ns: int
+    size_bytes: int
+
+
+def load_registered_jd(name: str, file_path: str, mtime_ns: int, size_bytes: int) -> RegisteredJD:
+    """Read and validate one JD file; raises ValueError if it is not a JSON object"""
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError("JD JSON must be an object")
+    return RegisteredJD(
+        name=name,
+        data=data,
+        etag=f'"{hashlib.sha256(raw).hexdigest()[:32]}"',
+        mtime_ns=mtime_ns,
+        size_bytes=size_bytes,
+    )
+
+
+class JDRegistry:
+    def __init__(self, folder: str = JD_JSON_FOLDER, poll_seconds: float = JD_REGISTRY_POLL_SECONDS):
+        self.folder = folder
+        self.poll_seconds = poll_seconds
+        self.errors: Dict[str, str] = {}  # name -> why the file was rejected
+        self._rejected: Dict[str, Tuple[int, int]] = {}  # name -> (mtime_ns, size) of the rejected file
+        self._jds: Dict[str, RegisteredJD] = {}
+        self._list_etag = '"empty"'
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False):
+        """Re-scan the folder if the poll interval has passed (or force=True) and reload changed files"""
+        with self._lock:
+            if not force and time.monotonic() - self._last_scan < self.poll_seconds:
+                return
+            self._last_scan = time.monotonic()
+
+            os.makedirs(self.folder, exist_ok=True)
+            seen = set()
+            changed = False
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    name = entry.name[:-5]
+                    seen.add(name)
+                    stat = entry.stat()
+                    current = self._jds.get(name)
+                    if current is not None and current.mtime_ns == stat.st_mtime_ns and current.size_bytes == stat.st_size:
+                        continue
+                    if current is None and self._rejected.get(name) == (stat.st_mtime_ns, stat.st_size):
+                        continue  # Same broken file as last scan
+                    changed = True
+                    try:
+                        self._jds[name] = load_registered_jd(name, entry.path, stat.st_mtime_ns, stat.st_size)
+                        self.errors.pop(name, None)
+                        self._rejected.pop(name, None)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Skipping JD {entry.name}: {e}")
+                        self._jds.pop(name, None)
+                        self.errors[name] = str(e)
+                        self._rejected[name] = (stat.st_mtime_ns, stat.st_size)
+
+            for name in set(self._jds) - seen:
+                self._jds.pop(name)
+                changed = True
+            for name in set(self.errors) - seen:
+                self.errors.pop(name)
+                self._rejected.pop(name)
+
+            if changed:
+                listing = "\n".join(f"{name}:{self._jds[name].etag}" for name in sorted(self._jds))
+                self._list_etag = f'"{hashlib.sha256(listing.encode("utf-8")).hexdigest()[:32]}"'
+
+    def names(self) -> List[str]:
+        self.refresh()
+        return sorted(self._jds)
+
+    def list_etag(self) -> str:
+        """Changes whenever a JD is added, removed or edited"""
+        self.refresh()
+        return self._list_etag
+
+    def get(self, name: str) -> Optional[RegisteredJD]:
+        self.refresh()
+        return self._jds.get(os.path.basename(name))
+
+    def all(self) -> Dict[str, RegisteredJD]:
+        self.refresh()
+        return dict(self._jds)
+
+
+_jd_registry: Optional[JDRegistry] = None
+
+
+def get_jd_registry() -> JDRegistry:
+    global _jd_registry
+    if _jd_registry is None:
+        _jd_registry = JDRegistry()
+    return _jd_registry
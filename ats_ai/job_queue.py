@@ -0,0 +1,220 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ats_ai.agent.llm_agent import DefaultWeightageConfig, combined_parse_evaluate
+from ats_ai.agent.prescreen import PrescreenConfig, prescreen_and_evaluate
+
+"""
+    In-process bulk evaluation jobs.
+    A job is N resumes x one JD. Every resume becomes a work item on a shared asyncio queue that a fixed
+    pool of worker tasks drains, so at most EVALUATION_JOB_CONCURRENCY LLM evaluations are in flight
+    across all jobs; their LLM calls share the client's rate-limit backoff. Each result is appended to
+    data/jobs/<job_id>/results.jsonl as soon as it completes (off the event loop), and unfinished jobs are
+    re-queued from disk when the server restarts. Only unfinished jobs are kept in memory; finished ones are
+    read back from disk.
+"""
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_JOB_CONCURRENCY = int(os.getenv("EVALUATION_JOB_CONCURRENCY", "8"))
+EVALUATION_JOBS_FOLDER = os.getenv("EVALUATION_JOBS_FOLDER", "data/jobs")
+
+
+class JobResume(BaseModel):
+    resume_data: str
+    name: str = ""
+
+
+class EvaluationJob(BaseModel):
+    job_id: str
+    status: str = "queued"  # queued -> running -> completed
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    total: int
+    completed: int = 0
+    failed: int = 0
+    prescreen_rejected: int = 0  # Completed items answered by the local pre-screen without an LLM call
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.completed - self.failed
+
+
+class EvaluationJobQueue:
+    def __init__(self, concurrency: int = EVALUATION_JOB_CONCURRENCY, jobs_folder: str = EVALUATION_JOBS_FOLDER):
+        self.concurrency = concurrency
+        self.jobs_folder = Path(jobs_folder)
+        self.jobs: Dict[str, EvaluationJob] = {}
+        self._inputs: Dict[str, Dict[str, Any]] = {}
+        self._write_locks: Dict[str, asyncio.Lock] = {}  # Serializes each unfinished job's result/job.json writes
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    # ---- Persistence ----
+    def _job_dir(self, job_id: str) -> Path:
+        return self.jobs_folder / job_id
+
+    def _save_job(self, job: EvaluationJob):
+        job_dir = self._job_dir(job.job_id)
+        tmp_path = job_dir / "job.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job.model_dump(), f)
+        os.replace(tmp_path, job_dir / "job.json")
+
+    def _append_result(self, job_id: str, result: Dict[str, Any]):
+        with open(self._job_dir(job_id) / "results.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def load_results(self, job_id: str) -> List[Dict[str, Any]]:
+        results_path = self._job_dir(job_id) / "results.jsonl"
+        if not results_path.exists():
+            return []
+        with open(results_path, "r", encoding="utf-8") as f:
+            results = [json.loads(line) for line in f if line.strip()]
+        return sorted(results, key=lambda result: result["index"])
+
+    # ---- Lifecycle ----
+    async def start(self):
+        """Start the worker pool and re-queue jobs that were unfinished when the server stopped"""
+        self.jobs_folder.mkdir(parents=True, exist_ok=True)
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker(worker_id)) for worker_id in range(self.concurrency)]
+        self._recover_unfinished_jobs()
+        logger.info(f"Evaluation job queue started with {self.concurrency} workers")
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def _recover_unfinished_jobs(self):
+        for job_file in self.jobs_folder.glob("*/job.json"):
+            try:
+                with open(job_file, "r", encoding="utf-8") as f:
+                    job = EvaluationJob(**json.load(f))
+                if job.status == "completed":
+                    continue
+                done_results = self.load_results(job.job_id)
+                done_indexes = {result["index"] for result in done_results}
+                # results.jsonl is the source of truth; job.json may lag it by one write after a crash
+                job.completed = sum(1 for result in done_results if result["status"] == "completed")
+                job.failed = len(done_results) - job.completed
+                job.prescreen_rejected = sum(1 for result in done_results if not result.get("evaluation", {}).get("Prescreen", {}).get("escalate", True))
+                if job.pending == 0:
+                    # Every result was written but the process stopped before job.json was marked finished
+                    job.status = "completed"
+                    job.finished_at = (job_file.parent / "results.jsonl").stat().st_mtime if done_results else time.time()
+                    self._save_job(job)
+                    logger.info(f"Recovered job {job.job_id}: all {job.total} resumes were already done")
+                    continue
+                with open(job_file.parent / "inputs.json", "r", encoding="utf-8") as f:
+                    self._inputs[job.job_id] = json.load(f)
+                self.jobs[job.job_id] = job
+                self._write_locks[job.job_id] = asyncio.Lock()
+                for index in range(job.total):
+                    if index not in done_indexes:
+                        self._queue.put_nowait((job.job_id, index))
+                logger.info(f"Recovered job {job.job_id}: {job.total - len(done_indexes)} resumes left")
+            except Exception as e:
+                logger.error(f"Could not recover job from {job_file}: {e}")
+
+    # ---- Public API ----
+    def submit(self, resumes: List[JobResume], jd_json: Dict[str, Any], weightage_config: Dict[str, float], prescreen_config: Optional[Dict[str, Any]] = None) -> EvaluationJob:
+        """Persist a new job and queue one work item per resume; prescreen_config enables the local pre-screen"""
+        job = EvaluationJob(job_id=uuid.uuid4().hex, created_at=time.time(), total=len(resumes))
+        inputs = {"resumes": [resume.model_dump() for resume in resumes], "jd_json": jd_json, "weightage_config": weightage_config, "prescreen_config": prescreen_config}
+
+        job_dir = self._job_dir(job.job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        with open(job_dir / "inputs.json", "w", encoding="utf-8") as f:
+            json.dump(inputs, f, ensure_ascii=False)
+        self._save_job(job)
+
+        self.jobs[job.job_id] = job
+        self._inputs[job.job_id] = inputs
+        self._write_locks[job.job_id] = asyncio.Lock()
+        for index in range(job.total):
+            self._queue.put_nowait((job.job_id, index))
+        return job
+
+    def get(self, job_id: str) -> Optional[EvaluationJob]:
+        """An unfinished job from memory, else a finished one from disk (reads a file, call it off the event loop)"""
+        if job_id in self.jobs:
+            return self.jobs[job_id]
+        job_file = self._job_dir(job_id) / "job.json"
+        if job_file.exists():
+            with open(job_file, "r", encoding="utf-8") as f:
+                return EvaluationJob(**json.load(f))
+        return None
+
+    # ---- Worker ----
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id, index = await self._queue.get()
+            try:
+                await self._evaluate_one(job_id, index)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed on job {job_id} item {index}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _evaluate_one(self, job_id: str, index: int):
+        job = self.jobs[job_id]
+        inputs = self._inputs[job_id]
+        resume = inputs["resumes"][index]
+
+        if job.status == "queued":
+            job.status = "running"
+            job.started_at = time.time()
+
+        started = time.time()
+        result = {"index": index, "name": resume.get("name", "")}
+        try:
+            weightage_config = DefaultWeightageConfig(**inputs["weightage_config"])
+            if inputs.get("prescreen_config") is not None:
+                evaluation = await prescreen_and_evaluate(resume["resume_data"], inputs["jd_json"], weightage_config, PrescreenConfig(**inputs["prescreen_config"]), bulk=True)
+            else:
+                evaluation = await combined_parse_evaluate(resume["resume_data"], inputs["jd_json"], weightage_config, bulk=True)
+            result.update({"status": "completed", "evaluation": evaluation})
+        except Exception as e:
+            result.update({"status": "failed", "error": str(e)})
+        result["seconds"] = round(time.time() - started, 2)
+
+        # Counters move only once the result is on disk, so "completed" means every result is in results.jsonl
+        async with self._write_locks[job_id]:
+            await asyncio.to_thread(self._append_result, job_id, result)
+            if result["status"] == "completed":
+                job.completed += 1
+                if not result["evaluation"].get("Prescreen", {}).get("escalate", True):
+                    job.prescreen_rejected += 1
+            else:
+                job.failed += 1
+            if job.pending == 0:
+                job.status = "completed"
+                job.finished_at = time.time()
+            await asyncio.to_thread(self._save_job, job.model_copy())
+            if job.status == "completed":
+                # GET /jobs/{job_id} reads finished jobs from disk
+                self.jobs.pop(job_id, None)
+                self._inputs.pop(job_id, None)
+                self._write_locks.pop(job_id, None)
+
+
+_job_queue: Optional[EvaluationJobQueue] = None
+
+
+def get_job_queue() -> EvaluationJobQueue:
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = EvaluationJobQueue()
+    return _job_queue
@@ -51,4 +51,6 @@ class Cand_Decision(BaseModel):
     name: str
     contact: Optional[dict] = None
     decision: str
-    evaluation_results: Optional[dict] = None
+    evaluation_results: Optional[dict] = None  # Full /parse_and_evaluate response (or its "Evaluation" section)
+    jd_name: str = ""  # JD the candidate was evaluated against, as in /list_jds
+    resume_id: Optional[str] = None  # From /upload_resume_file
@@ -0,0 +1,223 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+from pydantic import BaseModel
+
+"""
+    Near-duplicate resume detection.
+    The same candidate often arrives through several agencies as slightly different PDFs (a new header, a
+    re-export, an edited line), which content hashing treats as different resumes. Every uploaded resume's
+    extracted text gets a MinHash signature (word 3-gram shingles) stored in an LSH index (16 bands x 8 rows),
+    so an upload is compared only with resumes that share a band bucket, and is flagged when the estimated
+    Jaccard similarity reaches NEAR_DUPLICATE_THRESHOLD. Email and phone keys flag the same candidate even when
+    the text differs. Keys found anywhere in the text (at upload) also catch an agency footer or a referee's
+    number shared by different people, so they only mark a possible duplicate; a match is confirmed (safe to
+    reuse an evaluation for) by similar text or by a key parsed from Contact_Details on both resumes (recorded
+    when an evaluation is stored).
+"""
+
+logger = logging.getLogger(__name__)
+
+NEAR_DUPLICATE_INDEX_PATH = os.getenv("NEAR_DUPLICATE_INDEX_PATH", "data/near_duplicates.sqlite3")
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))  # Estimated Jaccard similarity of the shingle sets
+
+# Changing these invalidates every stored signature
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 16  # x 8 rows: a pair at 0.8 similarity shares a bucket 95% of the time, at 0.5 only 6%
+SHINGLE_WORDS = 3
+MINHASH_PRIME = 4294967311  # Smallest prime above 2**32: (a * x + b) stays below 2**64 for 32-bit a, b and x
+# Fixed coefficients (not np.random) so signatures stay comparable across processes and library versions
+MINHASH_A = np.array([int.from_bytes(hashlib.blake2b(f"minhash-a-{index}".encode(), digest_size=4).digest(), "big") | 1 for index in range(MINHASH_PERMUTATIONS)], dtype=np.uint64)
+MINHASH_B = np.array([int.from_bytes(hashlib.blake2b(f"minhash-b-{index}".encode(), digest_size=4).digest(), "big") for index in range(MINHASH_PERMUTATIONS)], dtype=np.uint64)
+
+EMAIL_REGEX = re.compile(r"[a-z0-9._%+-]+@[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,}", re.IGNORECASE)
+PHONE_REGEX = re.compile(r"\+?\d[\d\s().-]{8,18}\d")
+YEAR_REGEX = re.compile(r"(?:19|20)\d\d")
+
+
+class NearDuplicate(BaseModel):
+    resume_id: str
+    similarity: Optional[float] = None  # Estimated Jaccard similarity of the texts; None if the other resume has no signature
+    reasons: List[str]  # "similar_text", "same_email", "same_phone"
+    confirmed: bool  # Similar text, or an email/phone parsed from both resumes' Contact_Details; otherwise only a possible duplicate
+
+
+def normalize_resume_text(text: str) -> List[str]:
+    """Lower-cased alphanumeric words; layout, punctuation and spacing differences between exports disappear"""
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).split()
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MINHASH_PERMUTATIONS minimum hashes of the text's word shingles, or None for (nearly) empty text"""
+    words = normalize_resume_text(text)
+    if len(words) < SHINGLE_WORDS:
+        return None
+    shingles = {" ".join(shingle) for shingle in zip(*(words[offset:] for offset in range(SHINGLE_WORDS)))}
+    hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    return ((np.outer(hashes, MINHASH_A) + MINHASH_B) % MINHASH_PRIME).min(axis=0)
+
+
+def lsh_buckets(signature: np.ndarray) -> List[int]:
+    """One bucket per band: a 64-bit hash of the band's rows"""
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    buckets = []
+    for band in range(LSH_BANDS):
+        start, end = band * rows, (band + 1) * rows
+        buckets.append(int.from_bytes(hashlib.blake2b(signature[start:end].tobytes(), digest_size=8).digest(), "big", signed=True))
+    return buckets
+
+
+def signature_similarity(signature: np.ndarray, other: np.ndarray) -> float:
+    return float(np.mean(signature == other))
+
+
+def phone_key(number: str) -> Optional[str]:
+    """
+    phone:<last 10 digits> of a phone-number-like match, or None
+    Digit runs such as "2015 - 2019 2019" or "411001 2020" also match PHONE_REGEX, so a number must start with
+    "+", or have a group of 5+ digits and no year-like group; a single group of 10+ digits is taken on its own
+    """
+    groups = re.findall(r"\d+", number)
+    long_groups = [group for group in groups if len(group) >= 10]
+    if long_groups:
+        digits = long_groups[0]
+    elif number.startswith("+") or (any(len(group) >= 5 for group in groups) and not any(YEAR_REGEX.fullmatch(group) for group in groups)):
+        digits = "".join(groups)
+    else:
+        return None
+    if not 10 <= len(digits) <= 15:
+        return None
+    return f"phone:{digits[-10:]}"
+
+
+def contact_keys_from_text(text: str) -> Set[str]:
+    """email:<address> and phone:<last 10 digits> keys found in the text"""
+    keys = {f"email:{email.lower()}" for email in EMAIL_REGEX.findall(text)}
+    keys.update(key for key in map(phone_key, PHONE_REGEX.findall(text)) if key)
+    return keys
+
+
+def contact_keys(contact: Optional[Dict[str, Any]]) -> Set[str]:
+    """Keys of a parsed Contact_Details ({"Mobile_No": ..., "Email": ...})"""
+    keys = set()
+    for value in (contact or {}).values():
+        if isinstance(value, (str, int)):
+            keys.update(contact_keys_from_text(str(value)))
+    return keys
+
+
+class NearDuplicateIndex:
+    def __init__(self, db_path: str = NEAR_DUPLICATE_INDEX_PATH, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.db_path = db_path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS resume_signatures (resume_id TEXT PRIMARY KEY, signature BLOB NOT NULL, indexed_at REAL NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS resume_lsh_buckets (band INTEGER NOT NULL, bucket INTEGER NOT NULL, resume_id TEXT NOT NULL, PRIMARY KEY (band, bucket, resume_id)) WITHOUT ROWID")
+            # parsed = 1 once the key was also found in the resume's parsed Contact_Details, not just somewhere in its text
+            self._conn.execute("CREATE TABLE IF NOT EXISTS resume_contact_keys (contact_key TEXT NOT NULL, resume_id TEXT NOT NULL, parsed INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (contact_key, resume_id)) WITHOUT ROWID")
+            if "parsed" not in {row[1] for row in self._conn.execute("PRAGMA table_info(resume_contact_keys)")}:
+                self._conn.execute("ALTER TABLE resume_contact_keys ADD COLUMN parsed INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_resume_contact_keys_resume ON resume_contact_keys(resume_id)")
+            self._conn.commit()
+        return self._conn
+
+    def _signature(self, conn: sqlite3.Connection, resume_id: str) -> Optional[np.ndarray]:
+        row = conn.execute("SELECT signature FROM resume_signatures WHERE resume_id = ?", (resume_id,)).fetchone()
+        return np.frombuffer(row[0], dtype=np.uint64) if row else None
+
+    def _contact_keys(self, conn: sqlite3.Connection, resume_id: str) -> Dict[str, bool]:
+        """contact_key -> whether it was parsed from Contact_Details, for one resume"""
+        return {contact_key: bool(parsed) for contact_key, parsed in conn.execute("SELECT contact_key, parsed FROM resume_contact_keys WHERE resume_id = ?", (resume_id,))}
+
+    def _find(self, conn: sqlite3.Connection, resume_id: str, signature: Optional[np.ndarray], keys: Dict[str, bool]) -> List[NearDuplicate]:
+        reasons: Dict[str, List[str]] = {}
+        similarities: Dict[str, float] = {}
+        confirmed: Set[str] = set()
+
+        if signature is not None:
+            bucket_filter = " OR ".join("(band = ? AND bucket = ?)" for _ in range(LSH_BANDS))
+            params = [value for band, bucket in enumerate(lsh_buckets(signature)) for value in (band, bucket)]
+            candidates = {row[0] for row in conn.execute(f"SELECT DISTINCT resume_id FROM resume_lsh_buckets WHERE {bucket_filter}", params)}
+            candidates.discard(resume_id)
+            for candidate_id in candidates:
+                similarity = signature_similarity(signature, self._signature(conn, candidate_id))
+                if similarity >= self.threshold:
+                    similarities[candidate_id] = similarity
+                    reasons[candidate_id] = ["similar_text"]
+                    confirmed.add(candidate_id)
+
+        if keys:
+            placeholders = ", ".join("?" for _ in keys)
+            for contact_key, candidate_id, parsed in conn.execute(f"SELECT contact_key, resume_id, parsed FROM resume_contact_keys WHERE contact_key IN ({placeholders}) AND resume_id != ?", (*sorted(keys), resume_id)):
+                reason = "same_email" if contact_key.startswith("email:") else "same_phone"
+                if reason not in reasons.setdefault(candidate_id, []):
+                    reasons[candidate_id].append(reason)
+                if parsed and keys[contact_key]:
+                    confirmed.add(candidate_id)
+                if candidate_id not in similarities and signature is not None:
+                    other = self._signature(conn, candidate_id)
+                    if other is not None:
+                        similarities[candidate_id] = signature_similarity(signature, other)
+
+        near_duplicates = [
+            NearDuplicate(resume_id=candidate_id, similarity=round(similarities[candidate_id], 3) if candidate_id in similarities else None, reasons=candidate_reasons, confirmed=candidate_id in confirmed)
+            for candidate_id, candidate_reasons in reasons.items()
+        ]
+        return sorted(near_duplicates, key=lambda near_duplicate: (not near_duplicate.confirmed, -len(near_duplicate.reasons), -(near_duplicate.similarity or 0.0)))
+
+    def check_and_add(self, resume_id: str, text: str) -> List[NearDuplicate]:
+        """Index a newly uploaded resume (again, for a re-upload of the same file) and return its near-duplicates"""
+        signature = minhash_signature(text)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if signature is not None and self._signature(conn, resume_id) is None:
+                    conn.execute("INSERT INTO resume_signatures (resume_id, signature, indexed_at) VALUES (?, ?, ?)", (resume_id, signature.tobytes(), time.time()))
+                    conn.executemany("INSERT OR IGNORE INTO resume_lsh_buckets (band, bucket, resume_id) VALUES (?, ?, ?)", [(band, bucket, resume_id) for band, bucket in enumerate(lsh_buckets(signature))])
+                conn.executemany("INSERT OR IGNORE INTO resume_contact_keys (contact_key, resume_id) VALUES (?, ?)", [(key, resume_id) for key in contact_keys_from_text(text)])
+            return self._find(conn, resume_id, signature, self._contact_keys(conn, resume_id))
+
+    def add_contact(self, resume_id: str, contact: Optional[Dict[str, Any]]):
+        """Index the parsed Contact_Details of a resume: the candidate's own email and phone, unlike keys found in its text"""
+        keys = contact_keys(contact)
+        if not keys:
+            return
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO resume_contact_keys (contact_key, resume_id, parsed) VALUES (?, ?, 1) ON CONFLICT (contact_key, resume_id) DO UPDATE SET parsed = 1",
+                    [(key, resume_id) for key in keys],
+                )
+
+    def find(self, resume_id: str) -> List[NearDuplicate]:
+        """Near-duplicates of an already indexed resume"""
+        with self._lock:
+            conn = self._connection()
+            return self._find(conn, resume_id, self._signature(conn, resume_id), self._contact_keys(conn, resume_id))
+
+
+_near_duplicate_index: Optional[NearDuplicateIndex] = None
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    global _near_duplicate_index
+    if _near_duplicate_index is None:
+        _near_duplicate_index = NearDuplicateIndex()
+    return _near_duplicate_index
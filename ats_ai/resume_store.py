@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from fastapi import UploadFile
+from pydantic import BaseModel
+
+"""
+    Content-addressed storage for uploaded resumes.
+    Uploads are streamed to disk in chunks while their SHA-256 is computed; the hash is the resume ID and the
+    file lives at data/resumes/<id[:2]>/<id><ext>. Identical files are stored once (the second upload only
+    updates the metadata index), and different candidates' "resume.pdf" can no longer overwrite each other.
+"""
+
+logger = logging.getLogger(__name__)
+
+RESUME_STORE_FOLDER = os.getenv("RESUME_STORE_FOLDER", "data/resumes")
+RESUME_MAX_UPLOAD_MB = float(os.getenv("RESUME_MAX_UPLOAD_MB", "20"))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+RESUME_ID_REGEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+class StoredResume(BaseModel):
+    resume_id: str
+    extension: str
+    size_bytes: int
+    file_path: str
+    filenames: List[str]  # Every original filename this content was uploaded as
+    first_uploaded_at: float
+    last_uploaded_at: float
+    upload_count: int
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+class ResumeStore:
+    def __init__(self, folder: str = RESUME_STORE_FOLDER, max_upload_mb: float = RESUME_MAX_UPLOAD_MB):
+        self.folder = Path(folder)
+        self.max_upload_bytes = int(max_upload_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.folder / "index.sqlite3"), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS resumes (
+                    resume_id TEXT PRIMARY KEY,
+                    extension TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    filenames TEXT NOT NULL,
+                    first_uploaded_at REAL NOT NULL,
+                    last_uploaded_at REAL NOT NULL,
+                    upload_count INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _path(self, resume_id: str, extension: str) -> Path:
+        return self.folder / resume_id[:2] / f"{resume_id}{extension}"
+
+    def _row_to_resume(self, row) -> StoredResume:
+        resume_id, extension, size_bytes, filenames, first_uploaded_at, last_uploaded_at, upload_count = row
+        return StoredResume(
+            resume_id=resume_id,
+            extension=extension,
+            size_bytes=size_bytes,
+            file_path=str(self._path(resume_id, extension)),
+            filenames=json.loads(filenames),
+            first_uploaded_at=first_uploaded_at,
+            last_uploaded_at=last_uploaded_at,
+            upload_count=upload_count,
+        )
+
+    def get(self, resume_id: str) -> Optional[StoredResume]:
+        if not RESUME_ID_REGEX.match(resume_id or ""):
+            return None
+        with self._lock:
+            row = self._connection().execute("SELECT * FROM resumes WHERE resume_id = ?", (resume_id,)).fetchone()
+        return self._row_to_resume(row) if row else None
+
+    async def save_upload(self, upload_file: UploadFile) -> Tuple[StoredResume, bool]:
+        """
+        Stream an upload into the store
+        - returns (StoredResume, deduplicated) where deduplicated is True if the same bytes were already stored
+        - raises UploadTooLargeError past max_upload_bytes
+        """
+        extension = Path(upload_file.filename).suffix.lower()
+        incoming_folder = self.folder / "incoming"
+        incoming_folder.mkdir(parents=True, exist_ok=True)
+        temp_path = incoming_folder / f"{uuid.uuid4().hex}{extension}"
+
+        digest = hashlib.sha256()
+        size_bytes = 0
+        try:
+            with open(temp_path, "wb") as f:
+                while chunk := await upload_file.read(UPLOAD_CHUNK_BYTES):
+                    size_bytes += len(chunk)
+                    if size_bytes > self.max_upload_bytes:
+                        raise UploadTooLargeError(f"File is larger than the {self.max_upload_bytes / (1024 * 1024):.0f} MB upload limit")
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            resume_id = digest.hexdigest()
+            existing = self.get(resume_id)
+            deduplicated = existing is not None and Path(existing.file_path).exists()
+            if deduplicated:
+                temp_path.unlink()
+            else:
+                target_path = self._path(resume_id, extension)
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(temp_path, target_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT filenames FROM resumes WHERE resume_id = ?", (resume_id,)).fetchone()
+            if row is None or not deduplicated:
+                conn.execute(
+                    "INSERT OR REPLACE INTO resumes (resume_id, extension, size_bytes, filenames, first_uploaded_at, last_uploaded_at, upload_count) VALUES (?, ?, ?, ?, ?, ?, 1)",
+                    (resume_id, extension, size_bytes, json.dumps([upload_file.filename]), now, now),
+                )
+            else:
+                filenames = json.loads(row[0])
+                if upload_file.filename not in filenames:
+                    filenames.append(upload_file.filename)
+                conn.execute(
+                    "UPDATE resumes SET filenames = ?, last_uploaded_at = ?, upload_count = upload_count + 1 WHERE resume_id = ?",
+                    (json.dumps(filenames), now, resume_id),
+                )
+            conn.commit()
+        return self.get(resume_id), deduplicated
+
+    def delete(self, resume_id: str):
+        stored_resume = self.get(resume_id)
+        if stored_resume is None:
+            return
+        file_path = Path(stored_resume.file_path)
+        file_path.unlink(missing_ok=True)
+        if not any(file_path.parent.iterdir()):
+            file_path.parent.rmdir()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM resumes WHERE resume_id = ?", (resume_id,))
+            conn.commit()
+
+
+_resume_store: Optional[ResumeStore] = None
+
+
+def get_resume_store() -> ResumeStore:
+    global _resume_store
+    if _resume_store is None:
+        _resume_store = ResumeStore()
+    return _resume_store
@@ -0,0 +1,131 @@
+import math
+import os
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ats_ai.agent.prescreen import GENERIC_SKILL_WORDS, PLACEHOLDER_SKILLS, tokenize
+from ats_ai.jd_registry import JDRegistry, get_jd_registry
+
+"""
+    Local retrieval between resumes and JDs, to shortlist before LLM evaluation (no model calls).
+    Resume -> JDs: BM25 over each JD's Required_Skills, Responsibilities and Qualifications (plus its title and
+    preferred skills). Every JD is precomputed as a sparse vector of term -> BM25 weight with an inverted index,
+    rebuilt only when the JD registry's listing ETag changes; ranking all JDs for a resume sums the postings
+    of the resume's distinct words.
+    JD -> candidates: the JD's highest-weighted terms are run against the evaluation store's FTS5 index
+    (bm25 over every stored candidate's skills and resume text), see EvaluationStore.similar_candidates.
+    Words are normalized like the pre-screen's (prescreen.tokenize), so "Node.js", "nodejs" and "APIs" match.
+"""
+
+RETRIEVAL_BM25_K1 = float(os.getenv("RETRIEVAL_BM25_K1", "1.2"))
+RETRIEVAL_BM25_B = float(os.getenv("RETRIEVAL_BM25_B", "0.75"))
+# Most significant JD terms sent to the candidate full-text index
+JD_CANDIDATE_QUERY_TERMS = int(os.getenv("JD_CANDIDATE_QUERY_TERMS", "40"))
+
+# A JD term's frequency counts this many times per occurrence in the field (BM25F-style field boost)
+JD_RETRIEVAL_FIELD_WEIGHTS = {"Required_Skills": 3, "Job_Title": 2, "Preferred_Skills": 1, "Responsibilities": 1, "Qualifications": 1}
+RETRIEVAL_STOPWORDS = GENERIC_SKILL_WORDS | {"are", "be", "by", "from", "into", "it", "our", "that", "this", "we", "will", "within", "you", "your"}
+
+
+class JDMatch(BaseModel):
+    jd_name: str
+    score: float  # BM25; only comparable between JDs for the same resume
+    matched_terms: List[str]  # Shared terms that contributed most, strongest first
+
+
+def retrieval_terms(text: str) -> List[str]:
+    return [term for term in tokenize(text) if term not in RETRIEVAL_STOPWORDS and not term.rstrip("+").isdigit()]
+
+
+def jd_field_texts(value: Any) -> List[str]:
+    values = value if isinstance(value, list) else [value]
+    return [item for item in values if isinstance(item, str) and item.strip().lower() not in PLACEHOLDER_SKILLS]
+
+
+def jd_term_counts(jd_data: Dict[str, Any]) -> Counter:
+    """Field-weighted term frequencies of a structured JD"""
+    counts = Counter()
+    for field, weight in JD_RETRIEVAL_FIELD_WEIGHTS.items():
+        for text in jd_field_texts(jd_data.get(field)):
+            for term in retrieval_terms(text):
+                counts[term] += weight
+    return counts
+
+
+class BM25Index:
+    """Documents as precomputed sparse BM25 vectors (term -> weight), with postings for scoring queries"""
+
+    def __init__(self, documents: Dict[str, Counter], k1: float = RETRIEVAL_BM25_K1, b: float = RETRIEVAL_BM25_B):
+        self.vectors: Dict[str, Dict[str, float]] = {}
+        self.postings: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+        document_count = len(documents)
+        average_length = sum(sum(counts.values()) for counts in documents.values()) / document_count if document_count else 0.0
+        document_frequency = Counter(term for counts in documents.values() for term in counts)
+
+        for name, counts in documents.items():
+            length_norm = k1 * (1 - b + b * sum(counts.values()) / average_length) if average_length else k1
+            vector = {}
+            for term, frequency in counts.items():
+                idf = math.log(1 + (document_count - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+                vector[term] = idf * frequency * (k1 + 1) / (frequency + length_norm)
+                self.postings[term].append((name, vector[term]))
+            self.vectors[name] = vector
+
+    def rank(self, query_terms: Iterable[str], top_k: Optional[int] = None, names: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """(name, score) of documents sharing a term with the query, best first; names restricts the candidates"""
+        allowed = set(names) if names is not None else None
+        scores = defaultdict(float)
+        for term in set(query_terms):
+            for name, weight in self.postings.get(term, ()):
+                if allowed is None or name in allowed:
+                    scores[name] += weight
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:top_k] if top_k else ranked
+
+
+class JDRetrievalIndex:
+    def __init__(self, jd_registry: Optional[JDRegistry] = None):
+        self.jd_registry = jd_registry
+        self._index: Optional[BM25Index] = None
+        self._list_etag: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def index(self) -> BM25Index:
+        """The BM25 index of the registry's current JDs, rebuilt when any JD was added, removed or edited"""
+        jd_registry = self.jd_registry or get_jd_registry()
+        list_etag = jd_registry.list_etag()
+        with self._lock:
+            if self._index is None or list_etag != self._list_etag:
+                self._index = BM25Index({name: jd_term_counts(registered_jd.data) for name, registered_jd in jd_registry.all().items()})
+                self._list_etag = list_etag
+            return self._index
+
+    def rank_jds(self, resume_text: str, top_k: Optional[int] = None, jd_names: Optional[List[str]] = None, matched_terms: int = 10) -> List[JDMatch]:
+        """Stored JDs that share terms with the resume, most similar first"""
+        index = self.index()
+        ranked = index.rank(retrieval_terms(resume_text), top_k, jd_names)
+        resume_terms = set(retrieval_terms(resume_text))
+        matches = []
+        for jd_name, score in ranked:
+            vector = index.vectors[jd_name]
+            shared = sorted(resume_terms.intersection(vector), key=lambda term: -vector[term])
+            matches.append(JDMatch(jd_name=jd_name, score=round(score, 4), matched_terms=shared[:matched_terms]))
+        return matches
+
+
+def jd_query_terms(jd_data: Dict[str, Any], max_terms: int = JD_CANDIDATE_QUERY_TERMS) -> List[str]:
+    """A JD's most significant terms (by field-weighted frequency) for searching candidates"""
+    return [term for term, _ in jd_term_counts(jd_data).most_common(max_terms)]
+
+
+_jd_retrieval_index: Optional[JDRetrievalIndex] = None
+
+
+def get_jd_retrieval_index() -> JDRetrievalIndex:
+    global _jd_retrieval_index
+    if _jd_retrieval_index is None:
+        _jd_retrieval_index = JDRetrievalIndex()
+    return _jd_retrieval_index
@@ -1,17 +1,246 @@
 import asyncio
 import datetime
+import hashlib
+import json
+import os
 import re
+import time
+from collections import Counter
 from pathlib import Path
+from urllib.parse import urlparse
 
 from docx import Document
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
+# Job detail pages scraped at once (each on its own browser page); 1 = one after another
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "4"))
+# Politeness: minimum gap between two page navigations to the site, across all pages
+SCRAPER_MIN_REQUEST_INTERVAL_SECONDS = float(os.getenv("SCRAPER_MIN_REQUEST_INTERVAL_SECONDS", "1"))
+# How long to wait for the job description to render before extracting whatever is there
+SCRAPER_READY_TIMEOUT_MS = int(os.getenv("SCRAPER_READY_TIMEOUT_MS", "15000"))
+# Job URL -> content hash / last seen / open|closed, so unchanged postings are not rewritten every night
+SCRAPER_STATE_PATH = os.getenv("SCRAPER_STATE_PATH", "data/scraper_state.json")
+# What the last run added, changed and closed; read by the JD conversion step
+SCRAPER_CHANGE_REPORT_PATH = os.getenv("SCRAPER_CHANGE_REPORT_PATH", "data/scraper_changes.json")
+# Scraped JDs are stored as JSON records (jd_folder/<title>.json) that JD conversion reads directly; DOCX is optional
+SCRAPER_EXPORT_DOCX = os.getenv("SCRAPER_EXPORT_DOCX", "false").lower() in ("1", "true", "yes")
+SCRAPER_HEADLESS = os.getenv("SCRAPER_HEADLESS", "true").lower() in ("1", "true", "yes")
+# Lean profile: abort requests we never read (we only need innerText)
+SCRAPER_BLOCK_RESOURCES = os.getenv("SCRAPER_BLOCK_RESOURCES", "true").lower() in ("1", "true", "yes")
+# Extra hosts to load besides the site itself, e.g. a CDN the job pages need to render (comma-separated)
+SCRAPER_ALLOWED_DOMAINS = [domain.strip().lower() for domain in os.getenv("SCRAPER_ALLOWED_DOMAINS", "").split(",") if domain.strip()]
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "texttrack", "eventsource", "websocket", "manifest"}
+# Always loaded, even from other hosts: pages themselves, and CSS because innerText leaves out hidden elements
+ALWAYS_ALLOWED_RESOURCE_TYPES = {"document", "stylesheet"}
+
+CONTENT_SELECTORS = ["main", ".main-content", ".content", ".job-description", ".job-details", "article", ".container"]
+# Ready once any content selector holds a real description (same 200-character threshold the extraction uses)
+CONTENT_READY_SCRIPT = """
+selectors => selectors.some(selector => {
+    const element = document.querySelector(selector);
+    return element && element.innerText.trim().length > 200;
+})
+"""
+
+JOB_URL_KEYWORDS = ["job", "opening", "position"]
+# Links labelled like a job card button may also point at /careers/... pages
+JOB_CARD_LINK_TEXTS = ["see details", "apply", "view"]
+JOB_CARD_URL_KEYWORDS = ["career"]
+JOB_CARD_MAX_LEVELS = 10  # The link itself and up to 9 ancestors are searched for its title and location
+# Runs in the page. Returns {"texts": [...], "links": [{"url", "levels"}]}: each job link (absolute URL without #fragment,
+# in document order, first occurrence only, not the listing page itself) with the indexes into "texts" of the innerText of the
+# link and its ancestors, nearest first. Cards share ancestors, so each element's text is sent once.
+JOB_LISTING_SCRIPT = """
+({url_keywords, card_link_texts, card_url_keywords, max_levels}) => {
+    const withoutHash = url => url.split("#")[0].replace(/\\/$/, "");
+    const pageUrl = withoutHash(location.href);
+    const texts = [];
+    const textIndexes = new Map();
+    const textIndex = element => {
+        if (!textIndexes.has(element)) {
+            textIndexes.set(element, texts.length);
+            texts.push(element.innerText || "");
+        }
+        return textIndexes.get(element);
+    };
+
+    const links = [];
+    const seenUrls = new Set();
+    for (const link of document.querySelectorAll("a[href]")) {
+        const url = link.href.split("#")[0];
+        const urlLower = url.toLowerCase();
+        if (!/^https?:/.test(urlLower) || withoutHash(url) === pageUrl || seenUrls.has(url)) continue;
+        const linkText = (link.innerText || "").trim().toLowerCase();
+        const isCardLink = card_link_texts.some(text => linkText.includes(text)) && card_url_keywords.some(keyword => urlLower.includes(keyword));
+        if (!isCardLink && !url_keywords.some(keyword => urlLower.includes(keyword))) continue;
+        seenUrls.add(url);
+
+        const levels = [];
+        for (let element = link; element && element !== document.documentElement && levels.length < max_levels; element = element.parentElement) {
+            levels.push(textIndex(element));
+        }
+        links.push({url, levels});
+    }
+    return {texts, links};
+}
+"""
+JOB_LISTING_SCRIPT_ARGS = {"url_keywords": JOB_URL_KEYWORDS, "card_link_texts": JOB_CARD_LINK_TEXTS, "card_url_keywords": JOB_CARD_URL_KEYWORDS, "max_levels": JOB_CARD_MAX_LEVELS}
+LOCATIONS = [(("bengaluru", "bangalore"), "Bengaluru"), (("pune",), "Pune"), (("mumbai",), "Mumbai"), (("hyderabad",), "Hyderabad")]
+
+# clean_job_content: a header line (ending in ":" or upper case) that contains one of these starts a section dropped up to
+# the next header; a line that is exactly one of them is dropped on its own
+SKIP_SECTION_KEYWORDS = [
+    "about us",
+    "about the company",
+    "company overview",
+    "who we are",
+    "our company",
+    "company profile",
+    "organization overview",
+    "apply now",
+    "how to apply",
+    "application process",
+    "source url",
+    "scraped date",
+    "contact us",
+    "get in touch",
+    "follow us",
+    "social media",
+    "connect with us",
+    "navigation",
+    "menu",
+    "home",
+    "careers",
+    "lets connect",
+    "join us",
+    "our work",
+    "agent foundry",
+    "benefits and perks",
+]
+# Metadata and navigation lines, dropped before header detection (case-insensitive)
+SKIP_LINE_PATTERNS = [r"^\*\*Source URL:\s*\*\*", r"^\*\*Scraped Date:\s*\*\*", r"^https?://", r"^\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}", r"^Apply Now\s*$", r"^Back\s*$", r"^Home\s*$", r"^Menu\s*$", r"^Navigation\s*$"]
+# Compiled once: one alternation per check instead of a re.match / substring test per pattern and keyword per line
+SKIP_LINE_REGEX = re.compile("|".join(f"(?:{pattern})" for pattern in SKIP_LINE_PATTERNS), re.IGNORECASE)
+SKIP_SECTION_KEYWORD_REGEX = re.compile("|".join(re.escape(keyword) for keyword in SKIP_SECTION_KEYWORDS))
+SKIP_SECTION_KEYWORD_SET = frozenset(SKIP_SECTION_KEYWORDS)
+SECTION_HEADER_REGEX = re.compile(r"^[A-Z][^a-z]*:?$")
+DATE_PREFIX_REGEX = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+def job_title_from_lines(lines):
+    """First line that looks like a job title rather than a button, heading or navigation"""
+    for line in lines:
+        line_lower = line.lower()
+        if 5 < len(line) < 100 and line_lower not in ["see details", "apply now", "view job"] and not any(keyword in line_lower for keyword in ["current job openings", "calfus", "navigation", "menu"]):
+            return line
+    return ""
+
+
+def job_location_from_lines(lines):
+    for line in lines:
+        line_lower = line.lower()
+        for names, location in LOCATIONS:
+            if any(name in line_lower for name in names):
+                return location
+    return ""
+
+
+def jobs_from_listing(listing):
+    """
+    Title and location for each job link found by JOB_LISTING_SCRIPT
+    Walks outwards from the link through its ancestors' text until both are found, but stops at the first ancestor that
+    also contains another job link: past that point the text belongs to the whole list, not this card.
+    - returns list of {"title", "location", "url"}
+    """
+    links_per_text = Counter(text_index for link in listing["links"] for text_index in link["levels"])
+    jobs = []
+    for link in listing["links"]:
+        job_title = ""
+        location = ""
+        for text_index in link["levels"]:
+            if links_per_text[text_index] > 1:
+                break
+            lines = [line.strip() for line in listing["texts"][text_index].split("\n") if line.strip()]
+            job_title = job_title or job_title_from_lines(lines)
+            location = job_location_from_lines(lines) or location
+            if job_title and location:
+                break
+
+        jobs.append({"title": job_title or f"Job_Position_{len(jobs) + 1}", "location": location or "Location_TBD", "url": link["url"]})
+    return jobs
+
 
 class CalfusJobScraper:
-    def __init__(self):
+    def __init__(
+        self,
+        concurrency: int = SCRAPER_CONCURRENCY,
+        min_request_interval: float = SCRAPER_MIN_REQUEST_INTERVAL_SECONDS,
+        headless: bool = SCRAPER_HEADLESS,
+        block_resources: bool = SCRAPER_BLOCK_RESOURCES,
+        export_docx: bool = SCRAPER_EXPORT_DOCX,
+    ):
         self.base_url = "https://www.calfus.com"
         self.job_openings_url = "https://www.calfus.com/job-openings"
         self.jd_folder = Path("jd_folder")
+        self.concurrency = max(1, concurrency)
+        self.min_request_interval = min_request_interval
+        self.headless = headless
+        self.block_resources = block_resources
+        self.export_docx = export_docx
+        self.blocked_requests = 0
+        self.state = {}
+        self._request_lock = asyncio.Lock()
+        self._last_request_at = 0.0
+
+    def is_first_party(self, url):
+        """The site itself (and its subdomains) or a host listed in SCRAPER_ALLOWED_DOMAINS"""
+        host = (urlparse(url).hostname or "").lower()
+        site_host = (urlparse(self.base_url).hostname or "").lower().removeprefix("www.")
+        return any(host == domain or host.endswith("." + domain) for domain in [site_host] + SCRAPER_ALLOWED_DOMAINS)
+
+    def should_block_request(self, resource_type, url):
+        """Images, fonts, media etc., and scripts/XHR from third-party hosts (analytics, chat widgets, embeds)"""
+        if resource_type in BLOCKED_RESOURCE_TYPES:
+            return True
+        if resource_type in ALWAYS_ALLOWED_RESOURCE_TYPES or url.startswith(("data:", "blob:")):
+            return False
+        return not self.is_first_party(url)
+
+    async def route_request(self, route):
+        if self.should_block_request(route.request.resource_type, route.request.url):
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def configure_context(self, context):
+        """Install the lean-profile request interception on a browser context"""
+        if self.block_resources:
+            await context.route("**/*", self.route_request)
+
+    async def polite_wait(self):
+        """Space out navigations to the site by min_request_interval, however many pages are scraping"""
+        async with self._request_lock:
+            wait_seconds = self._last_request_at + self.min_request_interval - time.monotonic()
+            if wait_seconds > 0:
+                await asyncio.sleep(wait_seconds)
+            self._last_request_at = time.monotonic()
+
+    async def wait_for_job_links(self, page):
+        """Wait until the listing has rendered a job link instead of sleeping a fixed time"""
+        try:
+            await page.wait_for_selector(", ".join(f'a[href*="{keyword}"]' for keyword in JOB_URL_KEYWORDS), timeout=SCRAPER_READY_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            print(f"No job links after {SCRAPER_READY_TIMEOUT_MS} ms on {page.url}")
+
+    async def wait_for_job_content(self, page):
+        """Wait until the job description has rendered instead of sleeping a fixed time"""
+        try:
+            await page.wait_for_function(CONTENT_READY_SCRIPT, arg=CONTENT_SELECTORS, timeout=SCRAPER_READY_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            print(f"Content not ready after {SCRAPER_READY_TIMEOUT_MS} ms on {page.url}, extracting what is there")
 
     async def setup_folder(self):
         """Create jd_folder if it doesn't exist"""
@@ -27,116 +256,108 @@ class CalfusJobScraper:
         sanitized = sanitized.replace("Current_Job_Openings_", "")
         return sanitized
 
+    def load_state(self):
+        if not os.path.exists(SCRAPER_STATE_PATH):
+            return {}
+        try:
+            with open(SCRAPER_STATE_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable scraper state {SCRAPER_STATE_PATH}: {e}")
+            return {}
+
+    def save_json_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def job_content_hash(job_data):
+        """Hash of everything that goes into the JD record"""
+        payload = json.dumps([job_data["title"], job_data["location"], job_data["content"]], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def record_job(self, job_data, now):
+        """
+        Update the state entry for a scraped posting
+        - returns "new", "changed" (content differs, was closed, or its DOCX is missing) or "unchanged"
+        """
+        filename = f"{self.sanitize_filename(job_data['title'])}.json"
+        content_hash = self.job_content_hash(job_data)
+        entry = self.state.get(job_data["url"])
+
+        if entry is None:
+            change = "new"
+            entry = {"first_seen": now}
+        elif entry.get("content_sha256") != content_hash or entry.get("status") != "open" or entry.get("file") != filename or not (self.jd_folder / filename).exists():
+            change = "changed"
+        else:
+            change = "unchanged"
+
+        entry.update(title=job_data["title"], location=job_data["location"], file=filename, content_sha256=content_hash, status="open", last_seen=now)
+        entry.pop("closed_at", None)
+        if change != "unchanged":
+            entry["last_changed"] = now
+        self.state[job_data["url"]] = entry
+        return change
+
+    def close_missing_postings(self, listed_urls, now):
+        """Mark postings no longer on the listing page as closed and move their record (and DOCX) to jd_folder/closed/"""
+        closed = []
+        open_files = {entry["file"] for url, entry in self.state.items() if url in listed_urls}
+        for url, entry in self.state.items():
+            if url in listed_urls or entry.get("status") != "open":
+                continue
+            entry.update(status="closed", closed_at=now)
+            if entry["file"] not in open_files:
+                for path in [self.jd_folder / entry["file"], (self.jd_folder / entry["file"]).with_suffix(".docx")]:
+                    if path.exists():
+                        (self.jd_folder / "closed").mkdir(exist_ok=True)
+                        os.replace(path, self.jd_folder / "closed" / path.name)
+            closed.append({"url": url, "title": entry["title"], "file": entry["file"]})
+            print(f"Closed posting: {entry['title']} ({url})")
+        return closed
+
     def clean_job_content(self, content):
         """Clean and filter job content to remove unwanted sections"""
         if not content:
             return ""
 
-        lines = content.split("\n")
         cleaned_lines = []
         skip_current_section = False
 
-        # Keywords that indicate sections to skip
-        skip_section_keywords = [
-            "about us",
-            "about the company",
-            "company overview",
-            "who we are",
-            "our company",
-            "company profile",
-            "organization overview",
-            "apply now",
-            "how to apply",
-            "application process",
-            "source url",
-            "scraped date",
-            "contact us",
-            "get in touch",
-            "follow us",
-            "social media",
-            "connect with us",
-            "navigation",
-            "menu",
-            "home",
-            "careers",
-            "lets connect",
-            "join us",
-            "our work",
-            "agent foundry",
-            "benefits and perks",
-        ]
-
-        # Patterns that indicate metadata or unwanted content
-        skip_patterns = [r"^\*\*Source URL:\s*\*\*", r"^\*\*Scraped Date:\s*\*\*", r"^https?://", r"^\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}", r"^Apply Now\s*$", r"^Back\s*$", r"^Home\s*$", r"^Menu\s*$", r"^Navigation\s*$"]
-
-        for line in lines:
+        for line in content.split("\n"):
             line = line.strip()
 
-            # Skip empty lines initially, we'll add them back strategically
+            # Keep at most one empty line between kept lines (never a leading one)
             if not line:
-                if cleaned_lines and cleaned_lines[-1]:  # Only add empty line if previous line wasn't empty
+                if cleaned_lines and cleaned_lines[-1]:
                     cleaned_lines.append("")
                 continue
 
-            # Check if line matches skip patterns
-            should_skip_line = False
-            for pattern in skip_patterns:
-                if re.match(pattern, line, re.IGNORECASE):
-                    should_skip_line = True
-                    break
-
-            if should_skip_line:
+            # Metadata and navigation lines
+            if SKIP_LINE_REGEX.match(line):
                 continue
 
-            # Check if this line starts a section we want to skip
             line_lower = line.lower()
 
-            # Reset skip flag for new sections
-            if line.endswith(":") or re.match(r"^[A-Z][^a-z]*:?$", line):
-                skip_current_section = any(keyword in line_lower for keyword in skip_section_keywords)
-
-            # Skip if we're in a section to skip
+            # A header starts a new section, skipped up to the next header if it names an unwanted one
+            if line.endswith(":") or SECTION_HEADER_REGEX.match(line):
+                skip_current_section = SKIP_SECTION_KEYWORD_REGEX.search(line_lower) is not None
             if skip_current_section:
-                # Check if we've moved to a new section that we want to keep
-                if line.endswith(":") and not any(keyword in line_lower for keyword in skip_section_keywords):
-                    skip_current_section = False
-                    cleaned_lines.append(line)
-                continue
-
-            # Skip lines that are just navigation or metadata
-            if any(keyword == line_lower for keyword in skip_section_keywords):
-                continue
-
-            # Skip very short lines that are likely navigation
-            if len(line) <= 2 and line.isalpha():
                 continue
 
-            # Skip lines that are just dates or URLs
-            if re.match(r"^\d{4}-\d{2}-\d{2}", line) or line.startswith("http"):
+            # Lines that are just a navigation keyword, very short words, dates or URLs
+            if line_lower in SKIP_SECTION_KEYWORD_SET or (len(line) <= 2 and line.isalpha()) or DATE_PREFIX_REGEX.match(line) or line.startswith("http"):
                 continue
 
             cleaned_lines.append(line)
 
-        # Remove multiple consecutive empty lines
-        final_lines = []
-        prev_empty = False
-
-        for line in cleaned_lines:
-            if not line.strip():
-                if not prev_empty:
-                    final_lines.append(line)
-                prev_empty = True
-            else:
-                final_lines.append(line)
-                prev_empty = False
-
-        # Remove leading and trailing empty lines
-        while final_lines and not final_lines[0].strip():
-            final_lines.pop(0)
-        while final_lines and not final_lines[-1].strip():
-            final_lines.pop()
-
-        return "\n".join(final_lines)
+        if cleaned_lines and not cleaned_lines[-1]:
+            cleaned_lines.pop()
+        return "\n".join(cleaned_lines)
 
     async def scrape_job_listings(self, page):
         """Scrape all job listings from the main page"""
@@ -147,7 +368,7 @@ class CalfusJobScraper:
             try:
                 print(f"Attempting to load job openings page (attempt {attempt + 1}/{max_retries})")
                 await page.goto(self.job_openings_url, wait_until="networkidle", timeout=60000)
-                await page.wait_for_timeout(5000)  # Increased wait time
+                await self.wait_for_job_links(page)
                 print("Successfully loaded job openings page")
                 break
             except Exception as e:
@@ -162,163 +383,17 @@ class CalfusJobScraper:
 
         # Check if page has loaded properly and scroll to load any lazy content
         await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(3000)
+        await page.wait_for_load_state("networkidle")
         await page.evaluate("window.scrollTo(0, 0)")
-        await page.wait_for_timeout(2000)
 
-        jobs = []
-
-        # Try multiple approaches to find job listings
+        # One round trip: every job link on the page plus the text of its ancestors
         print("Analyzing page structure...")
-
-        # Method 1: Look for "See Details" text in various elements
-        see_details_selectors = [
-            'a:has-text("See Details")',
-            'button:has-text("See Details")',
-            'a:has-text("see details")',
-            'button:has-text("see details")',
-            'a[href*="job"]',
-            'a[href*="opening"]',
-            'a[href*="position"]',
-            '*:has-text("See Details")',
-            '*:has-text("see details")',
-            '*:has-text("Apply")',
-            '*:has-text("View")',
-        ]
-
-        all_job_elements = []
-        for selector in see_details_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                print(f"Selector '{selector}' found {len(elements)} elements")
-                for element in elements:
-                    if element not in all_job_elements:
-                        all_job_elements.append(element)
-            except Exception as e:
-                print(f"Error with selector '{selector}': {e}")
-                continue
-
-        print(f"Total unique job-related elements found: {len(all_job_elements)}")
-
-        # Method 2: Look for job containers by structure
-        print("Looking for job containers by structure...")
-        job_containers = await page.query_selector_all("div, section, article")
-        potential_job_containers = []
-
-        for container in job_containers:
-            try:
-                container_text = await container.inner_text()
-                container_text_lower = container_text.lower()
-
-                # Check if container has job-like content
-                job_indicators = ["see details", "apply now", "view job", "job opening", "position", "bengaluru", "pune", "mumbai", "hyderabad", "years of experience", "experience", "skills required"]
-
-                if any(indicator in container_text_lower for indicator in job_indicators):
-                    # Check if it's not a navigation or header element
-                    if not any(nav in container_text_lower for nav in ["navigation", "menu", "header", "footer"]) and len(container_text.strip()) > 50:
-                        potential_job_containers.append(container)
-            except Exception:
-                continue
-
-        print(f"Found {len(potential_job_containers)} potential job containers")
-
-        # Process all found elements
-        processed_urls = set()  # To avoid duplicates
-
-        for i, element in enumerate(all_job_elements + potential_job_containers):
-            try:
-                job_title = ""
-                location = ""
-                job_url = ""
-
-                # Try to get URL from the element itself or find a link within it
-                if await element.evaluate("el => el.tagName.toLowerCase()") == "a":
-                    job_url = await element.get_attribute("href") or ""
-                else:
-                    # Look for links within the element
-                    link_element = await element.query_selector("a[href]")
-                    if link_element:
-                        job_url = await link_element.get_attribute("href") or ""
-
-                # Skip if no URL found or if it's a duplicate
-                if not job_url or job_url in processed_urls:
-                    continue
-
-                # Make URL absolute
-                if job_url.startswith("/"):
-                    job_url = self.base_url + job_url
-
-                # Skip if it doesn't look like a job URL
-                if not any(keyword in job_url.lower() for keyword in ["job", "opening", "position", "career"]):
-                    continue
-
-                processed_urls.add(job_url)
-
-                # Find job title and location by traversing up the DOM
-                current_element = element
-                for _ in range(10):  # Try up to 10 parent levels
-                    try:
-                        element_text = await current_element.inner_text()
-                        lines = [line.strip() for line in element_text.split("\n") if line.strip()]
-
-                        # Look for job title (usually the first meaningful line)
-                        for line in lines:
-                            if len(line) > 5 and len(line) < 100 and not line.lower() in ["see details", "apply now", "view job"] and not any(keyword in line.lower() for keyword in ["current job openings", "calfus", "navigation", "menu"]):
-                                if not job_title:
-                                    job_title = line
-                                    break
-
-                        # Look for location
-                        for line in lines:
-                            line_lower = line.lower()
-                            if "bengaluru" in line_lower or "bangalore" in line_lower:
-                                location = "Bengaluru"
-                                break
-                            elif "pune" in line_lower:
-                                location = "Pune"
-                                break
-                            elif "mumbai" in line_lower:
-                                location = "Mumbai"
-                                break
-                            elif "hyderabad" in line_lower:
-                                location = "Hyderabad"
-                                break
-
-                        if job_title and location:
-                            break
-
-                        # Move to parent element
-                        parent = await current_element.query_selector("..")
-                        if parent:
-                            current_element = parent
-                        else:
-                            break
-                    except Exception:
-                        break
-
-                # If still no title found, use a fallback
-                if not job_title:
-                    job_title = f"Job_Position_{len(jobs) + 1}"
-
-                if not location:
-                    location = "Location_TBD"
-
-                jobs.append({"title": job_title, "location": location, "url": job_url})
-                print(f"Found job {len(jobs)}: {job_title} in {location}")
-
-            except Exception as e:
-                print(f"Error processing element {i}: {e}")
-                continue
-
-        # Remove duplicates based on URL
-        seen_urls = set()
-        unique_jobs = []
-        for job in jobs:
-            if job["url"] not in seen_urls:
-                seen_urls.add(job["url"])
-                unique_jobs.append(job)
-
-        print(f"Final count: {len(unique_jobs)} unique jobs found")
+        started = time.perf_counter()
+        listing = await page.evaluate(JOB_LISTING_SCRIPT, JOB_LISTING_SCRIPT_ARGS)
+        unique_jobs = jobs_from_listing(listing)
+        for number, job in enumerate(unique_jobs, 1):
+            print(f"Found job {number}: {job['title']} in {job['location']}")
+        print(f"Final count: {len(unique_jobs)} unique jobs found ({(time.perf_counter() - started) * 1000:.0f} ms)")
 
         # If still no jobs found, take a screenshot for debugging
         if not unique_jobs:
@@ -339,8 +414,9 @@ class CalfusJobScraper:
         for attempt in range(max_retries):
             try:
                 print(f"Scraping details for: {job['title']} (attempt {attempt + 1}/{max_retries})")
-                await page.goto(job["url"], wait_until="networkidle", timeout=60000)
-                await page.wait_for_timeout(3000)
+                await self.polite_wait()
+                await page.goto(job["url"], wait_until="domcontentloaded", timeout=60000)
+                await self.wait_for_job_content(page)
                 break
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed for {job['title']}: {e}")
@@ -364,10 +440,8 @@ class CalfusJobScraper:
             page_title = await page.title()
 
             # Try to get the main content
-            content_selectors = ["main", ".main-content", ".content", ".job-description", ".job-details", "article", ".container"]
-
             job_content = ""
-            for selector in content_selectors:
+            for selector in CONTENT_SELECTORS:
                 element = await page.query_selector(selector)
                 if element:
                     content = await element.inner_text()
@@ -389,6 +463,19 @@ class CalfusJobScraper:
             print(f"Error scraping job details for {job['title']}: {e}")
             return {"title": job["title"], "location": job["location"], "url": job["url"], "page_title": "Error", "content": f"Error scraping job: {str(e)}", "scraped_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
+    def save_job_record(self, job_data):
+        """Save the cleaned job description as a JSON record, the input of JD conversion"""
+        try:
+            filepath = self.jd_folder / f"{self.sanitize_filename(job_data['title'])}.json"
+            record = {key: job_data[key] for key in ["title", "location", "url", "page_title", "content", "scraped_date"]}
+            self.save_json_atomic(str(filepath), record)
+            print(f"Saved: {filepath}")
+            return True
+
+        except Exception as e:
+            print(f"Error saving record for {job_data['title']}: {e}")
+            return False
+
     def save_job_as_docx(self, job_data):
         """Save job description as Word document"""
         try:
@@ -427,23 +514,77 @@ class CalfusJobScraper:
                 if current_paragraph:
                     doc.add_paragraph(current_paragraph)
 
-            # Save the document
+            # Save the document next to the JSON record (same name, .docx)
             filename = f"{self.sanitize_filename(job_data['title'])}.docx"
             filepath = self.jd_folder / filename
 
             doc.save(str(filepath))
             print(f"Saved: {filepath}")
+            return True
 
         except Exception as e:
             print(f"Error saving document for {job_data['title']}: {e}")
+            return False
+
+    def save_job(self, job_data):
+        """Write the JSON record and, with export_docx, the DOCX; returns True if every write succeeded"""
+        return self.save_job_record(job_data) and (not self.export_docx or self.save_job_as_docx(job_data))
+
+    async def scrape_jobs_concurrently(self, context, jobs, report):
+        """
+        Scrape job detail pages on a pool of self.concurrency browser pages
+        Each posting is recorded in self.state as soon as it is scraped; its record (and optional DOCX) is written only
+        when new or changed.
+        Postings are appended to report["new"|"changed"|"unchanged"|"failed"].
+        """
+        pages = asyncio.Queue()
+        for _ in range(min(self.concurrency, len(jobs))):
+            pages.put_nowait(await context.new_page())
+
+        async def scrape_one(index, job):
+            page = await pages.get()
+            try:
+                print(f"\nProcessing job {index}/{len(jobs)}")
+                job_data = await self.scrape_job_details(page, job)
+            finally:
+                pages.put_nowait(page)
+
+            entry = {"url": job["url"], "title": job_data["title"]}
+            # Only save if we got meaningful content
+            if not job_data["content"] or len(job_data["content"].strip()) <= 50 or job_data["page_title"].startswith("Error"):
+                print(f"Warning: No meaningful content found for {job['title']}")
+                report["failed"].append(entry)
+                return
+
+            change = self.record_job(job_data, report["run_at"])
+            entry["file"] = self.state[job["url"]]["file"]
+            if change != "unchanged" and not self.save_job(job_data):
+                self.state[job["url"]]["content_sha256"] = None  # Retry the write next run
+                report["failed"].append(entry)
+                return
+            if change == "unchanged":
+                print(f"Unchanged: {job_data['title']}")
+            report[change].append(entry)
+
+        try:
+            await asyncio.gather(*(scrape_one(index, job) for index, job in enumerate(jobs, 1)))
+        finally:
+            while not pages.empty():
+                await pages.get_nowait().close()
 
     async def run(self):
-        """Main scraping function"""
+        """
+        Main scraping function
+        - returns the change report (also written to SCRAPER_CHANGE_REPORT_PATH): lists of new, changed, unchanged,
+          closed and failed postings ({url, title, file}); "completed" is False if the listing could not be scraped
+        """
         await self.setup_folder()
+        self.state = self.load_state()
+        report = {"run_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "completed": False, "new": [], "changed": [], "unchanged": [], "closed": [], "failed": []}
 
         async with async_playwright() as p:
             # Launch browser with additional options
-            browser = await p.chromium.launch(headless=False, args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-web-security", "--disable-features=VizDisplayCompositor"])
+            browser = await p.chromium.launch(headless=self.headless, args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-web-security", "--disable-features=VizDisplayCompositor"])
             context = await browser.new_context(
                 user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 viewport={"width": 1920, "height": 1080},
@@ -456,6 +597,7 @@ class CalfusJobScraper:
                     "Upgrade-Insecure-Requests": "1",
                 },
             )
+            await self.configure_context(context)
             page = await context.new_page()
 
             try:
@@ -468,7 +610,7 @@ class CalfusJobScraper:
                 except Exception as e:
                     print(f"Failed to connect to main site: {e}")
                     print("This might be a network connectivity issue or the site might be down.")
-                    return
+                    return report
 
                 # Scrape job listings
                 print("\nScraping job listings...")
@@ -478,27 +620,21 @@ class CalfusJobScraper:
                     print("No jobs found. Taking screenshot for debugging...")
                     await page.screenshot(path="debug_page.png")
                     print("Please check debug_page.png to see what the page looks like")
-                    return
+                    return report
 
                 print(f"Found {len(jobs)} jobs to scrape")
 
-                # Scrape each job's details
-                successful_scrapes = 0
-                for i, job in enumerate(jobs, 1):
-                    print(f"\nProcessing job {i}/{len(jobs)}")
-                    job_data = await self.scrape_job_details(page, job)
+                # Scrape each job's details, self.concurrency pages at a time
+                started = time.perf_counter()
+                await self.scrape_jobs_concurrently(context, jobs, report)
+                print(f"Scraped job details in {time.perf_counter() - started:.1f}s with concurrency {self.concurrency}")
 
-                    # Only save if we got meaningful content
-                    if job_data["content"] and len(job_data["content"].strip()) > 50:
-                        self.save_job_as_docx(job_data)
-                        successful_scrapes += 1
-                    else:
-                        print(f"Warning: No meaningful content found for {job['title']}")
-
-                    # Add delay between requests
-                    await asyncio.sleep(3)
+                report["closed"] = self.close_missing_postings({job["url"] for job in jobs}, report["run_at"])
+                report["completed"] = True
 
-                print(f"\nCompleted! Successfully scraped {successful_scrapes} out of {len(jobs)} job descriptions to {self.jd_folder}")
+                print(f"\nCompleted! {len(report['new'])} new, {len(report['changed'])} changed, {len(report['unchanged'])} unchanged, " f"{len(report['closed'])} closed, {len(report['failed'])} failed out of {len(jobs)} postings in {self.jd_folder}")
+                if self.block_resources:
+                    print(f"Blocked {self.blocked_requests} non-essential requests")
 
             except Exception as e:
                 print(f"Error during scraping: {e}")
@@ -508,6 +644,11 @@ class CalfusJobScraper:
 
             finally:
                 await browser.close()
+                # State is saved even after an error: it records which files were written
+                self.save_json_atomic(SCRAPER_STATE_PATH, self.state)
+                self.save_json_atomic(SCRAPER_CHANGE_REPORT_PATH, report)
+
+        return report
 
 
 async def main():
@@ -1,10 +1,7 @@
 import json
 import os
 import time
-from pathlib import Path
 
-import mammoth
-import pymupdf
 import requests
 import streamlit as st
 from dotenv import load_dotenv
@@ -16,36 +13,80 @@ st.set_page_config(layout="wide", page_title="ATS AI")
 st.title("ATS AI : Intelligent Resume Screening")
 
 
-def extract_text_from_uploaded_file(uploaded_file):
-    file_extension = Path(uploaded_file.name).suffix.lower()
-
-    if file_extension == ".pdf":
-        resume_pdf_reader = pymupdf.open(stream=uploaded_file.getvalue(), filetype="pdf")
-        resume_text = ""
-        for i in range(resume_pdf_reader.page_count):
-            page = resume_pdf_reader.load_page(i)
-            resume_text += page.get_text()
-        return resume_text
-
-    elif file_extension in [".doc", ".docx"]:
-        try:
-            result = mammoth.extract_raw_text(uploaded_file)
-            return result.value
-        except Exception as e:
-            st.error(f"Error reading {file_extension} file: {str(e)}")
-            return None
-
-    else:
-        st.error(f"Unsupported file format: {file_extension}")
-        return None
-
-
 def validate_weightage_sum(exp, skills, edu, projects):
     """Validate that weightages sum to 100"""
     total = exp + skills + edu + projects
     return total, abs(total - 100) <= 1  # Allow 1% tolerance
 
 
+def get_json_with_etag(path):
+    """GET a backend JSON resource, revalidating the copy cached in the session with If-None-Match"""
+    cached = st.session_state.etag_cache.get(path)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = requests.get(f"{BACKEND_URL}{path}", headers=headers)
+    if response.status_code == 304 and cached:
+        return cached[1]
+    response.raise_for_status()
+    data = response.json()
+    if response.headers.get("ETag"):
+        st.session_state.etag_cache[path] = (response.headers["ETag"], data)
+    return data
+
+
+def render_partial_evaluation(placeholder, partial):
+    """Live preview of the sections received so far from /parse_and_evaluate_stream"""
+    evaluation = partial.get("Evaluation", {})
+    parsed_resume = partial.get("Parsed_Resume", {})
+    with placeholder.container():
+        if parsed_resume.get("Name"):
+            st.subheader(f"👤 {parsed_resume['Name']}")
+        score_fields = [("Experience", "Experience_Score"), ("Skills", "Skills_Score"), ("Education", "Education_Score"), ("Projects", "Projects_Score"), ("Match with JD", "Match_Percentage")]
+        received_scores = [(label, evaluation[key]) for label, key in score_fields if key in evaluation]
+        if received_scores:
+            for col, (label, value) in zip(st.columns(len(score_fields)), received_scores):
+                col.metric(label=label, value=value)
+        if evaluation.get("Summary"):
+            st.markdown(f"**Summary:** {evaluation['Summary']}")
+        for key in ["Pros", "Cons"]:
+            if evaluation.get(key):
+                st.markdown(f"**{key}:** " + "; ".join(str(item) for item in evaluation[key]))
+        received_sections = [key.replace("_", " ") for key in parsed_resume if key != "Name"]
+        if received_sections:
+            st.caption("Parsed so far: " + ", ".join(received_sections))
+
+
+def stream_parse_and_evaluate(combined_json):
+    """Call /parse_and_evaluate_stream, rendering sections as they arrive; returns the final evaluation or None"""
+    status_placeholder = st.empty()
+    preview_placeholder = st.empty()
+    partial = {}
+    event_name = None
+    with requests.post(f"{BACKEND_URL}/parse_and_evaluate_stream", json=combined_json, stream=True, timeout=(10, 300)) as response:
+        if response.status_code != 200:
+            st.error(f"Evaluation failed: {response.status_code} - {response.text}")
+            return None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event_name = line.removeprefix("event:").strip()
+            elif line.startswith("data:"):
+                data = json.loads(line.removeprefix("data:"))
+                if event_name == "progress":
+                    status_placeholder.caption(f"⏳ {data['message']}...")
+                elif event_name == "field":
+                    partial.setdefault(data["section"], {})[data["key"]] = data["value"]
+                    render_partial_evaluation(preview_placeholder, partial)
+                elif event_name == "result":
+                    status_placeholder.empty()
+                    preview_placeholder.empty()
+                    return data
+                elif event_name == "error":
+                    status_placeholder.empty()
+                    st.error(f"Evaluation failed: {data['message']}")
+                    return None
+    st.error("Evaluation stream ended without a result")
+    return None
+
+
 # Initialize all session state variables
 if "parsed_data_combined" not in st.session_state:
     st.session_state.parsed_data_combined = None
@@ -53,6 +94,10 @@ if "decision_made" not in st.session_state:
     st.session_state.decision_made = None
 if "uploaded_resume_name" not in st.session_state:
     st.session_state.uploaded_resume_name = None
+if "resume_id" not in st.session_state:
+    st.session_state.resume_id = None  # From /upload_resume_file, stored with the decision
+if "near_duplicates" not in st.session_state:
+    st.session_state.near_duplicates = []  # Previously uploaded resumes of the same candidate, from /upload_resume_file
 
 if "report_evaluation_results" not in st.session_state:
     st.session_state.report_evaluation_results = None
@@ -80,6 +125,10 @@ if "weightage_config" not in st.session_state:
     st.session_state.weightage_config = {"experience_weight": 30, "skills_weight": 40, "education_weight": 10, "projects_weight": 20}  # Store as percentages for UI
 if "show_weightage_config" not in st.session_state:
     st.session_state.show_weightage_config = False
+if "evaluated_weightage" not in st.session_state:
+    st.session_state.evaluated_weightage = None
+if "etag_cache" not in st.session_state:
+    st.session_state.etag_cache = {}  # backend path -> (ETag, JSON) for /list_jds and /jds/{name}
 
 uploaded_resume = st.file_uploader("Upload resume file (PDF, DOC, DOCX)", type=["pdf", "doc", "docx"], help="Supported formats: PDF, DOC, DOCX")
 
@@ -148,6 +197,23 @@ else:
     # Show current default weightage
     st.info("Using Default Weightage: Experience: 30%, Skills: 40%, Projects: 20%, Education: 10%")
 
+# Weightage changed after an evaluation: re-score locally on the backend instead of re-running the LLM
+if st.session_state.parsed_data_combined and st.session_state.evaluated_weightage and st.session_state.evaluated_weightage != st.session_state.weightage_config:
+    current_weightage = st.session_state.weightage_config
+    _, weightage_is_valid = validate_weightage_sum(current_weightage["experience_weight"], current_weightage["skills_weight"], current_weightage["education_weight"], current_weightage["projects_weight"])
+    if weightage_is_valid:
+        try:
+            rescore_payload = {"evaluation": st.session_state.parsed_data_combined, "weightage_config": {key: value / 100 for key, value in current_weightage.items()}}
+            rescore_response = requests.post(f"{BACKEND_URL}/rescore", json=rescore_payload)
+            if rescore_response.status_code == 200:
+                st.session_state.parsed_data_combined = rescore_response.json()
+                st.session_state.evaluated_weightage = dict(current_weightage)
+                st.session_state.report_evaluation_results = None
+            else:
+                st.error(f"Re-scoring failed: {rescore_response.status_code} - {rescore_response.text}")
+        except Exception as e:
+            st.error(f"An error occurred while re-scoring: {e}")
+
 st.markdown("---")
 
 # JD Selection Section with Tabs
@@ -162,133 +228,104 @@ with tab1:
     st.info("Select from previously saved Job Descriptions")
 
     try:
-        response = requests.get(f"{BACKEND_URL}/list_jds")
-        if response.status_code == 200:
-            existing_jds_response = response.json()
-            existing_jds = existing_jds_response.get("jds", [])
-            jd_options = ["Select a pre-existing JD"] + existing_jds
-            selected_jd_display = st.selectbox("Choose a Job Description:", options=jd_options, index=0, key="jd_dropdown")
-
-            if selected_jd_display != "Select a pre-existing JD":
-                # NEW: Check if JD selection has changed
-                if st.session_state.get("current_selected_jd") != selected_jd_display:
-                    st.session_state.current_selected_jd = selected_jd_display
-                    # Reset evaluation state when JD changes
+        existing_jds = get_json_with_etag("/list_jds").get("jds", [])
+        jd_options = ["Select a pre-existing JD"] + existing_jds
+        selected_jd_display = st.selectbox("Choose a Job Description:", options=jd_options, index=0, key="jd_dropdown")
+
+        if selected_jd_display != "Select a pre-existing JD":
+            # NEW: Check if JD selection has changed
+            if st.session_state.get("current_selected_jd") != selected_jd_display:
+                st.session_state.current_selected_jd = selected_jd_display
+                # Reset evaluation state when JD changes
+                st.session_state.parsed_data_combined = None
+                st.session_state.decision_made = None
+                st.session_state.report_evaluation_results = None
+                st.session_state.report_parsed_resume = None
+                st.session_state.report_cand_name = None
+
+            # Load the selected JD from the backend (revalidated by ETag, so reruns don't re-download it)
+            try:
+                jd_content = get_json_with_etag(f"/jds/{requests.utils.quote(selected_jd_display)}")
+                jd_source = f"Selected JD: {selected_jd_display}"
+            except requests.HTTPError:
+                st.warning(f"JD not found: {selected_jd_display}")
+            except Exception as e:
+                st.error(f"Error loading selected JD: {str(e)}")
+
+            # Add the main evaluate button here inside tab1
+            if st.session_state.uploaded_resume_name:
+                st.markdown("---")
+                # Show re-evaluation message if already evaluated
+                if st.session_state.parsed_data_combined is not None:
+                    st.info("🔄 Click to re-evaluate with the current JD selection")
+
+                if st.button("🚀 Evaluate", key="main_evaluate_btn"):
+                    # Reset previous results before new evaluation
                     st.session_state.parsed_data_combined = None
                     st.session_state.decision_made = None
                     st.session_state.report_evaluation_results = None
                     st.session_state.report_parsed_resume = None
                     st.session_state.report_cand_name = None
 
-                # Load the selected JD file
-                try:
-                    jd_filename = f"{selected_jd_display}.json"
-                    jd_path = os.path.join("jd_json", jd_filename)
-                    if os.path.exists(jd_path):
-                        with open(jd_path, "r") as f:
-                            jd_content = json.load(f)
-                        jd_source = f"Selected JD: {selected_jd_display}"
-                    else:
-                        st.warning(f"JD file not found locally: {jd_filename}")
-                except Exception as e:
-                    st.error(f"Error loading selected JD: {str(e)}")
-
-                # Add the main evaluate button here inside tab1
-                if selected_jd_display != "Select a pre-existing JD":
-                    # NEW: Check if JD selection has changed
-                    if st.session_state.get("current_selected_jd") != selected_jd_display:
-                        st.session_state.current_selected_jd = selected_jd_display
-                        # Reset evaluation state when JD changes
-                        st.session_state.parsed_data_combined = None
-                        st.session_state.decision_made = None
-                        st.session_state.report_evaluation_results = None
-                        st.session_state.report_parsed_resume = None
-                        st.session_state.report_cand_name = None
-
-                    # Load the selected JD file
-                    jd_content = None  # Initialize jd_content
-                    try:
-                        jd_filename = f"{selected_jd_display}.json"
-                        jd_path = os.path.join("jd_json", jd_filename)
-                        if os.path.exists(jd_path):
-                            with open(jd_path, "r") as f:
-                                jd_content = json.load(f)
-                            jd_source = f"Selected JD: {selected_jd_display}"
-                        else:
-                            st.warning(f"JD file not found locally: {jd_filename}")
-                    except Exception as e:
-                        st.error(f"Error loading selected JD: {str(e)}")
-
-                    # Add the main evaluate button here inside tab1
-                    if selected_jd_display != "Select a pre-existing JD" and st.session_state.uploaded_resume_name:
-                        st.markdown("---")
-                        # Show re-evaluation message if already evaluated
-                        if st.session_state.parsed_data_combined is not None:
-                            st.info("🔄 Click to re-evaluate with the current JD selection")
+                    with st.spinner("Processing resume and evaluating..."):
+                        try:
+                            # Upload resume file; the backend extracts (and caches) its text
+                            files = {"resume_file": (uploaded_resume.name, uploaded_resume.getvalue(), uploaded_resume.type)}
+                            upload_response = requests.post(f"{BACKEND_URL}/upload_resume_file", files=files)
 
-                        if st.button("🚀 Evaluate", key="main_evaluate_btn"):
-                            # Reset previous results before new evaluation
-                            st.session_state.parsed_data_combined = None
-                            st.session_state.decision_made = None
-                            st.session_state.report_evaluation_results = None
-                            st.session_state.report_parsed_resume = None
-                            st.session_state.report_cand_name = None
-
-                            with st.spinner("Processing resume and evaluating..."):
-                                try:
-                                    # Read resume text
-                                    resume_pdf_reader = pymupdf.open(stream=uploaded_resume.getvalue(), filetype="pdf")
-                                    resume_text = extract_text_from_uploaded_file(uploaded_resume)
-                                    if resume_text is None:
-                                        st.error("Failed to extract text from the uploaded file")
-                                        st.stop()
-
-                                    # Upload resume file
-                                    files = {"resume_file": (uploaded_resume.name, uploaded_resume.getvalue(), uploaded_resume.type)}
-                                    upload_response = requests.post(f"{BACKEND_URL}/upload_resume_file", files=files)
-
-                                    if upload_response.status_code != 200:
-                                        st.error(f"Failed to upload resume to backend: {upload_response.status_code} - {upload_response.text}")
+                            if upload_response.status_code != 200:
+                                st.error(f"Failed to upload resume to backend: {upload_response.status_code} - {upload_response.text}")
+                                st.session_state.parsed_data_combined = None
+                                st.session_state.decision_made = None
+                            else:
+                                resume_text = upload_response.json()["resume_text"]
+                                st.session_state.resume_id = upload_response.json()["resume_id"]
+                                st.session_state.near_duplicates = upload_response.json().get("near_duplicates", [])
+                                if jd_content:
+                                    # Prepare weightage config for API
+                                    weightage_api = {
+                                        "experience_weight": st.session_state.weightage_config["experience_weight"] / 100,
+                                        "skills_weight": st.session_state.weightage_config["skills_weight"] / 100,
+                                        "education_weight": st.session_state.weightage_config["education_weight"] / 100,
+                                        "projects_weight": st.session_state.weightage_config["projects_weight"] / 100,
+                                    }
+
+                                    # A stored evaluation of this candidate for this JD (from another agency's file) is reused instead of re-evaluated
+                                    combined_json = {
+                                        "resume_data": resume_text,
+                                        "resume_id": st.session_state.resume_id,
+                                        "jd_json": jd_content,
+                                        "jd_name": selected_jd_display,
+                                        "weightage_config": weightage_api,
+                                        "reuse_duplicates": True,
+                                    }
+                                    evaluation = stream_parse_and_evaluate(combined_json)
+
+                                    if evaluation is not None:
+                                        st.session_state.parsed_data_combined = evaluation
+                                        st.session_state.evaluated_weightage = dict(st.session_state.weightage_config)
+                                    else:
                                         st.session_state.parsed_data_combined = None
                                         st.session_state.decision_made = None
-                                    else:
-                                        if jd_content:
-                                            # Prepare weightage config for API
-                                            weightage_api = {
-                                                "experience_weight": st.session_state.weightage_config["experience_weight"] / 100,
-                                                "skills_weight": st.session_state.weightage_config["skills_weight"] / 100,
-                                                "education_weight": st.session_state.weightage_config["education_weight"] / 100,
-                                                "projects_weight": st.session_state.weightage_config["projects_weight"] / 100,
-                                            }
-
-                                            combined_json = {"resume_data": resume_text, "jd_json": jd_content, "weightage_config": weightage_api}
-                                            response = requests.post(f"{BACKEND_URL}/parse_and_evaluate", json=combined_json)
-
-                                            if response.status_code == 200:
-                                                st.session_state.parsed_data_combined = response.json()
-                                            else:
-                                                st.error(f"Evaluation failed: {response.status_code} - {response.text}")
-                                                st.session_state.parsed_data_combined = None
-                                                st.session_state.decision_made = None
-                                        else:
-                                            st.error("Failed to process Job Description")
-                                except Exception as e:
-                                    st.error(f"An error occurred during evaluation: {e}")
-                                    st.session_state.parsed_data_combined = None
-                                    st.session_state.decision_made = None
-            else:
-                # Reset when no JD is selected
-                if st.session_state.get("current_selected_jd") is not None:
-                    st.session_state.current_selected_jd = None
-                    st.session_state.parsed_data_combined = None
-                    st.session_state.decision_made = None
-                    st.session_state.report_evaluation_results = None
-                    st.session_state.report_parsed_resume = None
-                    st.session_state.report_cand_name = None
+                                else:
+                                    st.error("Failed to process Job Description")
+                        except Exception as e:
+                            st.error(f"An error occurred during evaluation: {e}")
+                            st.session_state.parsed_data_combined = None
+                            st.session_state.decision_made = None
         else:
-            st.error("Failed to load existing JDs from backend")
-            existing_jds = []
-            selected_jd_display = "Select a pre-existing JD"
+            # Reset when no JD is selected
+            if st.session_state.get("current_selected_jd") is not None:
+                st.session_state.current_selected_jd = None
+                st.session_state.parsed_data_combined = None
+                st.session_state.decision_made = None
+                st.session_state.report_evaluation_results = None
+                st.session_state.report_parsed_resume = None
+                st.session_state.report_cand_name = None
+    except requests.HTTPError:
+        st.error("Failed to load existing JDs from backend")
+        existing_jds = []
+        selected_jd_display = "Select a pre-existing JD"
     except Exception as e:
         st.error(f"Error connecting to backend: {str(e)}")
         existing_jds = []
@@ -375,20 +412,16 @@ with tab2:
 
                 with st.spinner("🔄 Processing resume with temporary JD..."):
                     try:
-                        # Read resume text
-                        resume_pdf_reader = pymupdf.open(stream=uploaded_resume.getvalue(), filetype="pdf")
-                        resume_text = extract_text_from_uploaded_file(uploaded_resume)
-                        if resume_text is None:
-                            st.error("Failed to extract text from the uploaded file")
-                            st.stop()
-
-                        # Upload resume file
+                        # Upload resume file; the backend extracts (and caches) its text
                         files = {"resume_file": (uploaded_resume.name, uploaded_resume.getvalue(), uploaded_resume.type)}
                         upload_response = requests.post(f"{BACKEND_URL}/upload_resume_file", files=files)
 
                         if upload_response.status_code != 200:
                             st.error(f"Failed to upload resume to backend: {upload_response.status_code} - {upload_response.text}")
                         else:
+                            resume_text = upload_response.json()["resume_text"]
+                            st.session_state.resume_id = upload_response.json()["resume_id"]
+                            st.session_state.near_duplicates = upload_response.json().get("near_duplicates", [])
                             # Parse JD text temporarily WITHOUT saving to backend
                             # Parse JD text temporarily WITHOUT saving to backend
                             temp_parse_response = requests.post(f"{BACKEND_URL}/parse_jd_temp/", json={"jd_text": jd_text_input})
@@ -407,15 +440,14 @@ with tab2:
 
                                 # Evaluate with temporary JD using the parsed content directly
                                 combined_json = {"resume_data": resume_text, "jd_json": temp_jd_content, "weightage_config": weightage_api}
-                                response = requests.post(f"{BACKEND_URL}/parse_and_evaluate", json=combined_json)
+                                evaluation = stream_parse_and_evaluate(combined_json)
 
-                                if response.status_code == 200:
-                                    st.session_state.parsed_data_combined = response.json()
+                                if evaluation is not None:
+                                    st.session_state.parsed_data_combined = evaluation
+                                    st.session_state.evaluated_weightage = dict(st.session_state.weightage_config)
                                     st.success("✅ Temporary evaluation complete! (JD not saved)")
                                     # Set source for display
                                     jd_source = f"Temporary JD: {jd_name_input or 'Unnamed JD'}"
-                                else:
-                                    st.error(f"Evaluation failed: {response.status_code} - {response.text}")
                             else:
                                 st.error("Failed to parse JD text for temporary evaluation")
 
@@ -455,6 +487,17 @@ if st.session_state.parsed_data_combined:
     candidate_name = parsed_resume_data.get("Name", "Candidate")
     st.header(f"📊 Evaluation Report for: {candidate_name}")
 
+    reused_evaluation = st.session_state.parsed_data_combined.get("Reused_Evaluation")
+    if reused_evaluation:
+        st.info(f"♻️ Reused the stored evaluation of a near-duplicate resume ({', '.join(reused_evaluation['reasons'])}) instead of re-evaluating")
+    elif st.session_state.near_duplicates:
+        duplicate_reasons = sorted({reason for near_duplicate in st.session_state.near_duplicates for reason in near_duplicate["reasons"]})
+        evaluated_jds = sorted({evaluation["jd_name"] for near_duplicate in st.session_state.near_duplicates for evaluation in near_duplicate["evaluations"]})
+        confirmed_count = sum(1 for near_duplicate in st.session_state.near_duplicates if near_duplicate.get("confirmed"))
+        possible_count = len(st.session_state.near_duplicates) - confirmed_count
+        duplicate_counts = ([f"{confirmed_count} other file(s)"] if confirmed_count else []) + ([f"possibly {possible_count} other file(s) sharing only an email/phone"] if possible_count else [])
+        st.warning(f"⚠️ This candidate was uploaded before in {' and '.join(duplicate_counts)} ({', '.join(duplicate_reasons)})" + (f"; evaluated for: {', '.join(evaluated_jds)}" if evaluated_jds else ""))
+
     # SCOREBOARD SECTION - DISPLAYED FIRST
     st.markdown("---")
     st.subheader("🏆 Overall Performance")
@@ -916,8 +959,16 @@ if st.session_state.parsed_data_combined:
     st.markdown("---")
     st.subheader("🎯 Decision Actions")
 
-    combine_eval_results = eval_results
-    combine_eval_results["name"] = candidate_name
+    # Stored with the full evaluation, against the selected (or temporary) JD
+    decision_jd_name = st.session_state.get("current_selected_jd") or st.session_state.get("current_jd_name") or ""
+    decision_contact = parsed_resume_data.get("Contact_Details")
+    cand_decision = {
+        "name": candidate_name,
+        "contact": decision_contact if isinstance(decision_contact, dict) else None,
+        "evaluation_results": st.session_state.parsed_data_combined,
+        "jd_name": decision_jd_name,
+        "resume_id": st.session_state.resume_id,
+    }
 
     if st.session_state.decision_made:
         if st.session_state.decision_made == "Accept":
@@ -929,7 +980,7 @@ if st.session_state.parsed_data_combined:
         col1, col2, col3 = st.columns([1, 1, 2])
         with col1:
             if st.button("✅ Accept", key="accept_btn"):
-                response = requests.post(f"{BACKEND_URL}/store_candidate_evaluation", json=combine_eval_results)
+                response = requests.post(f"{BACKEND_URL}/store_candidate_evaluation", json={**cand_decision, "decision": "Accept"})
                 if response.status_code == 200:
                     st.session_state.decision_made = "Accept"
                     st.rerun()
@@ -938,7 +989,7 @@ if st.session_state.parsed_data_combined:
 
         with col2:
             if st.button("❌ Reject", key="reject_btn"):
-                response = requests.post(f"{BACKEND_URL}/store_candidate_evaluation", json=combine_eval_results)
+                response = requests.post(f"{BACKEND_URL}/store_candidate_evaluation", json={**cand_decision, "decision": "Reject"})
                 if response.status_code == 200:
                     st.session_state.decision_made = "Reject"
                     st.rerun()
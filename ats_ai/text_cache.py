@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+"""
+    Extracted-text cache keyed by file content hash.
+    A byte-identical upload (same SHA-256) returns its text without parsing the PDF/DOCX again. Lookups go
+    through an in-memory LRU first and fall back to a local SQLite store, so hits survive restarts.
+    The extractor version is part of the key, so changing how text is extracted invalidates old entries.
+"""
+
+logger = logging.getLogger(__name__)
+
+TEXT_CACHE_ENABLED = os.getenv("TEXT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+TEXT_CACHE_PATH = os.getenv("TEXT_CACHE_PATH", "data/cache/extracted_text.sqlite3")
+TEXT_CACHE_MEMORY_ENTRIES = int(os.getenv("TEXT_CACHE_MEMORY_ENTRIES", "256"))
+TEXT_CACHE_MAX_ENTRIES = int(os.getenv("TEXT_CACHE_MAX_ENTRIES", "20000"))
+
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractedTextCache:
+    def __init__(self, db_path: str = TEXT_CACHE_PATH, memory_entries: int = TEXT_CACHE_MEMORY_ENTRIES, max_entries: int = TEXT_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @staticmethod
+    def make_key(content_hash: str, extractor_version: str) -> str:
+        return f"{extractor_version}:{content_hash}"
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extracted_text (
+                    cache_key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_extracted_text_last_accessed ON extracted_text(last_accessed)")
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, text: str):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+            conn = self._connection()
+            row = conn.execute("SELECT text FROM extracted_text WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE extracted_text SET last_accessed = ? WHERE cache_key = ?", (time.time(), key))
+            conn.commit()
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def set(self, key: str, text: str):
+        with self._lock:
+            self._remember(key, text)
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO extracted_text (cache_key, text, last_accessed) VALUES (?, ?, ?)", (key, text, time.time()))
+            if self.max_entries > 0:
+                conn.execute(
+                    "DELETE FROM extracted_text WHERE cache_key IN (SELECT cache_key FROM extracted_text ORDER BY last_accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            disk_entries = self._connection().execute("SELECT COUNT(*) FROM extracted_text").fetchone()[0]
+            memory_entries = len(self._memory)
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "enabled": TEXT_CACHE_ENABLED,
+            "memory_entries": memory_entries,
+            "disk_entries": disk_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_text_cache: Optional[ExtractedTextCache] = None
+
+
+def get_text_cache() -> Optional[ExtractedTextCache]:
+    """Shared cache instance, or None when disabled via TEXT_CACHE_ENABLED"""
+    global _text_cache
+    if not TEXT_CACHE_ENABLED:
+        return None
+    if _text_cache is None:
+        _text_cache = ExtractedTextCache()
+    return _text_cache
@@ -0,0 +1,219 @@
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+"""
+    Benchmark for CalfusJobScraper.clean_job_content: the compiled filter (module-level alternation regexes and a
+    keyword set) against the previous per-line implementation, kept below as legacy_clean_job_content.
+    Both are run on the same pages and their outputs are compared, so a speed-up never hides a behaviour change.
+
+    python benchmarks/clean_job_content.py [records_dir] [--pages 200] [--lines 2000] [--runs 5]
+
+    Without records_dir, synthetic careers pages are generated: job description text mixed with navigation,
+    metadata, dates, URLs and company/benefits sections. records_dir reads the "content" of scraped JD records
+    (jd_folder/*.json) instead.
+"""
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+PAGE_LINES = [
+    "Senior Python Engineer",
+    "Location: Pune",
+    "Responsibilities:",
+    "Design, build and operate Python/FastAPI services on AWS with Docker and Kubernetes.",
+    "Review code and mentor engineers on the team.",
+    "Requirements:",
+    "5+ years of experience building backend services",
+    "About Us:",
+    "Calfus is a product engineering company building AI-first products.",
+    "BENEFITS AND PERKS",
+    "Health insurance, learning budget and flexible hours.",
+    "Apply Now",
+    "Home",
+    "Careers",
+    "Menu",
+    "Our Work",
+    "Lets Connect",
+    "https://www.calfus.com/job-openings",
+    "**Source URL: **https://www.calfus.com/job-openings/senior-python-engineer",
+    "**Scraped Date: **2025-01-01 10:00:00",
+    "2025-01-01",
+    "OK",
+    "",
+    "   ",
+]
+
+
+def legacy_clean_job_content(content):
+    """CalfusJobScraper.clean_job_content as it was before its patterns were compiled (reference for timing and output)"""
+    if not content:
+        return ""
+
+    lines = content.split("\n")
+    cleaned_lines = []
+    skip_current_section = False
+
+    # Keywords that indicate sections to skip
+    skip_section_keywords = [
+        "about us",
+        "about the company",
+        "company overview",
+        "who we are",
+        "our company",
+        "company profile",
+        "organization overview",
+        "apply now",
+        "how to apply",
+        "application process",
+        "source url",
+        "scraped date",
+        "contact us",
+        "get in touch",
+        "follow us",
+        "social media",
+        "connect with us",
+        "navigation",
+        "menu",
+        "home",
+        "careers",
+        "lets connect",
+        "join us",
+        "our work",
+        "agent foundry",
+        "benefits and perks",
+    ]
+
+    # Patterns that indicate metadata or unwanted content
+    skip_patterns = [r"^\*\*Source URL:\s*\*\*", r"^\*\*Scraped Date:\s*\*\*", r"^https?://", r"^\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}", r"^Apply Now\s*$", r"^Back\s*$", r"^Home\s*$", r"^Menu\s*$", r"^Navigation\s*$"]
+
+    for line in lines:
+        line = line.strip()
+
+        # Skip empty lines initially, we'll add them back strategically
+        if not line:
+            if cleaned_lines and cleaned_lines[-1]:  # Only add empty line if previous line wasn't empty
+                cleaned_lines.append("")
+            continue
+
+        # Check if line matches skip patterns
+        should_skip_line = False
+        for pattern in skip_patterns:
+            if re.match(pattern, line, re.IGNORECASE):
+                should_skip_line = True
+                break
+
+        if should_skip_line:
+            continue
+
+        # Check if this line starts a section we want to skip
+        line_lower = line.lower()
+
+        # Reset skip flag for new sections
+        if line.endswith(":") or re.match(r"^[A-Z][^a-z]*:?$", line):
+            skip_current_section = any(keyword in line_lower for keyword in skip_section_keywords)
+
+        # Skip if we're in a section to skip
+        if skip_current_section:
+            # Check if we've moved to a new section that we want to keep
+            if line.endswith(":") and not any(keyword in line_lower for keyword in skip_section_keywords):
+                skip_current_section = False
+                cleaned_lines.append(line)
+            continue
+
+        # Skip lines that are just navigation or metadata
+        if any(keyword == line_lower for keyword in skip_section_keywords):
+            continue
+
+        # Skip very short lines that are likely navigation
+        if len(line) <= 2 and line.isalpha():
+            continue
+
+        # Skip lines that are just dates or URLs
+        if re.match(r"^\d{4}-\d{2}-\d{2}", line) or line.startswith("http"):
+            continue
+
+        cleaned_lines.append(line)
+
+    # Remove multiple consecutive empty lines
+    final_lines = []
+    prev_empty = False
+
+    for line in cleaned_lines:
+        if not line.strip():
+            if not prev_empty:
+                final_lines.append(line)
+            prev_empty = True
+        else:
+            final_lines.append(line)
+            prev_empty = False
+
+    # Remove leading and trailing empty lines
+    while final_lines and not final_lines[0].strip():
+        final_lines.pop(0)
+    while final_lines and not final_lines[-1].strip():
+        final_lines.pop()
+
+    return "\n".join(final_lines)
+
+
+def synthetic_pages(page_count: int, line_count: int) -> list:
+    rng = random.Random(21)
+    return ["\n".join(rng.choice(PAGE_LINES) for _ in range(line_count)) for _ in range(page_count)]
+
+
+def record_pages(folder: Path) -> list:
+    pages = []
+    for file_path in sorted(folder.glob("*.json")):
+        record = json.loads(file_path.read_text(encoding="utf-8"))
+        if isinstance(record, dict) and record.get("content"):
+            pages.append(record["content"])
+    return pages
+
+
+def time_filter(clean, pages: list, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        for page in pages:
+            clean(page)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled clean_job_content filter against the previous implementation")
+    parser.add_argument("records_dir", nargs="?", help="Folder of scraped JD records (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=200, help="Synthetic pages to generate")
+    parser.add_argument("--lines", type=int, default=2000, help="Lines per synthetic page")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    from ats_ai.scraper import CalfusJobScraper
+
+    pages = record_pages(Path(args.records_dir)) if args.records_dir else synthetic_pages(args.pages, args.lines)
+    if not pages:
+        sys.exit(f"No JD records with content found in {args.records_dir}")
+    compiled = CalfusJobScraper().clean_job_content
+
+    mismatches = sum(legacy_clean_job_content(page) != compiled(page) for page in pages)
+    legacy_seconds = time_filter(legacy_clean_job_content, pages, args.runs)
+    compiled_seconds = time_filter(compiled, pages, args.runs)
+    total_lines = sum(page.count("\n") + 1 for page in pages)
+
+    print(f"{len(pages)} pages, {total_lines} lines, median of {args.runs} runs")
+    print(f"{'filter':<10}{'seconds':>10}{'lines/s':>14}")
+    print(f"{'legacy':<10}{legacy_seconds:>10.3f}{total_lines / legacy_seconds:>14,.0f}")
+    print(f"{'compiled':<10}{compiled_seconds:>10.3f}{total_lines / compiled_seconds:>14,.0f}")
+    print(f"Speed-up: {legacy_seconds / compiled_seconds:.1f}x")
+    print(f"Identical output: {mismatches == 0} ({mismatches} mismatched pages)")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
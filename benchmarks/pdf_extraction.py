@@ -0,0 +1,127 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+"""
+    PDF text extraction benchmark: direct PyMuPDF (ats_ai.extraction.load_pdf_text) vs LangChain's PyMuPDFLoader.
+    Each extractor runs in a fresh process so import cost and peak memory are measured independently.
+
+    python benchmarks/pdf_extraction.py [corpus_dir] [--runs 5]
+
+    Without corpus_dir a synthetic corpus of resumes (1-6 pages) is generated with reportlab.
+    The LangChain loader is only benchmarked when langchain-community is installed.
+"""
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def build_synthetic_corpus(folder: Path, count: int = 40):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    for index in range(count):
+        pdf = canvas.Canvas(str(folder / f"resume_{index:03d}.pdf"), pagesize=A4)
+        for page in range(1 + index % 6):
+            y = 800
+            for line in range(55):
+                pdf.drawString(40, y, f"Candidate {index} page {page} line {line}: Python, FastAPI, Docker, AWS - Jan 2019 - Present, built data pipelines")
+                y -= 14
+            pdf.showPage()
+        pdf.save()
+
+
+def langchain_pdf_text(file_path: str) -> str:
+    from langchain_community.document_loaders import PyMuPDFLoader
+
+    return " ".join(page.page_content for page in PyMuPDFLoader(file_path).load())
+
+
+def direct_pdf_text(file_path: str) -> str:
+    from ats_ai.extraction import load_pdf_text
+
+    return load_pdf_text(file_path)
+
+
+EXTRACTORS = {"pymupdf_direct": direct_pdf_text, "langchain_loader": langchain_pdf_text}
+
+
+def run_extractor(name: str, files: list, runs: int, queue):
+    start_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    extract = EXTRACTORS[name]
+    extract(files[0])  # first call pays the imports
+    first_call_seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    latencies = []
+    texts = {}
+    for _ in range(runs):
+        for file_path in files:
+            call_started = time.perf_counter()
+            texts[file_path] = extract(file_path)
+            latencies.append(time.perf_counter() - call_started)
+    _, python_peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queue.put(
+        {
+            "name": name,
+            "first_call_ms": first_call_seconds * 1000,
+            "median_ms": statistics.median(latencies) * 1000,
+            "p95_ms": sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000,
+            "python_peak_mb": python_peak_bytes / (1024 * 1024),
+            "rss_growth_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start_rss_kb) / 1024,
+            "texts": texts,
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark direct PyMuPDF extraction against LangChain PyMuPDFLoader")
+    parser.add_argument("corpus_dir", nargs="?", help="Folder of PDF resumes (default: generated corpus)")
+    parser.add_argument("--runs", type=int, default=5, help="Passes over the corpus per extractor")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus_dir = Path(args.corpus_dir) if args.corpus_dir else Path(temp_dir)
+        if not args.corpus_dir:
+            build_synthetic_corpus(corpus_dir)
+        files = sorted(str(path) for path in corpus_dir.glob("*.pdf"))
+        if not files:
+            sys.exit(f"No PDF files found in {corpus_dir}")
+
+        names = ["pymupdf_direct"]
+        try:
+            import langchain_community  # noqa: F401
+
+            names.append("langchain_loader")
+        except ImportError:
+            print("langchain-community not installed, benchmarking the direct extractor only")
+
+        context = multiprocessing.get_context("spawn")
+        results = []
+        for name in names:
+            queue = context.Queue()
+            process = context.Process(target=run_extractor, args=(name, files, args.runs, queue))
+            process.start()
+            results.append(queue.get())
+            process.join()
+
+    print(f"{len(files)} documents x {args.runs} runs ({os.cpu_count()} CPUs)")
+    print(f"{'extractor':<18}{'first call ms':>15}{'median ms':>12}{'p95 ms':>10}{'py peak MB':>12}{'RSS growth MB':>15}")
+    for result in results:
+        print(f"{result['name']:<18}{result['first_call_ms']:>15.1f}{result['median_ms']:>12.2f}{result['p95_ms']:>10.2f}{result['python_peak_mb']:>12.2f}{result['rss_growth_mb']:>15.1f}")
+    if len(results) == 2:
+        identical = results[0]["texts"] == results[1]["texts"]
+        print(f"Extracted text identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
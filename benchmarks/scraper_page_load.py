@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+"""
+    Page-load benchmark for the scraper's lean browsing profile (CalfusJobScraper.configure_context) against a
+    locally served copy of the careers pages, so results do not depend on the live site or the network.
+
+    python benchmarks/scraper_page_load.py [--site-dir saved_site/] [--runs 3] [--asset-delay-ms 40]
+
+    Without --site-dir a synthetic careers site is served: job pages shaped like calfus.com's (CSS, images,
+    web fonts, a video and a third-party analytics script served from a second host). --site-dir serves a saved
+    copy instead ("Save page as..." of the job pages, every *.html is loaded). Each asset response is delayed by
+    --asset-delay-ms to stand in for network latency. Requires Chromium: playwright install chromium
+"""
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+JOB_TEXT = "\n".join(f"<p>Responsibility {index}: design, build and operate Python/FastAPI services on AWS with Docker and Kubernetes.</p>" for index in range(25))
+
+
+def build_synthetic_site(folder: Path, third_party_url: str, job_count: int = 8):
+    (folder / "assets").mkdir()
+    (folder / "assets" / "site.css").write_text("body{font-family:Brand,sans-serif} .hidden{display:none} img{width:320px}")
+    for index in range(8):
+        (folder / "assets" / f"photo_{index}.jpg").write_bytes(os.urandom(250 * 1024))
+    for name in ["brand-regular.woff2", "brand-bold.woff2"]:
+        (folder / "assets" / name).write_bytes(os.urandom(120 * 1024))
+    (folder / "assets" / "intro.mp4").write_bytes(os.urandom(2 * 1024 * 1024))
+
+    images = "\n".join(f'<img src="/assets/photo_{index}.jpg">' for index in range(8))
+    for index in range(job_count):
+        (folder / f"job_{index}.html").write_text(
+            f"""<!doctype html><html><head><title>Job {index}</title>
+<link rel="stylesheet" href="/assets/site.css">
+<style>@font-face{{font-family:Brand;src:url(/assets/brand-regular.woff2)}} @font-face{{font-family:Brand;font-weight:bold;src:url(/assets/brand-bold.woff2)}}</style>
+<script src="{third_party_url}/analytics.js"></script>
+</head><body>
+<nav>Home Careers Our Work</nav>
+{images}
+<video src="/assets/intro.mp4" preload="auto" autoplay muted></video>
+<main><h1>Senior Python Engineer {index}</h1><h2>Responsibilities:</h2>{JOB_TEXT}<div class="hidden">Hidden menu text</div></main>
+</body></html>"""
+        )
+
+
+class DelayedHandler(SimpleHTTPRequestHandler):
+    asset_delay = 0.0
+    counters = {"requests": 0, "bytes": 0}
+    counters_lock = threading.Lock()
+
+    def do_GET(self):
+        if not self.path.endswith((".html", "/")):
+            time.sleep(self.asset_delay)
+        if self.path == "/analytics.js":
+            payload = b"window.analyticsLoaded = true;" + b"//" + b"x" * 60000
+            self.send_response(200)
+            self.send_header("Content-Type", "application/javascript")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            size = len(payload)
+        else:
+            file_path = Path(self.translate_path(self.path))
+            size = file_path.stat().st_size if file_path.is_file() else 0
+            super().do_GET()
+        with self.counters_lock:
+            self.counters["requests"] += 1
+            self.counters["bytes"] += size
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(folder: Path, host: str) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, 0), lambda *handler_args: DelayedHandler(*handler_args, directory=str(folder)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def measure_profile(page_urls: list, site_url: str, lean: bool, runs: int) -> dict:
+    from playwright.async_api import async_playwright
+
+    from ats_ai.scraper import CalfusJobScraper
+
+    scraper = CalfusJobScraper(block_resources=lean)
+    scraper.base_url = site_url
+    DelayedHandler.counters.update(requests=0, bytes=0)
+
+    load_times = []
+    texts = {}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        for _ in range(runs):
+            # Fresh context per pass so the HTTP cache does not hide the asset cost
+            context = await browser.new_context()
+            await scraper.configure_context(context)
+            page = await context.new_page()
+            for url in page_urls:
+                started = time.perf_counter()
+                await page.goto(url, wait_until="load")
+                load_times.append(time.perf_counter() - started)
+                texts[url] = await page.evaluate("document.body.innerText")
+            await context.close()
+        await browser.close()
+
+    return {
+        "profile": "lean" if lean else "full",
+        "median_ms": statistics.median(load_times) * 1000,
+        "max_ms": max(load_times) * 1000,
+        "requests_per_page": DelayedHandler.counters["requests"] / (runs * len(page_urls)),
+        "kb_per_page": DelayedHandler.counters["bytes"] / 1024 / (runs * len(page_urls)),
+        "blocked_requests": scraper.blocked_requests,
+        "texts": texts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper page loads with and without the lean resource-blocking profile")
+    parser.add_argument("--site-dir", help="Saved copy of the careers pages (default: generated site)")
+    parser.add_argument("--runs", type=int, default=3, help="Passes over the pages per profile")
+    parser.add_argument("--asset-delay-ms", type=float, default=40, help="Artificial latency per asset request")
+    args = parser.parse_args()
+
+    DelayedHandler.asset_delay = args.asset_delay_ms / 1000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # "localhost" and "127.0.0.1" are different hosts to the browser: the second server plays the third party
+        third_party = serve(Path(temp_dir), "localhost")
+        third_party_url = f"http://localhost:{third_party.server_address[1]}"
+        site_dir = Path(args.site_dir) if args.site_dir else Path(temp_dir) / "site"
+        if not args.site_dir:
+            site_dir.mkdir()
+            build_synthetic_site(site_dir, third_party_url)
+        site = serve(site_dir, "127.0.0.1")
+        site_url = f"http://127.0.0.1:{site.server_address[1]}"
+        page_urls = [f"{site_url}/{path.relative_to(site_dir).as_posix()}" for path in sorted(site_dir.rglob("*.html"))]
+        if not page_urls:
+            sys.exit(f"No .html pages found in {site_dir}")
+
+        try:
+            results = [asyncio.run(measure_profile(page_urls, site_url, lean, args.runs)) for lean in (False, True)]
+        except Exception as e:
+            sys.exit(f"Benchmark failed: {e}\n(Chromium missing? Install it with: playwright install chromium)")
+        finally:
+            site.shutdown()
+            third_party.shutdown()
+
+    print(f"{len(page_urls)} pages x {args.runs} runs, {args.asset_delay_ms:g} ms per asset")
+    print(f"{'profile':<10}{'median ms':>12}{'max ms':>10}{'requests/page':>16}{'KB/page':>10}{'blocked':>10}")
+    for result in results:
+        print(f"{result['profile']:<10}{result['median_ms']:>12.1f}{result['max_ms']:>10.1f}{result['requests_per_page']:>16.1f}{result['kb_per_page']:>10.1f}{result['blocked_requests']:>10}")
+    full, lean = results
+    print(f"Median page load reduced by {(1 - lean['median_ms'] / full['median_ms']) * 100:.0f}%")
+    print(f"innerText identical: {full['texts'] == lean['texts']}")
+
+
+if __name__ == "__main__":
+    main()
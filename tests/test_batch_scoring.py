@@ -0,0 +1,126 @@
+import random
+
+import pytest
+
+from ats_ai.agent.batch_scoring import (
+    batch_results_to_records,
+    calculate_weighted_scores_batch,
+    rescore_evaluations_batch,
+)
+from ats_ai.agent.llm_agent import rescore_evaluation
+from ats_ai.agent.prompts import calculate_weighted_score_and_status
+
+WEIGHTAGES = [
+    (0.3, 0.4, 0.1, 0.2),
+    (0.25, 0.25, 0.25, 0.25),
+    (0.5, 0.5, 0.0, 0.0),
+    (0.0, 0.0, 0.0, 1.0),
+    (0.1, 0.1, 0.7, 0.1),
+    (0.35, 0.35, 0.15, 0.15),
+]
+
+
+def make_candidates(count, seed):
+    rng = random.Random(seed)
+    score_values = [0.0, 2.5, 5.0, 5.5, 5.95, 6.0, 6.5, 7.0, 7.25, 8.0, 8.5, 9.0, 10.0]
+    match_values = [None, "", "0.0%", "69.9%", "70%", "70.0%", "85.5%", "100%", "n/a"]
+    candidates = []
+    for _ in range(count):
+        candidates.append(
+            {
+                "experience_score": rng.choice(score_values + [round(rng.uniform(0, 10), 2)]),
+                "skills_score": rng.choice(score_values + [round(rng.uniform(0, 10), 2)]),
+                "education_score": rng.choice(score_values + [round(rng.uniform(0, 10), 2)]),
+                "projects_score": rng.choice(score_values + [round(rng.uniform(0, 10), 2)]),
+                "candidate_total_experience_years": rng.choice([0.0, 0.5, 1.2, 2.9, 3.0, 4.75, 8.3]),
+                "jd_required_experience_years": rng.choice([0.0, 1.0, 3.0, 5.0]),
+                "has_valid_projects": rng.random() < 0.7,
+                "llm_match_percentage": rng.choice(match_values),
+            }
+        )
+    return candidates
+
+
+@pytest.mark.parametrize("weights", WEIGHTAGES)
+def test_batch_matches_scalar_function(weights):
+    experience_weight, skills_weight, education_weight, projects_weight = weights
+    candidates = make_candidates(2000, seed=hash(weights) & 0xFFFF)
+
+    results = calculate_weighted_scores_batch(
+        experience_scores=[c["experience_score"] for c in candidates],
+        skills_scores=[c["skills_score"] for c in candidates],
+        education_scores=[c["education_score"] for c in candidates],
+        projects_scores=[c["projects_score"] for c in candidates],
+        candidate_total_experience_years=[c["candidate_total_experience_years"] for c in candidates],
+        jd_required_experience_years=[c["jd_required_experience_years"] for c in candidates],
+        has_valid_projects=[c["has_valid_projects"] for c in candidates],
+        experience_weight=experience_weight,
+        skills_weight=skills_weight,
+        education_weight=education_weight,
+        projects_weight=projects_weight,
+        llm_match_percentages=[c["llm_match_percentage"] for c in candidates],
+    )
+
+    for candidate, record in zip(candidates, batch_results_to_records(results)):
+        expected = calculate_weighted_score_and_status(
+            experience_weight=experience_weight,
+            skills_weight=skills_weight,
+            education_weight=education_weight,
+            projects_weight=projects_weight,
+            **candidate,
+        )
+        assert record == expected
+
+
+def test_rounding_ties_match_python_round():
+    # x.x5 values sit on (or next to) a rounding tie; np.round and round() can disagree here
+    scores = [0.05, 0.15, 0.25, 0.35, 0.45, 1.05, 2.675, 4.45, 6.65, 8.85]
+    results = calculate_weighted_scores_batch(scores, [0.0] * len(scores), [0.0] * len(scores), [0.0] * len(scores), [0.0] * len(scores), [0.0] * len(scores), experience_weight=1.0, skills_weight=0.0, education_weight=0.0, projects_weight=0.0)
+    assert results["overall_weighted_score"].tolist() == [round(score, 1) for score in scores]
+
+
+def test_rescore_evaluations_batch_matches_rescore_evaluation():
+    class Weightage:
+        experience_weight = 0.2
+        skills_weight = 0.5
+        education_weight = 0.1
+        projects_weight = 0.2
+
+    evaluations = []
+    for index, candidate in enumerate(make_candidates(50, seed=7)):
+        projects = [{"Title": "Realtime pipeline", "Description": "Streaming ingestion with Kafka and Flink"}] if candidate["has_valid_projects"] else []
+        evaluations.append(
+            {
+                "Evaluation": {
+                    "Total_Experience_Years": candidate["candidate_total_experience_years"],
+                    "JD_Required_Experience_Years": candidate["jd_required_experience_years"],
+                    "Experience_Score": candidate["experience_score"],
+                    "Skills_Score": candidate["skills_score"],
+                    "Education_Score": candidate["education_score"],
+                    "Projects_Score": candidate["projects_score"],
+                    "Match_Percentage": candidate["llm_match_percentage"] or "0.0%",
+                },
+                "Parsed_Resume": {"Name": f"Candidate {index}", "Professional_Experience": [], "Projects": projects},
+            }
+        )
+
+    summaries = rescore_evaluations_batch(evaluations, Weightage())
+
+    for evaluation, summary in zip(evaluations, summaries):
+        expected = rescore_evaluation(evaluation, Weightage())["Evaluation"]
+        assert summary["Overall_Weighted_Score"] == expected["Overall_Weighted_Score"]
+        assert summary["Qualification Status"] == expected["Qualification Status"]
+        assert summary["Match_Percentage"] == expected["Match_Percentage"]
+
+
+def test_rescore_evaluations_batch_handles_null_sections():
+    evaluations = [
+        {"Evaluation": {"Experience_Score": 8.0, "Skills_Score": 8.0, "Education_Score": 8.0, "Projects_Score": 8.0, "Match_Percentage": "80%"}, "Parsed_Resume": None},
+        {"Evaluation": None, "Parsed_Resume": {"Name": "Jane Doe", "Projects": None}},
+    ]
+
+    summaries = rescore_evaluations_batch(evaluations)
+
+    assert [summary["Name"] for summary in summaries] == ["NA", "Jane Doe"]
+    assert summaries[0]["Overall_Weighted_Score"] > 0
+    assert summaries[1]["Overall_Weighted_Score"] == 0.0
@@ -0,0 +1,20 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from ats_ai.scraper import CalfusJobScraper
+
+# Recorded from the per-line any()/re.match implementation before its patterns were compiled; the compiled
+# filter must reproduce it exactly (benchmarks/clean_job_content.py compares the two on large pages)
+GOLDEN_CASES = json.loads((Path(__file__).parent / "fixtures" / "clean_job_content_golden.json").read_text(encoding="utf-8"))["cases"]
+
+
+@pytest.mark.parametrize("case", GOLDEN_CASES, ids=[case["name"] for case in GOLDEN_CASES])
+def test_clean_job_content_matches_golden_output(case):
+    assert CalfusJobScraper().clean_job_content(case["input"]) == case["expected"]
+
+
+def test_clean_job_content_drops_unwanted_sections_until_next_header():
+    content = "Data Engineer\nAbout Us:\nWe are a company.\nRESPONSIBILITIES\nBuild pipelines\n\n\nhttps://www.calfus.com\nApply Now"
+    assert CalfusJobScraper().clean_job_content(content) == "Data Engineer\nRESPONSIBILITIES\nBuild pipelines"
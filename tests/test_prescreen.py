@@ -0,0 +1,142 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from ats_ai.agent import prescreen
+from ats_ai.agent.prescreen import (
+    PrescreenConfig,
+    estimate_experience_years,
+    match_required_skills,
+    parse_required_experience,
+    prescreen_and_evaluate,
+    prescreen_resume,
+    skill_terms,
+    tokenize,
+)
+
+JD = {"Job_Title": "Backend Engineer", "Required_Skills": ["Python", "Django or FastAPI", "PostgreSQL", "Docker"], "Minimum_Experience": "5+ years"}
+
+
+def months_since(year, month):
+    now = datetime.now()
+    return (now.year * 12 + now.month - 1) - (year * 12 + month - 1) + 1
+
+
+def test_tokenize_keeps_tech_spellings():
+    tokens = tokenize("C++ and C# on the front-end; REST APIs with .NET")
+    assert {"c++", "c#", "front-end", "front", "end", "rest", "api", "net"} <= set(tokens)
+    # Dotted names also match without the dot, normalized the same way on both sides
+    assert set(tokenize("Node.js")) & set(tokenize("NodeJS"))
+
+
+@pytest.mark.parametrize(
+    "required_skill, expected",
+    [
+        ("Oracle ERP (EBS/Fusion)", [["oracle", "erp"], ["ebs"], ["fusion"]]),
+        ("Strong working knowledge of Python", [["python"]]),
+        ("5+ years of Java", [["java"]]),
+        ("Build tools and best practices", [["build"], ["best"]]),
+        ("Django or FastAPI", [["django"], ["fastapi"]]),
+        ("Excellent skills", []),
+    ],
+)
+def test_skill_terms(required_skill, expected):
+    assert skill_terms(required_skill) == expected
+
+
+def test_match_required_skills():
+    resume = "Built microservices with NodeJS, Flask and Postgres"
+    matched, missing = match_required_skills(resume, ["Node.js", "Microservice architecture", "Django or Flask", "PostgreSQL", "Good communication skills and teamwork", "Excellent skills"])
+    assert matched == ["Node.js", "Django or Flask"]
+    assert missing == ["Microservice architecture", "PostgreSQL", "Good communication skills and teamwork"]
+
+
+@pytest.mark.parametrize(
+    "minimum_experience, expected",
+    [("5+ years", 5.0), ("4–7 years", 4.0), ("0 to 3 years", 0.0), ("2.5 yrs", 2.5), (3, 3.0), ("Not specified", None), (None, None)],
+)
+def test_parse_required_experience(minimum_experience, expected):
+    assert parse_required_experience(minimum_experience) == expected
+
+
+@pytest.mark.parametrize(
+    "resume_text, expected",
+    [
+        ("Developer, Jan 2018 - Dec 2019", 2.0),
+        ("Analyst 06/2024 - 12/2024", 0.6),
+        ("Engineer 2015 to 2017", 3.0),
+        ("Acme, March 2016 – Feb. 2017", 1.0),
+        ("Worked Jan 2018 - Dec 2019 and Jan 2019 - Dec 2020", 3.0),  # Overlap counted once
+        ("Consultant Jan 2018 - Dec 2020; part-time tutor Jun 2019 - Jun 2020", 3.0),  # Range inside another
+        ("Intern Jan 2020 - Mar 2020. 8 years of experience in data engineering", 8.0),
+        ("No dates here, just skills", None),
+    ],
+)
+def test_estimate_experience_years(resume_text, expected):
+    assert estimate_experience_years(resume_text) == expected
+
+
+@pytest.mark.parametrize("end", ["Present", "Current", "till date", "now"])
+def test_estimate_experience_years_open_ended(end):
+    assert estimate_experience_years(f"Engineer Jan 2020 - {end}") == round(months_since(2020, 1) / 12, 1)
+
+
+def test_estimate_experience_years_caps_future_end_dates():
+    assert estimate_experience_years(f"Engineer Jan 2020 - Dec {datetime.now().year + 5}") == round(months_since(2020, 1) / 12, 1)
+
+
+def test_prescreen_rejects_skill_mismatch():
+    result = prescreen_resume("Accountant. Tally, GST filing, Excel. Jan 2012 - Present", JD)
+    assert not result.escalate
+    assert result.skill_overlap == 0.0
+    assert result.missing_skills == JD["Required_Skills"]
+    assert len(result.reasons) == 1
+
+
+def test_prescreen_rejects_too_little_experience():
+    result = prescreen_resume("Python, Django, PostgreSQL and Docker. Developer Jan 2023 - Dec 2024", JD)
+    assert not result.escalate
+    assert result.estimated_experience_years == 2.0
+    assert result.required_experience_years == 5.0
+
+
+def test_prescreen_escalates_borderline_candidates():
+    # 3 of 5 required years clears min_experience_ratio (0.5), 1 of 4 skills clears min_skill_overlap (0.1)
+    result = prescreen_resume("Python developer Jan 2022 - Dec 2024", JD)
+    assert result.escalate
+    assert result.reasons == []
+    assert result.skill_overlap == 0.25
+
+
+def test_prescreen_escalates_when_unknown():
+    # No dates, and too few Required_Skills entries for the skills check
+    result = prescreen_resume("Bookkeeper", {"Required_Skills": ["Python", "Go"], "Minimum_Experience": "5+ years"})
+    assert result.escalate
+    assert result.estimated_experience_years is None
+
+
+def test_prescreen_skill_overlap_threshold_is_exclusive():
+    job_description = {"Required_Skills": [f"Skill{index}" for index in range(9)] + ["Python"]}
+    assert prescreen_resume("Python", job_description, PrescreenConfig(min_skill_overlap=0.1)).escalate
+    assert not prescreen_resume("Python", job_description, PrescreenConfig(min_skill_overlap=0.11)).escalate
+
+
+def test_prescreen_and_evaluate_only_calls_the_llm_when_escalated(monkeypatch):
+    calls = []
+
+    async def fake_combined_parse_evaluate(resume_data, job_description, weightage_config=None, bulk=False):
+        calls.append(resume_data)
+        return {"Evaluation": {"Qualification Status": "Qualified"}, "Parsed_Resume": {}}
+
+    monkeypatch.setattr(prescreen, "combined_parse_evaluate", fake_combined_parse_evaluate)
+
+    rejected = asyncio.run(prescreen_and_evaluate("Accountant. Tally, GST. Jan 2023 - Dec 2024", JD))
+    assert calls == []
+    assert rejected["Evaluation"]["Qualification Status"] == "Not Qualified - Pre-screen"
+    assert rejected["Prescreen"]["escalate"] is False
+
+    escalated = asyncio.run(prescreen_and_evaluate("Python, FastAPI, PostgreSQL, Docker. Engineer Jan 2015 - Present", JD))
+    assert len(calls) == 1
+    assert escalated["Evaluation"]["Qualification Status"] == "Qualified"
+    assert escalated["Prescreen"]["escalate"] is True
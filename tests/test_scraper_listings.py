@@ -0,0 +1,84 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from ats_ai.scraper import (
+    JOB_LISTING_SCRIPT,
+    JOB_LISTING_SCRIPT_ARGS,
+    jobs_from_listing,
+)
+
+FIXTURE_HTML = Path(__file__).parent / "fixtures" / "calfus_job_openings.html"
+LISTING_URL = "https://www.calfus.com/job-openings"
+
+EXPECTED_JOBS = [
+    {"title": "Senior Python Full Stack Engineer", "location": "Pune", "url": "https://www.calfus.com/job-openings/senior-python-full-stack-engineer"},
+    {"title": "Oracle ERP Consultant", "location": "Bengaluru", "url": "https://www.calfus.com/job-openings/oracle-erp-consultant"},
+    {"title": "Data Engineer", "location": "Hyderabad", "url": "https://www.calfus.com/careers/data-engineer"},
+    {"title": "QA Automation Lead", "location": "Location_TBD", "url": "https://www.calfus.com/positions/qa-automation-lead"},
+]
+
+# What JOB_LISTING_SCRIPT returns for the fixture: ancestor texts, nearest first, shared between cards
+OPENINGS_TEXT = "Senior Python Full Stack Engineer\nPune · 5-8 years of experience\nSee Details\nOracle ERP Consultant\nBangalore, India\nSee Details\nData Engineer\nHyderabad / Remote\nView\nQA Automation Lead\nSee Details"
+FIXTURE_LISTING = {
+    "texts": [
+        "See Details",
+        "Senior Python Full Stack Engineer\nPune · 5-8 years of experience\nSee Details",
+        OPENINGS_TEXT,
+        "Current Job Openings\nJoin Calfus and build AI-first products with us.\n" + OPENINGS_TEXT + "\nBenefits and perks:\nHealth insurance, learning budget.",
+        "Oracle ERP Consultant",
+        "Oracle ERP Consultant\nBangalore, India",
+        "Oracle ERP Consultant\nBangalore, India\nSee Details",
+        "View",
+        "Data Engineer\nHyderabad / Remote\nView",
+        "See Details",
+        "QA Automation Lead\nSee Details",
+    ],
+    "links": [
+        {"url": EXPECTED_JOBS[0]["url"], "levels": [0, 1, 2, 3]},
+        {"url": EXPECTED_JOBS[1]["url"], "levels": [4, 5, 6, 2, 3]},
+        {"url": EXPECTED_JOBS[2]["url"], "levels": [7, 8, 2, 3]},
+        {"url": EXPECTED_JOBS[3]["url"], "levels": [9, 10, 2, 3]},
+    ],
+}
+
+
+def test_jobs_from_listing_reads_title_and_location_from_each_card():
+    assert jobs_from_listing(FIXTURE_LISTING) == EXPECTED_JOBS
+
+
+def test_jobs_from_listing_does_not_borrow_from_other_cards():
+    # The QA card has no location; the list around it has several, which belong to other jobs
+    qa_job = jobs_from_listing(FIXTURE_LISTING)[3]
+    assert qa_job["location"] == "Location_TBD"
+
+
+def test_jobs_from_listing_falls_back_without_a_title():
+    listing = {"texts": ["See Details"], "links": [{"url": "https://www.calfus.com/job-openings/x", "levels": [0]}]}
+    assert jobs_from_listing(listing) == [{"title": "Job_Position_1", "location": "Location_TBD", "url": "https://www.calfus.com/job-openings/x"}]
+
+
+async def extract_fixture_listing():
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.launch(headless=True)
+        except Exception:
+            pytest.skip("Chromium not available (playwright install chromium)")
+        page = await browser.new_page()
+        await page.route("https://www.calfus.com/**", lambda route: route.fulfill(body=FIXTURE_HTML.read_text(encoding="utf-8"), content_type="text/html"))
+        await page.goto(LISTING_URL)
+        listing = await page.evaluate(JOB_LISTING_SCRIPT, JOB_LISTING_SCRIPT_ARGS)
+        await browser.close()
+    return listing
+
+
+def test_listing_script_finds_job_cards_in_saved_page():
+    pytest.importorskip("playwright")
+    listing = asyncio.run(extract_fixture_listing())
+
+    # Nav links (/careers, the listing itself, mailto:) are not jobs; the #apply link is deduplicated
+    assert [link["url"] for link in listing["links"]] == [job["url"] for job in EXPECTED_JOBS]
+    assert jobs_from_listing(listing) == EXPECTED_JOBS
@@ -0,0 +1,51 @@
+from ats_ai.agent.jd_parser import jd_source_files, load_jd_record_text
+from ats_ai.scraper import CalfusJobScraper
+
+JOB = {
+    "title": "Senior Python Full Stack Engineer",
+    "location": "Pune",
+    "url": "https://www.calfus.com/job-openings/senior-python-full-stack-engineer",
+    "page_title": "Senior Python Full Stack Engineer | Calfus",
+    "content": "We are looking for a Senior Python engineer.\n\nRequirements:\nPython, FastAPI, React",
+    "scraped_date": "2025-01-01 00:00:00",
+}
+
+
+def make_scraper(tmp_path, export_docx):
+    scraper = CalfusJobScraper(export_docx=export_docx)
+    scraper.jd_folder = tmp_path / "jd_folder"
+    scraper.jd_folder.mkdir()
+    return scraper
+
+
+def test_docx_export_keeps_the_json_record(tmp_path):
+    scraper = make_scraper(tmp_path, export_docx=True)
+
+    assert scraper.save_job(JOB)
+
+    record_path = scraper.jd_folder / "Senior_Python_Full_Stack_Engineer.json"
+    docx_path = scraper.jd_folder / "Senior_Python_Full_Stack_Engineer.docx"
+    assert docx_path.exists()
+    assert load_jd_record_text(str(record_path)).startswith("Senior Python Full Stack Engineer\n\nLocation: Pune")
+    # The record supersedes the DOCX of the same name in JD conversion
+    assert jd_source_files(scraper.jd_folder) == [record_path]
+
+
+def test_without_export_only_the_record_is_written(tmp_path):
+    scraper = make_scraper(tmp_path, export_docx=False)
+
+    assert scraper.save_job(JOB)
+
+    assert [path.name for path in scraper.jd_folder.iterdir()] == ["Senior_Python_Full_Stack_Engineer.json"]
+
+
+def test_closing_a_posting_moves_its_record_and_docx(tmp_path):
+    scraper = make_scraper(tmp_path, export_docx=True)
+    assert scraper.record_job(JOB, "2025-01-01 00:00:00") == "new"
+    assert scraper.save_job(JOB)
+
+    closed = scraper.close_missing_postings(set(), "2025-01-02 00:00:00")
+
+    assert closed == [{"url": JOB["url"], "title": JOB["title"], "file": "Senior_Python_Full_Stack_Engineer.json"}]
+    assert sorted(path.name for path in (scraper.jd_folder / "closed").iterdir()) == ["Senior_Python_Full_Stack_Engineer.docx", "Senior_Python_Full_Stack_Engineer.json"]
+    assert not any(path.is_file() for path in scraper.jd_folder.iterdir())
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from ats_ai.agent.llm_agent import extract_json_block
+from ats_ai.agent.streaming import IncrementalJSONParser
+
+RESPONSE = {
+    "Evaluation": {
+        "Summary": 'Said "ship it" and fixed C:\\temp\\build; likes {braces} and [brackets] and "} ]" in text',
+        "Pros": ["Led the {core} team", 'Uses [x] \\"escaped\\" quotes', "Naïve café ünïcode"],
+        "Experience_Score": 8.5,
+        "Skills_Match": {"Python": {"years": 5, "level": "expert"}, "SQL": None},
+        "Cons": [],
+        "Remote": True,
+        "Projects_Score": 85,
+    },
+    "Note": "top-level scalar, not a section field",
+    "Parsed_Resume": {
+        "Name": 'Jane "JD" Doe',
+        "Projects": [{"Title": "Parser", "Technologies": ["Python", "{json}"]}, {"Title": "[]", "Technologies": []}],
+        "Certifications": [],
+        "Total_Experience_Years": 0,
+    },
+}
+
+# What the parser should report: every field of every object-valued top-level section, in order
+EXPECTED_EVENTS = [(section, key, value) for section, fields in RESPONSE.items() if isinstance(fields, dict) for key, value in fields.items()]
+
+PAYLOADS = {
+    "compact": json.dumps(RESPONSE, ensure_ascii=False, separators=(",", ":")),
+    "indented": json.dumps(RESPONSE, indent=2),
+    "fenced": "Here is the evaluation:\n```json\n" + json.dumps(RESPONSE, indent=2, ensure_ascii=False) + "\n```\n",
+}
+
+
+def feed_all(chunks):
+    parser = IncrementalJSONParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return parser, events
+
+
+@pytest.mark.parametrize("payload", PAYLOADS.values(), ids=PAYLOADS.keys())
+def test_events_in_one_chunk(payload):
+    parser, events = feed_all([payload])
+    assert events == EXPECTED_EVENTS
+    assert extract_json_block(parser.buffer) == RESPONSE
+
+
+@pytest.mark.parametrize("payload", PAYLOADS.values(), ids=PAYLOADS.keys())
+def test_events_split_at_every_boundary(payload):
+    for split in range(1, len(payload)):
+        _, events = feed_all([payload[:split], payload[split:]])
+        assert events == EXPECTED_EVENTS, f"split at {split}: {payload[max(0, split - 20):split]!r} | {payload[split:split + 20]!r}"
+
+
+@pytest.mark.parametrize("payload", PAYLOADS.values(), ids=PAYLOADS.keys())
+def test_events_one_character_at_a_time(payload):
+    _, events = feed_all(payload)
+    assert events == EXPECTED_EVENTS
+
+
+def test_fields_are_reported_as_soon_as_complete():
+    parser = IncrementalJSONParser()
+    assert parser.feed('```json\n{"Evaluation": {"Experience_Score": 7') == []  # Number may still continue
+    assert parser.feed(', "Summary": "a, b}') == [("Evaluation", "Experience_Score", 7)]
+    assert parser.feed('"') == [("Evaluation", "Summary", "a, b}")]
+    assert parser.feed(', "Skills_Score": 9.5') == []
+    assert parser.feed("}}\n```") == [("Evaluation", "Skills_Score", 9.5)]  # Trailing scalar closed by the end of input
+
+
+def test_unterminated_input_reports_only_complete_fields():
+    _, events = feed_all(['{"Evaluation": {"Experience_Score": 6, "Summary": "cut o'])
+    assert events == [("Evaluation", "Experience_Score", 6)]